@@ -1,7 +1,17 @@
 # app.py
-from flask import Flask, send_from_directory, jsonify, request
-import subprocess, os, time, sys, json
-import scraper.scraper as scraper  # your scraper
+from flask import Flask, jsonify, request, Response, stream_with_context
+import subprocess, os, time, sys, json, threading, uuid, queue, re, hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+import scraper.changes as changes
+import scraper.days as days
+import scraper.executor as executor
+import scraper.logbook as logbook
+import scraper.snapshot as snapshot
+import scraper.store as store
+import scraper.search as search
+import scraper.metrics as metrics
 from datetime import datetime, date
 import pytz
 
@@ -15,21 +25,75 @@ RELOAD_LOG = os.path.join(DATA_DIR, "reload.log")
 # ---- Timezone ----
 VIENNA = pytz.timezone("Europe/Vienna")
 
+# ---- Result cache (per date) ----
+CACHE_TTL       = int(os.environ.get("TWLIVE_CACHE_TTL", "900"))        # seconds until an entry is stale
+CACHE_MAX_DATES = int(os.environ.get("TWLIVE_CACHE_MAX_DATES", "14"))   # how many dates we keep
+
+# ---- Reload jobs ----
+JOB_WORKERS = int(os.environ.get("TWLIVE_JOB_WORKERS", "2"))   # scrapes running at the same time
+JOB_HISTORY = 200                                              # finished jobs kept for /api/jobs
+
+# ---- Push (SSE) ----
+AUTO_REFRESH   = int(os.environ.get("TWLIVE_AUTO_REFRESH", "3600"))  # server-side scrape of today; 0 = off
+SSE_KEEPALIVE  = 15    # seconds between keep-alive comments
+SSE_QUEUE_SIZE = 32    # pending events per client before it is told to resync
+
+# ---- Scraper loading ----
+# "process": scrapes run in the worker processes of scraper/executor.py (hard timeout per job,
+# hung workers killed and replaced), so parsing and fuzzy matching never hold this process's GIL.
+# "thread": the scraper is imported here on the first scrape and runs in the job thread.
+# Serve-only forces "process": this process never imports the scraping stack
+# (selenium, bs4, lxml, rapidfuzz, requests).
+SERVE_ONLY      = os.environ.get("TWLIVE_SERVE_ONLY", "0") == "1"
+SCRAPE_EXECUTOR = "process" if SERVE_ONLY else os.environ.get("TWLIVE_SCRAPE_EXECUTOR", "process")
+
+# ---- HTTP caching ----
+ASSET_MAX_AGE = 365 * 24 * 3600   # for static assets requested with their content hash (?v=)
+ASSETS = ("app.js", "styles.css", "logo.jpg")
+
+# ---- Metrics (app side; the scraper registers its own in scraper/metrics.py) ----
+CACHE_REQUESTS = metrics.REGISTRY.counter(
+    "twlive_games_requests_total", "/api/games?date= answers by cache state.", ("cache",))
+RELOAD_SECONDS = metrics.REGISTRY.histogram(
+    "twlive_reload_job_seconds", "Reload job duration, queue wait excluded.", ("status",))
+JOB_STATES = metrics.REGISTRY.gauge("twlive_reload_jobs", "Known reload jobs by state.", ("state",))
+
 def now_vienna_str():
     return datetime.now(VIENNA).strftime("%Y-%m-%d %H:%M:%S")
 
 def log(msg: str):
-    """Append to reload.log and stdout with Vienna timestamp."""
+    """Queue a line for reload.log (background writer) and print it, with Vienna timestamp."""
     line = f"[{now_vienna_str()}] {msg}\n"
-    try:
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(RELOAD_LOG, "a", encoding="utf-8") as f:
-            f.write(line)
-    except Exception:
-        # don't crash logging
-        pass
+    logbook.get(RELOAD_LOG).write(line)
     print(line, end="", file=sys.stdout, flush=True)
 
+class _LazyScraper:
+    """
+    Stands in for `scraper.scraper` until an attribute is needed, then imports it once.
+    Attributes set on the stand-in (e.g. a patched `main`) win over the module's.
+    """
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self._module is None:
+                t0 = time.perf_counter()
+                self._module = importlib.import_module(self._name)
+                log(f"Scraper loaded in {time.perf_counter() - t0:.2f}s")
+            return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+scraper = _LazyScraper("scraper.scraper")
+
 def ensure_data_files():
     """Create web/data + default files if missing."""
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -43,38 +107,534 @@ def ensure_data_files():
             "timezone": "Europe/Vienna (GMT+2)",
             "games": []
         }
-        with open(MERGED, "w", encoding="utf-8") as f:
-            json.dump(seed, f, ensure_ascii=False, indent=2)
+        snapshot.write(MERGED, seed)
+
+# ---------- Result cache ----------
+class _Flight:
+    """One in-flight scrape that concurrent callers for the same date wait on."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class ResultCache:
+    """
+    Date-keyed cache of scrape results.
+      - fresh entry  -> returned as "hit"
+      - stale entry  -> returned right away as "stale", refreshed in the background
+      - no entry     -> "miss"; concurrent misses for one date share a single scrape
+    `seed(key)` (optional) is asked before a miss scrapes: it may return
+    (stored_at, result) from persistent storage, which then ages like any entry.
+    Holds at most `max_entries` dates (least recently used is dropped first).
+    Error results are never cached.
+    """
+    def __init__(self, loader, ttl: int, max_entries: int, seed=None):
+        self._loader = loader
+        self._seed = seed
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (stored_at, result)
+        self._flights = {}              # key -> _Flight
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (result, state) with state in {"hit", "stale", "miss"}."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                stored_at, result = entry
+                if time.time() - stored_at < self.ttl:
+                    return result, "hit"
+                if key not in self._flights:
+                    self._flights[key] = _Flight()
+                    threading.Thread(target=self._refresh, args=(key,),
+                                     name=f"cache-refresh-{key}", daemon=True).start()
+                return result, "stale"
+            flight = self._flights.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._flights[key] = _Flight()
+        if owner and self._seed is not None:
+            seeded = None
+            try:
+                seeded = self._seed(key)
+            except Exception as e:
+                log(f"Cache seed for {key} failed: {e}")
+            if seeded is not None:
+                stored_at, result = seeded
+                with self._lock:
+                    self._entries[key] = (stored_at, result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                    self._flights.pop(key, None)
+                flight.result = result
+                flight.done.set()
+                return self.get(key)   # "hit", or "stale" + background scrape
+        if owner:
+            self._run(key, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result, "miss"
+
+    def put(self, key, result):
+        """Store a successful result (error dicts are ignored)."""
+        if isinstance(result, dict) and "error" in result:
+            return
+        with self._lock:
+            self._entries[key] = (time.time(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _run(self, key, flight):
+        try:
+            flight.result = self._loader(key)
+            self.put(key, flight.result)
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _refresh(self, key):
+        flight = self._flights[key]
+        self._run(key, flight)
+        if flight.error is not None:
+            log(f"Background refresh for {key} failed: {flight.error}")
+
+# ---------- Reload jobs ----------
+class ReloadJobs:
+    """
+    Background scrape jobs, one per date at a time.
+    submit() returns immediately; a request for a date that already has a
+    queued/running job joins it instead of starting a second scrape.
+    Job state: queued -> running -> ok | error, with the current stage
+    (fetch/parse/merge/write) and per-source status from scraper.main(progress=...).
+    cancel() stops a queued job before it starts and a running one in the process
+    executor (its worker is killed); the job ends as error "cancelled".
+    """
+    def __init__(self, runner, workers: int, history: int):
+        self._runner = runner
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reload")
+        self._jobs = OrderedDict()   # id -> job dict
+        self._events = {}            # id -> threading.Event (set when finished)
+        self._cancels = {}           # id -> threading.Event (set by cancel())
+        self._active = {}            # date -> id of queued/running job
+        self._history = history
+        self._lock = threading.Lock()
+
+    def submit(self, query_date: str):
+        """Return (job snapshot, joined) for `query_date`."""
+        with self._lock:
+            job_id = self._active.get(query_date)
+            if job_id is not None:
+                return self._snapshot(self._jobs[job_id]), True
+            job_id = uuid.uuid4().hex[:12]
+            self._jobs[job_id] = {
+                "id": job_id, "date": query_date, "state": "queued", "stage": "queued",
+                "sources": {}, "created_at": time.time(), "started_at": None,
+                "finished_at": None, "counters": None, "error": None,
+            }
+            self._events[job_id] = threading.Event()
+            self._cancels[job_id] = threading.Event()
+            self._active[query_date] = job_id
+            self._trim()
+            job = self._snapshot(self._jobs[job_id])
+        self._pool.submit(self._run, job_id)
+        return job, False
+
+    def wait(self, job_id: str, timeout=None):
+        """Block until the job finishes; returns its result dict (or None)."""
+        with self._lock:
+            job, done = self._jobs.get(job_id), self._events.get(job_id)
+        if job is None:
+            return None
+        done.wait(timeout)
+        return job.get("_result")
+
+    def get(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def cancel(self, job_id: str):
+        """Ask a queued/running job to stop; returns its snapshot, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["finished_at"] is None:
+                self._cancels[job_id].set()
+                job["cancel_requested"] = True
+            return self._snapshot(job)
+
+    def _run(self, job_id: str):
+        with self._lock:
+            job = self._jobs[job_id]
+            cancel = self._cancels[job_id]
+            query_date = job["date"]
+            if cancel.is_set():
+                job.update(state="error", stage="done", finished_at=time.time(), error="cancelled")
+                self._active.pop(query_date, None)
+                self._events[job_id].set()
+                return
+            job.update(state="running", stage="starting", started_at=time.time())
+
+        def progress(event):
+            with self._lock:
+                job["stage"] = event.get("stage", job["stage"])
+                src = event.get("source")
+                if src:
+                    info = {k: v for k, v in event.items() if k not in ("stage", "source")}
+                    job["sources"].setdefault(src, {}).update(info)
+
+        result, error = None, None
+        try:
+            result = self._runner(query_date, progress, cancel)
+            if isinstance(result, dict) and "error" in result:
+                error = result.get("error") or "scraper error"
+        except Exception as e:
+            error = str(e)
+        with self._lock:
+            job.update(state="error" if error else "ok", stage="done",
+                       finished_at=time.time(), error=error, _result=result)
+            if isinstance(result, dict) and not error:
+                job["counters"] = result.get("counters")
+            self._active.pop(query_date, None)
+        self._events[job_id].set()
+
+    def counts(self) -> dict:
+        """Number of known jobs per state (queued, running, ok, error)."""
+        with self._lock:
+            out = {}
+            for job in self._jobs.values():
+                out[job["state"]] = out.get(job["state"], 0) + 1
+            return out
+
+    def _trim(self):
+        # drop the oldest finished jobs beyond the history bound
+        finished = [j for j, v in self._jobs.items() if v["finished_at"] is not None]
+        for j in finished[:max(0, len(self._jobs) - self._history)]:
+            self._jobs.pop(j, None)
+            self._events.pop(j, None)
+            self._cancels.pop(j, None)
+
+    @staticmethod
+    def _snapshot(job: dict) -> dict:
+        out = {k: v for k, v in job.items() if not k.startswith("_")}
+        out["sources"] = {k: dict(v) for k, v in job["sources"].items()}
+        end = job["finished_at"] or time.time()
+        out["elapsed"] = round(end - (job["started_at"] or job["created_at"]), 2)
+        return out
+
+def run_scrape(query_date: str, progress, cancel=None):
+    if SCRAPE_EXECUTOR == "process":
+        # structured errors ({"error", "error_kind"}) come back as the result
+        return executor.get_executor(log=log).run(query_date, progress=progress, cancel=cancel)
+    return scraper.main(query_date, progress=progress)
+
+def _run_reload_job(query_date: str, progress, cancel=None):
+    log(f"Reload job started for {query_date}")
+    start = time.time()
+    result = run_scrape(query_date, progress, cancel)
+    elapsed = round(time.time() - start, 2)
+    failed = isinstance(result, dict) and "error" in result
+    RELOAD_SECONDS.observe(time.time() - start, status="error" if failed else "ok")
+    if isinstance(result, dict) and "error" in result:
+        log(f"Reload error for {query_date}: {result.get('error', '')}")
+    else:
+        GAMES_CACHE.put(query_date, result)
+        previous = FEED.version(query_date)
+        version = FEED.record(query_date, result.get("games", []))
+        PREPARED.get(query_date, result, version)   # encode, compress and index now, not on the first poll
+        log(f"Reload OK for {query_date} in {elapsed}s (version {version})")
+        if version != previous:
+            # one scrape -> one diff pushed to every subscribed tab
+            BROADCAST.publish("changes", {**FEED.since(query_date, previous), "base": previous},
+                              date=query_date)
+    return result
+
+# ---------- Prepared responses ----------
+class PreparedGames:
+    """
+    Per-date artifacts built once per (date, scrape result, feed version):
+      - the /api/games?date= body: compact JSON, strong ETag, gzip/br variants
+      - the inverted index behind channel= / competition= / q= filtering
+    Every later poll or query reuses them.
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # date -> (result, version, Snapshot, GameIndex)
+        self._lock = threading.Lock()
+
+    def _entry(self, date_iso: str, result: dict, version: int) -> tuple:
+        with self._lock:
+            entry = self._entries.get(date_iso)
+            if entry and entry[0] is result and entry[1] == version:
+                self._entries.move_to_end(date_iso)
+                return entry
+        body = dict(result)
+        # only snapshot-level fields here; per-request info (cache state, timing) goes in headers
+        body["_meta"] = {**body.get("_meta", {}), "status": "ok", "stderr": "", "version": version}
+        entry = (result, version, snapshot.Snapshot.of(body),
+                 search.GameIndex(result.get("games", []), search.HIGHLIGHT))
+        with self._lock:
+            self._entries[date_iso] = entry
+            self._entries.move_to_end(date_iso)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, date_iso: str, result: dict, version: int) -> snapshot.Snapshot:
+        return self._entry(date_iso, result, version)[2]
+
+    def index(self, date_iso: str, result: dict, version: int) -> search.GameIndex:
+        return self._entry(date_iso, result, version)[3]
+
+PREPARED = PreparedGames(CACHE_MAX_DATES)
+
+_FILE_SNAPSHOTS = {}   # path -> ((mtime_ns, size), Snapshot)
+_FILE_SNAPSHOTS_LOCK = threading.Lock()
+
+def file_snapshot(path: str) -> snapshot.Snapshot:
+    """Snapshot of a JSON file written by snapshot.write(); re-read only when the file changes."""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _FILE_SNAPSHOTS_LOCK:
+        entry = _FILE_SNAPSHOTS.get(path)
+        if entry and entry[0] == key:
+            return entry[1]
+    snap = snapshot.load(path)
+    with _FILE_SNAPSHOTS_LOCK:
+        _FILE_SNAPSHOTS[path] = (key, snap)
+    return snap
+
+ETAG_SUFFIXES = {None: "", "gzip": "-gz", "br": "-br"}   # one strong ETag per representation
+
+def send_snapshot(snap: snapshot.Snapshot, headers: dict | None = None):
+    """
+    Send a prepared body: the best precompressed variant, each encoding with its own ETag
+    ("<hash>", "<hash>-gz", "<hash>-br"). If-None-Match with any of them -> 304, since the
+    content behind all three is the same.
+    """
+    encoding = None
+    for enc in ("br", "gzip"):
+        if enc in snap.variants and request.accept_encodings.quality(enc) > 0:
+            encoding = enc
+            break
+    base = snap.etag.strip('"')
+    etag = base + ETAG_SUFFIXES[encoding]
+    inm = request.if_none_match
+    if inm and (inm.star_tag or any(inm.contains_weak(base + sfx) for sfx in ETAG_SUFFIXES.values())):
+        resp = Response(status=304)
+        resp.headers.pop("Content-Type", None)
+    else:
+        resp = Response(snap.variants[encoding] if encoding else snap.body, mimetype="application/json")
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = "no-cache"   # may be stored, must be revalidated (cheap 304)
+    for k, v in (headers or {}).items():
+        resp.headers[k] = v
+    resp.set_etag(etag)
+    return resp
+
+# ---------- Static asset versions ----------
+_ASSET_HASHES = {}   # name -> ((mtime_ns, size), hash)
+
+def asset_version(name: str) -> str:
+    """Short content hash of web/<name>; recomputed only when the file changes."""
+    path = os.path.join(app.static_folder, name)
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    entry = _ASSET_HASHES.get(name)
+    if entry is None or entry[0] != key:
+        with open(path, "rb") as f:
+            entry = _ASSET_HASHES[name] = (key, hashlib.sha1(f.read()).hexdigest()[:10])
+    return entry[1]
+
+_ASSET_REF_RE = re.compile(r'(src|href)="(' + "|".join(re.escape(a) for a in ASSETS) + r')(\?v=[^"]*)?"')
+
+# ---------- Push broadcaster ----------
+class Broadcaster:
+    """
+    In-process fan-out of server events to connected SSE clients.
+    Each client has a bounded queue; a client that falls behind gets its queue
+    replaced by a single "resync" event instead of blocking the publisher.
+    """
+    def __init__(self, queue_size: int):
+        self._queue_size = queue_size
+        self._subs = {}   # queue -> date filter (None = every date)
+        self._lock = threading.Lock()
+
+    def subscribe(self, date_filter=None) -> queue.Queue:
+        q = queue.Queue(maxsize=self._queue_size)
+        with self._lock:
+            self._subs[q] = date_filter
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            self._subs.pop(q, None)
+
+    def publish(self, event: str, data: dict, date=None):
+        with self._lock:
+            targets = [q for q, want in self._subs.items() if want is None or date is None or want == date]
+        for q in targets:
+            try:
+                q.put_nowait((event, data))
+            except queue.Full:
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait(("resync", {"date": date}))
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+BROADCAST = Broadcaster(SSE_QUEUE_SIZE)
+
+JOBS = ReloadJobs(_run_reload_job, workers=JOB_WORKERS, history=JOB_HISTORY)
+FEED = changes.ChangeFeed()
+
+def _scrape_for_cache(query_date: str):
+    # cache misses go through the job queue too, so a miss and a reload share one scrape
+    log(f"Scrape requested via /api/games for {query_date}")
+    job, _ = JOBS.submit(query_date)
+    result = JOBS.wait(job["id"])
+    if result is None:
+        raise RuntimeError(JOBS.get(job["id"]).get("error") or "scrape produced no result")
+    return result
+
+def _load_from_store(query_date: str):
+    # a date scraped before (by this process, another one or the CLI) is read back, not scraped
+    run = STORE.latest_run(query_date)
+    if run is None:
+        return None
+    result = STORE.load(query_date, run["id"])
+    if FEED.version(query_date) == 0:
+        FEED.record(query_date, result.get("games", []))
+    log(f"Loaded {query_date} from store (run {run['id']})")
+    return run["created"], result
+
+STORE = store.get_store()
+GAMES_CACHE = ResultCache(_scrape_for_cache, ttl=CACHE_TTL, max_entries=CACHE_MAX_DATES,
+                          seed=_load_from_store)
+
+# ---------- Auto refresh ----------
+_auto_refresh_started = False
+_auto_refresh_lock = threading.Lock()
+
+def _auto_refresh_loop():
+    # one scrape of "today" per interval for the whole process, pushed to all tabs
+    while True:
+        time.sleep(AUTO_REFRESH)
+        today = datetime.now(VIENNA).strftime("%Y-%m-%d")
+        job, joined = JOBS.submit(today)
+        log(f"Auto refresh for {today} -> job {job['id']}{' (joined)' if joined else ''}")
+
+def start_auto_refresh():
+    global _auto_refresh_started
+    with _auto_refresh_lock:
+        if _auto_refresh_started or AUTO_REFRESH <= 0:
+            return
+        _auto_refresh_started = True
+    threading.Thread(target=_auto_refresh_loop, name="auto-refresh", daemon=True).start()
 
 @app.before_request
 def _prepare():
     ensure_data_files()
+    start_auto_refresh()
 
 @app.after_request
-def _no_store(resp):
-    # Avoid stale cache in browsers/proxies
-    resp.headers["Cache-Control"] = "no-store"
+def _cache_headers(resp):
+    # content-hashed assets never change under the same URL
+    name = request.path.lstrip("/")
+    if name in ASSETS and resp.status_code in (200, 304) and request.args.get("v") == asset_version(name):
+        resp.cache_control.no_cache = None
+        resp.cache_control.public = True
+        resp.cache_control.max_age = ASSET_MAX_AGE
+        resp.cache_control.immutable = True
+    elif "Cache-Control" not in resp.headers:
+        # API answers (jobs, log, reload) are live state; other files revalidate via ETag
+        resp.headers["Cache-Control"] = "no-store" if request.path.startswith("/api/") else "no-cache"
     return resp
 
 # ---------- Static ----------
 @app.route("/")
 def index():
-    return send_from_directory("web", "index.html")
+    """index.html with asset URLs pinned to their content hash (so they can be cached for a year)."""
+    with open(os.path.join(app.static_folder, "index.html"), encoding="utf-8") as f:
+        html = _ASSET_REF_RE.sub(lambda m: f'{m.group(1)}="{m.group(2)}?v={asset_version(m.group(2))}"', f.read())
+    resp = Response(html, mimetype="text/html")
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.set_etag(hashlib.sha1(html.encode("utf-8")).hexdigest()[:20])
+    return resp.make_conditional(request)
+
+# ---------- Metrics ----------
+@app.route("/metrics")
+def prometheus_metrics():
+    """Prometheus text format: scrape stages, retries, bytes, games, jobs, cache."""
+    counts = JOBS.counts()
+    for state in ("queued", "running", "ok", "error"):
+        JOB_STATES.set(counts.get(state, 0), state=state)
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 # ---------- Logs ----------
+LOG_PAGE_MAX = 256 * 1024   # largest window /api/log returns
+
 @app.route("/api/log")
 def log_file():
-    with open(RELOAD_LOG, "r", encoding="utf-8") as f:
-        return jsonify({"log": f.read()[-10000:]})
+    """
+    GET /api/log                 -> last 10,000 bytes (seek from the end, never the whole file)
+    GET /api/log?before=<cursor> -> the page before `start` of a previous answer (scroll back)
+    GET /api/log?after=<cursor>  -> lines appended since `end` of a previous answer (follow)
+    GET /api/log?lines=N         -> last N lines from the in-memory ring buffer
+    `limit` (bytes) sizes the window. Cursors are byte offsets; "rotated": true means the
+    cursor belonged to a file that has since been rotated and the tail was returned instead.
+    """
+    book = logbook.get(RELOAD_LOG)
+    try:
+        limit = min(int(request.args.get("limit", 10000)), LOG_PAGE_MAX)
+        before = request.args.get("before", type=int)
+        after = request.args.get("after", type=int)
+        lines = request.args.get("lines", type=int)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if lines is not None:
+        recent = book.recent(min(lines, logbook.RING_LINES))
+        return jsonify({"log": "".join(recent), "lines": len(recent)})
+    return jsonify(book.read(limit=limit, before=before, after=after))
 
 # ---------- Games ----------
 @app.route("/api/games", methods=["GET"])
 def api_games():
     """
-    If ?date=YYYY-MM-DD is provided -> run scraper for that date and return its JSON.
+    If ?date=YYYY-MM-DD is provided -> that date's snapshot (memory cache, then the
+    SQLite store, then a scrape) as JSON.
+    If ?from=YYYY-MM-DD&to=YYYY-MM-DD -> all days of the range in one response.
     Else -> return the current merged.json from disk.
+    With date= or from=/to=, the games can be narrowed on the server (inverted index):
+      channel=     channel name part, or a HIGHLIGHT key (DAZN, SKY SPORT, ...)
+      competition= competition name part
+      q=           words, each found in a team / competition / channel / source token
+      limit=, cursor= pagination; pass back "next_cursor" for the next page
+                   (409 + "restart": true if a reload changed the list meanwhile)
+    Filtered answers add "total", "next_cursor" and "facets" {"highlight": {key: count}}.
     """
     query_date = request.args.get("date")
+    from_date, to_date = request.args.get("from"), request.args.get("to")
+    try:
+        filters = _filter_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if from_date or to_date:
+        return _games_range(from_date or to_date, to_date or from_date, filters)
 
     if query_date:
         # Validate the date
@@ -85,11 +645,11 @@ def api_games():
 
         start = time.time()
         try:
-            log(f"Scrape requested via /api/games for {query_date}")
-            result = scraper.main(query_date)  # your scraper should accept the date
+            result, cache_state = GAMES_CACHE.get(query_date)
         except Exception as e:
             log(f"Scraper exception: {e}")
             return jsonify({"error": str(e)}), 500
+        CACHE_REQUESTS.inc(cache=cache_state)
 
         elapsed = round(time.time() - start, 2)
 
@@ -100,17 +660,136 @@ def api_games():
                 "generated_at": result.get("generated_at"),
                 "error": result.get("error"),
                 "games": [],
-                "_meta": {"elapsed": elapsed, "status": "error", "stderr": result.get("error", "")}
+                "_meta": {"elapsed": elapsed, "status": "error", "stderr": result.get("error", ""),
+                          "cache": cache_state}
             }
             return jsonify(data), 500
 
-        # Success path
-        data = result if isinstance(result, dict) else {"date": query_date, "games": result}
-        data["_meta"] = {"elapsed": elapsed, "status": "ok", "stderr": ""}
-        return jsonify(data), 200
+        # Success path: prepared body (scraper timings + feed version), request info in headers
+        if not isinstance(result, dict):
+            result = {"date": query_date, "games": result}
+        version = FEED.version(query_date)
+        if filters is not None:
+            data = {k: v for k, v in result.items() if k not in ("games", "_meta")}
+            data.update(search.query([(query_date, PREPARED.index(query_date, result, version))], **filters))
+            data["_meta"] = {"status": "ok", "version": version}
+            resp = jsonify(data)
+            resp.headers.update({"X-Cache": cache_state.upper(), "X-Elapsed": str(elapsed)})
+            return resp
+        snap = PREPARED.get(query_date, result, version)
+        return send_snapshot(snap, {"X-Cache": cache_state.upper(), "X-Elapsed": str(elapsed)})
 
+    if filters is not None:
+        return jsonify({"error": "Filtering needs date=YYYY-MM-DD or from=/to=."}), 400
     # no ?date -> serve latest merged.json
-    return send_from_directory(DATA_DIR, "merged.json")
+    return send_snapshot(file_snapshot(MERGED))
+
+@app.errorhandler(search.StaleCursor)
+def _stale_cursor(e):
+    # a reload replaced the day's list between two pages: positions shifted, restart from page one
+    return jsonify({"error": str(e), "restart": True}), 409
+
+FILTER_PARAMS = ("channel", "competition", "q", "limit", "cursor")
+MAX_PAGE = 1000
+
+def _filter_args():
+    """Filter / pagination query args for search.query, or None when there are none."""
+    if not any(request.args.get(k) for k in FILTER_PARAMS):
+        return None
+    limit = request.args.get("limit")
+    if limit is not None:
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValueError("limit must be a positive integer.")
+        limit = min(int(limit), MAX_PAGE)
+    cursor = request.args.get("cursor") or None
+    if cursor:
+        search.decode_cursor(cursor)   # ValueError -> 400
+    return {"channel": request.args.get("channel") or None,
+            "competition": request.args.get("competition") or None,
+            "q": request.args.get("q") or None,
+            "limit": limit, "cursor": cursor}
+
+# ---------- Change feed ----------
+@app.route("/api/games/changes", methods=["GET"])
+def api_games_changes():
+    """
+    GET /api/games/changes?date=YYYY-MM-DD&since=<version>
+    Only the games added / removed / changed since `since`; an unknown or
+    missing version gets the full snapshot with "reset": true.
+    """
+    query_date = request.args.get("date") or datetime.now(VIENNA).strftime("%Y-%m-%d")
+    try:
+        date.fromisoformat(query_date)
+        since = int(request.args.get("since") or 0)
+    except ValueError:
+        return jsonify({"error": "Use date=YYYY-MM-DD and an integer since=<version>."}), 400
+    if FEED.version(query_date) == 0:
+        # not loaded by this process yet (restart, no /api/games call): seed from the store
+        try:
+            _load_from_store(query_date)
+        except Exception as e:
+            log(f"Changes seed for {query_date} failed: {e}")
+    return jsonify(FEED.since(query_date, since))
+
+# ---------- Push (Server-Sent Events) ----------
+@app.route("/api/stream")
+def api_stream():
+    """
+    GET /api/stream[?date=YYYY-MM-DD]  (text/event-stream)
+    Events:
+      changes -> same shape as /api/games/changes, plus "base" (version it applies to)
+      resync  -> the client missed events; fetch /api/games/changes?since=<its version>
+    Each open stream holds a worker thread; run gunicorn with --threads (or gevent).
+    """
+    query_date = request.args.get("date")
+    q = BROADCAST.subscribe(query_date)
+
+    def events():
+        try:
+            yield f"event: hello\ndata: {json.dumps({'date': query_date, 'version': FEED.version(query_date) if query_date else 0})}\n\n"
+            while True:
+                try:
+                    event, data = q.get(timeout=SSE_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        finally:
+            BROADCAST.unsubscribe(q)
+
+    resp = Response(stream_with_context(events()), mimetype="text/event-stream")
+    resp.headers["X-Accel-Buffering"] = "no"   # no proxy buffering (nginx)
+    return resp
+
+def _games_range(from_date: str, to_date: str, filters=None):
+    """Each day comes from the per-date cache (or a scrape job), at most RANGE_CONCURRENCY at once."""
+    try:
+        dates = days.date_range(from_date, to_date)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid range: {e} Use from=YYYY-MM-DD&to=YYYY-MM-DD."}), 400
+
+    start = time.time()
+    log(f"Range requested via /api/games for {dates[0]} .. {dates[-1]}")
+
+    def one(d):
+        try:
+            return GAMES_CACHE.get(d)
+        except Exception as e:
+            return {"error": str(e)}, "miss"
+
+    with ThreadPoolExecutor(max_workers=days.RANGE_CONCURRENCY, thread_name_prefix="range") as pool:
+        fetched = list(pool.map(one, dates))
+    data = days.combine_days([(d, result) for d, (result, _) in zip(dates, fetched)])
+    if filters is not None:
+        indexes = [(d, PREPARED.index(d, result, FEED.version(d)))
+                   for d, (result, _) in zip(dates, fetched)
+                   if isinstance(result, dict) and "error" not in result]
+        data.update(search.query(indexes, **filters))
+    data["_meta"].update(elapsed=round(time.time() - start, 2),
+                         cache={d: state for d, (_, state) in zip(dates, fetched)})
+    failed = [d for d, info in data["days"].items() if info["status"] == "error"]
+    data["_meta"]["status"] = "error" if len(failed) == len(dates) else "ok"
+    return jsonify(data), (500 if len(failed) == len(dates) else 200)
 
 # ---------- Reload (GET or POST) ----------
 @app.route("/api/reload", methods=["GET", "POST"])
@@ -120,6 +799,8 @@ def reload_data():
       - GET /api/reload?date=YYYY-MM-DD
       - POST /api/reload  with JSON {"date": "YYYY-MM-DD"}
     If date missing -> fallback to 'today' in Vienna.
+    Queues a background scrape and returns 202 with the job id right away;
+    poll /api/jobs/<id> for progress. A running job for the same date is joined.
     """
     # prefer query param, else JSON body
     query_date = request.args.get("date")
@@ -136,25 +817,28 @@ def reload_data():
     except ValueError:
         return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
 
-    log(f"Reload requested for {date_obj}")
-
-    start = time.time()
-    try:
-        result = scraper.main(query_date)
-    except Exception as e:
-        log(f"Scraper exception in /api/reload: {e}")
-        return jsonify({"status": "error", "elapsed": round(time.time() - start, 2), "stderr": str(e)}), 500
+    job, joined = JOBS.submit(date_obj.isoformat())
+    log(f"Reload requested for {date_obj} -> job {job['id']}{' (joined)' if joined else ''}")
+    return jsonify({"status": job["state"], "job_id": job["id"], "joined": joined,
+                    "poll": f"/api/jobs/{job['id']}"}), 202
 
-    elapsed = round(time.time() - start, 2)
-
-    # If scraper returns an error field, propagate 500
-    if isinstance(result, dict) and "error" in result:
-        stderr = result.get("error", "")
-        log(f"Reload error for {query_date}: {stderr}")
-        return jsonify({"status": "error", "elapsed": elapsed, "stderr": stderr}), 500
+# ---------- Jobs ----------
+@app.route("/api/jobs/<job_id>")
+def job_status(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id."}), 404
+    return jsonify(job)
 
-    log(f"Reload OK for {query_date} in {elapsed}s")
-    return jsonify({"status": "ok", "elapsed": elapsed, "stderr": ""}), 20
+@app.route("/api/jobs/<job_id>/cancel", methods=["POST"])
+def job_cancel(job_id):
+    job = JOBS.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id."}), 404
+    if job["finished_at"] is not None:
+        return jsonify({"error": "Job already finished.", "job": job}), 409
+    log(f"Cancel requested for job {job_id} ({job['date']})")
+    return jsonify(job), 202
 
 # ---------- Local dev ----------
 if __name__ == "__main__":
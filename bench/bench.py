@@ -0,0 +1,205 @@
+# ======================
+# TwLive3.0 - Benchmark offline peste capturile HTML
+# - parse_liveonsat_soup / parse_liveonsat_stream / parse_sporteventz_soup / merge_all
+#   pe capturile reale din web/data/
+# - main() complet cu rețeaua înlocuită (HTTP + Selenium servesc capturile), scriind într-un dir temporar
+# - aceleași etape pe date sintetice de 1k jocuri (bench/synthetic.py); 10k doar la cerere (--sizes),
+#   durează minute (doar BeautifulSoup peste SportEventz ~1 min)
+# - rezultatele în JSON; --baseline compară cu o rulare salvată (--save-baseline)
+#
+#   python bench/bench.py                         # fixture + 1k -> bench/results.json
+#   python bench/bench.py --sizes 1000,10000      # + 10k (lent)
+#   python bench/bench.py --sizes 1000 --save-baseline
+#   python bench/bench.py --sizes 1000 --baseline bench/baseline.json
+# ======================
+
+import argparse, json, os, platform, statistics, subprocess, sys, tempfile, time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+
+import scraper.scraper as scraper
+from scraper import captures, net, store, teams_normalize
+import synthetic
+
+DATE_ISO = "2025-08-29"          # ziua capturilor
+RESULTS = os.path.join(ROOT, "bench", "results.json")
+BASELINE = os.path.join(ROOT, "bench", "baseline.json")
+TOLERANCE = 0.25                 # +25% față de baseline = regresie
+
+
+def timed(fn, repeat: int) -> dict:
+    """Rulează fn de `repeat` ori; min/median în ms și ce a returnat ultima rulare (pentru numărători)."""
+    runs, value = [], None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        value = fn()
+        runs.append((time.perf_counter() - t0) * 1000)
+    out = {"min_ms": round(min(runs), 2), "median_ms": round(statistics.median(runs), 2), "runs": len(runs)}
+    if isinstance(value, list):
+        out["items"] = len(value)
+    return out
+
+
+# ---------- rețea înlocuită ----------
+class _Response:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, body: bytes):
+        self.content = body
+
+
+def stub_network(los_html: str, se_html: str, se_rendered: str):
+    """HTTP.get și Selenium servesc HTML-ul dat; fără token bucket-uri, fără browser."""
+    def get(url, headers=None, timeout=30, conditional=True, max_wait=None):
+        body = (los_html if "liveonsat" in url else se_html).encode("utf-8")
+        return net.FetchedPage(url, 200, body.decode("utf-8"), net.content_hash(body)), _Response(body)
+    scraper.HTTP.get = get
+    scraper.render_sporteventz_selenium = lambda date_iso: se_rendered
+
+
+def isolate_outputs(tmp: str):
+    """main() scrie în tmp: JSON-uri, reload.log, depozitul SQLite, tabela de alias-uri, capturile."""
+    scraper.WEB_DATA = tmp
+    scraper.DAYS_DIR = os.path.join(tmp, "games")
+    store._STORE = store.SnapshotStore(os.path.join(tmp, "bench.db"))
+    teams_normalize.set_table(teams_normalize.AliasTable(os.path.join(tmp, "aliases.json"),
+                                                        os.path.join(tmp, "aliases.learned.json")))
+    captures._STORE = captures.CaptureStore(os.path.join(tmp, "captures"))
+
+
+def run_main():
+    scraper.PARSED = net.ParsedCache()   # fără refolosire între rulări: măsurăm fetch+parse de fiecare dată
+    out = scraper.main(DATE_ISO, write_latest=True)
+    if "error" in out:
+        raise RuntimeError(out["error"])
+    return out["games"]
+
+
+# ---------- suite ----------
+def bench_fixtures(repeat: int) -> dict:
+    los_html = synthetic.load_fixture(synthetic.LOS_FIXTURE)
+    se_rendered = synthetic.load_fixture(synthetic.SE_FIXTURE)
+    los_games = scraper.parse_liveonsat_stream(los_html, DATE_ISO)
+    se_games = scraper.parse_sporteventz_soup(BeautifulSoup(se_rendered, "lxml"), DATE_ISO)
+    los_soup = BeautifulSoup(los_html, "html.parser")
+    se_soup = BeautifulSoup(se_rendered, "lxml")
+
+    res = {
+        "fixture.liveonsat.soup_build": timed(lambda: BeautifulSoup(los_html, "html.parser"), repeat),
+        "fixture.liveonsat.parse_soup": timed(lambda: scraper.parse_liveonsat_soup(los_soup, DATE_ISO), repeat),
+        "fixture.liveonsat.parse_stream": timed(lambda: scraper.parse_liveonsat_stream(los_html, DATE_ISO), repeat),
+        "fixture.sporteventz.soup_build": timed(lambda: BeautifulSoup(se_rendered, "lxml"), repeat),
+        "fixture.sporteventz.parse_soup": timed(lambda: scraper.parse_sporteventz_soup(se_soup, DATE_ISO), repeat),
+        "fixture.merge_all": timed(lambda: scraper.merge_all(los_games, se_games), repeat),
+    }
+    # main(): SportEventz servește direct pagina randată (capturată după Selenium)
+    with tempfile.TemporaryDirectory() as tmp:
+        isolate_outputs(tmp)
+        stub_network(los_html, se_rendered, se_rendered)
+        res["fixture.main"] = timed(run_main, repeat)
+    return res
+
+
+def bench_synthetic(n: int, repeat: int, with_soup: bool) -> dict:
+    t0 = time.perf_counter()
+    los_html = synthetic.scale_liveonsat(n)
+    se_rendered = synthetic.scale_sporteventz(n)
+    gen_ms = round((time.perf_counter() - t0) * 1000, 2)
+    los_games = scraper.parse_liveonsat_stream(los_html, DATE_ISO)
+    se_soup = BeautifulSoup(se_rendered, "lxml")
+    se_games = scraper.parse_sporteventz_soup(se_soup, DATE_ISO)
+    p = f"synthetic.{n}"
+    res = {
+        f"{p}.generate": {"min_ms": gen_ms, "median_ms": gen_ms, "runs": 1,
+                          "bytes": len(los_html) + len(se_rendered)},
+        f"{p}.liveonsat.parse_stream": timed(lambda: scraper.parse_liveonsat_stream(los_html, DATE_ISO), repeat),
+        f"{p}.sporteventz.soup_build": timed(lambda: BeautifulSoup(se_rendered, "lxml"), repeat),
+        f"{p}.sporteventz.parse_soup": timed(lambda: scraper.parse_sporteventz_soup(se_soup, DATE_ISO), repeat),
+        f"{p}.merge_all": timed(lambda: scraper.merge_all(los_games, se_games), repeat),
+    }
+    if with_soup:
+        los_soup = BeautifulSoup(los_html, "html.parser")
+        res[f"{p}.liveonsat.parse_soup"] = timed(lambda: scraper.parse_liveonsat_soup(los_soup, DATE_ISO), repeat)
+    return res
+
+
+# ---------- comparație ----------
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """[(nume, baseline_ms, acum_ms, raport, regresie)] pentru fiecare bench comun; raport = acum / baseline."""
+    rows = []
+    for name, now in results["results"].items():
+        then = baseline.get("results", {}).get(name)
+        if not then or not then.get("median_ms"):
+            continue
+        ratio = now["median_ms"] / then["median_ms"]
+        rows.append((name, then["median_ms"], now["median_ms"], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Offline benchmarks for the TwLive scraper.")
+    ap.add_argument("--sizes", default="1000",
+                    help="synthetic game counts, comma separated ('' = none; 10000 takes minutes)")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per fixture benchmark")
+    ap.add_argument("--synthetic-repeat", type=int, default=1, help="runs per synthetic benchmark")
+    ap.add_argument("--soup", action="store_true", help="also time parse_liveonsat_soup on synthetic data (slow)")
+    ap.add_argument("--out", default=RESULTS)
+    ap.add_argument("--baseline", help="compare against this results file")
+    ap.add_argument("--save-baseline", action="store_true", help=f"also write the results to {BASELINE}")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = ap.parse_args(argv)
+
+    scraper.log = lambda msg: None   # logul scraper-ului nu face parte din măsurătoare
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    results = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "git": git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+        },
+        "results": bench_fixtures(args.repeat),
+    }
+    for n in sizes:
+        results["results"].update(bench_synthetic(n, args.synthetic_repeat, args.soup))
+
+    for path in [args.out] + ([BASELINE] if args.save_baseline else []):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    width = max(len(k) for k in results["results"])
+    for name, r in results["results"].items():
+        extra = f"  ({r['items']} items)" if "items" in r else ""
+        print(f"{name:<{width}}  {r['median_ms']:>10.2f} ms{extra}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.tolerance)
+        print(f"\nvs {args.baseline} ({baseline.get('meta', {}).get('git', '?')}):")
+        for name, then, now, ratio, slower in rows:
+            print(f"{name:<{width}}  {then:>10.2f} -> {now:>10.2f} ms  x{ratio:.2f}{'  REGRESSION' if slower else ''}")
+        if any(r[4] for r in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
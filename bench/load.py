@@ -0,0 +1,133 @@
+# ======================
+# TwLive3.0 - Test de încărcare pentru /api/games și /api/reload
+# - N clienți concurenți timp de D secunde, pe un server pornit separat
+# - throughput (cereri/s), erori și latențe p50 / p95 / p99 / max, per endpoint
+# - complet offline cu serverul local de replay (scraper/replay.py):
+#
+#   python -m scraper.replay seed && python -m scraper.replay serve --latency 0.3 --jitter 0.2 --block-rate 0.05
+#   TWLIVE_UPSTREAM=http://127.0.0.1:8765 TWLIVE_RATE_LIVEONSAT=1000 TWLIVE_RATE_SPORTEVENTZ=1000 \
+#       TWLIVE_AUTO_REFRESH=0 python app.py
+#   python bench/load.py --url http://127.0.0.1:5050 --date 2025-08-29 --clients 16 --duration 20 --reload-every 5
+# ======================
+
+import argparse, json, statistics, sys, threading, time
+
+import requests
+
+
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+class Samples:
+    def __init__(self):
+        self.latencies = {}   # endpoint -> [ms]
+        self.errors = {}      # endpoint -> număr
+        self._lock = threading.Lock()
+
+    def add(self, endpoint: str, ms: float, ok: bool):
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(ms)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, seconds: float) -> dict:
+        out = {}
+        with self._lock:
+            for endpoint, lat in self.latencies.items():
+                out[endpoint] = {
+                    "requests": len(lat),
+                    "errors": self.errors.get(endpoint, 0),
+                    "rps": round(len(lat) / seconds, 1),
+                    "p50_ms": round(percentile(lat, 50), 2),
+                    "p95_ms": round(percentile(lat, 95), 2),
+                    "p99_ms": round(percentile(lat, 99), 2),
+                    "max_ms": round(max(lat), 2),
+                    "mean_ms": round(statistics.fmean(lat), 2),
+                }
+        return out
+
+
+def _timed_get(session, samples: Samples, endpoint: str, url: str, **kw):
+    t0 = time.perf_counter()
+    try:
+        r = session.get(url, timeout=120, **kw)
+        ok = r.status_code < 400
+    except requests.exceptions.RequestException:
+        r, ok = None, False
+    samples.add(endpoint, (time.perf_counter() - t0) * 1000, ok)
+    return r
+
+
+def games_client(base: str, date_iso: str, stop: threading.Event, samples: Samples, conditional: bool):
+    """Citește /api/games în buclă; cu `conditional` trimite ETag-ul primit (ca browserul)."""
+    session = requests.Session()
+    etag = None
+    while not stop.is_set():
+        headers = {"If-None-Match": etag} if conditional and etag else {}
+        r = _timed_get(session, samples, "games", f"{base}/api/games", params={"date": date_iso}, headers=headers)
+        if r is not None and r.headers.get("ETag"):
+            etag = r.headers["ETag"]
+
+
+def reload_client(base: str, date_iso: str, every: float, stop: threading.Event, samples: Samples):
+    """Pornește un /api/reload la fiecare `every` secunde și urmărește jobul până se termină."""
+    session = requests.Session()
+    while not stop.wait(every):
+        t0 = time.perf_counter()
+        try:
+            r = session.post(f"{base}/api/reload", params={"date": date_iso}, timeout=30)
+            job_id = r.json().get("job_id")
+            ok, state = r.status_code < 400 and bool(job_id), None
+            while ok and state not in ("ok", "error"):
+                time.sleep(0.2)
+                state = session.get(f"{base}/api/jobs/{job_id}", timeout=30).json().get("state")
+            ok = ok and state == "ok"
+        except (requests.exceptions.RequestException, ValueError):
+            ok = False
+        samples.add("reload", (time.perf_counter() - t0) * 1000, ok)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Load test /api/games and /api/reload of a running TwLive server.")
+    ap.add_argument("--url", default="http://127.0.0.1:5050")
+    ap.add_argument("--date", required=True, help="YYYY-MM-DD (a date the stand-in has recordings for)")
+    ap.add_argument("--clients", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=15, help="seconds")
+    ap.add_argument("--reload-every", type=float, default=0, help="seconds between reloads (0 = no reloads)")
+    ap.add_argument("--conditional", action="store_true", help="send If-None-Match like a browser")
+    ap.add_argument("--out", help="write the summary as JSON")
+    args = ap.parse_args(argv)
+
+    base = args.url.rstrip("/")
+    samples, stop = Samples(), threading.Event()
+    threads = [threading.Thread(target=games_client, args=(base, args.date, stop, samples, args.conditional),
+                                daemon=True) for _ in range(args.clients)]
+    if args.reload_every > 0:
+        threads.append(threading.Thread(target=reload_client, args=(base, args.date, args.reload_every, stop, samples),
+                                        daemon=True))
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join(timeout=130)
+    summary = {"clients": args.clients, "seconds": round(time.perf_counter() - t0, 2),
+               "endpoints": samples.summary(time.perf_counter() - t0)}
+
+    for endpoint, s in summary["endpoints"].items():
+        print(f"{endpoint:<7} {s['requests']:>7} req  {s['rps']:>8.1f}/s  err={s['errors']:<4} "
+              f"p50={s['p50_ms']:.1f}  p95={s['p95_ms']:.1f}  p99={s['p99_ms']:.1f}  max={s['max_ms']:.1f} ms")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# ======================
+# TwLive3.0 - Timp de import și memorie (RSS) pentru procesul web
+# - fiecare mod rulează într-un proces Python nou (ca un worker gunicorn proaspăt):
+#     serve-only -> TWLIVE_SERVE_ONLY=1, scraper-ul nu se importă niciodată
+#     lazy       -> implicit, scraper-ul se importă la primul scrape
+#     eager      -> lazy + scraper-ul importat imediat (costul vechiului import de la nivel de modul)
+# - raportează: timpul pentru `import app`, RSS după import, modulele grele încărcate
+#
+#   python bench/startup.py                       # toate modurile, mediana din 5 rulări
+#   python bench/startup.py --modes serve-only,eager --repeat 10
+#   python bench/startup.py --importtime serve-only   # cele mai scumpe importuri (-X importtime)
+# ======================
+
+import argparse, json, os, statistics, subprocess, sys, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("selenium", "webdriver_manager", "bs4", "lxml", "rapidfuzz", "numpy", "requests")
+MODES = {
+    "serve-only": {"TWLIVE_SERVE_ONLY": "1"},
+    "lazy": {"TWLIVE_SERVE_ONLY": "0"},
+    "eager": {"TWLIVE_SERVE_ONLY": "0", "_EAGER": "1"},
+}
+
+# rulează în procesul copil; cwd = dir temporar, ca web/data al aplicației să nu fie atins
+_PROBE = """
+import json, os, sys, time
+sys.path.insert(0, %(root)r)
+t0 = time.perf_counter()
+import app
+if os.environ.get("_EAGER") == "1":
+    app.scraper.load()
+elapsed = time.perf_counter() - t0
+rss = 0
+try:
+    with open("/proc/self/status") as f:
+        rss = next(int(l.split()[1]) for l in f if l.startswith("VmRSS:"))
+except (OSError, StopIteration):
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss   # KB pe Linux (vârf, nu curent)
+print(json.dumps({"import_s": elapsed, "rss_kb": rss,
+                  "heavy": [m for m in %(heavy)r if m in sys.modules], "modules": len(sys.modules)}))
+"""
+
+
+def _env(mode: str, tmp: str) -> dict:
+    env = dict(os.environ, TWLIVE_AUTO_REFRESH="0", TWLIVE_DB=os.path.join(tmp, "startup.db"))
+    env.update(MODES[mode])
+    return env
+
+
+def probe(mode: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        code = _PROBE % {"root": ROOT, "heavy": HEAVY}
+        proc = subprocess.run([sys.executable, "-c", code], cwd=tmp, env=_env(mode, tmp),
+                              capture_output=True, text=True, timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode}: {proc.stderr.strip()[-500:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(mode: str, repeat: int) -> dict:
+    runs = [probe(mode) for _ in range(max(1, repeat))]
+    return {
+        "import_ms": round(statistics.median(r["import_s"] for r in runs) * 1000, 1),
+        "rss_mb": round(statistics.median(r["rss_kb"] for r in runs) / 1024, 1),
+        "modules": runs[-1]["modules"],
+        "heavy": runs[-1]["heavy"],
+        "runs": len(runs),
+    }
+
+
+def importtime(mode: str, top: int = 15):
+    """Cele mai scumpe importuri (cumulativ) pentru `import app` în modul dat."""
+    with tempfile.TemporaryDirectory() as tmp:
+        code = _PROBE % {"root": ROOT, "heavy": HEAVY}
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=tmp,
+                              env=_env(mode, tmp), capture_output=True, text=True, timeout=120)
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative), int(self_us), name.rstrip()))
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:>9.1f} ms  {self_us / 1000:>8.1f} ms self  {name}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Import time and resident memory of the web process per mode.")
+    ap.add_argument("--modes", default=",".join(MODES), help="comma separated: " + ", ".join(MODES))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--importtime", metavar="MODE", help="show the slowest imports for one mode instead")
+    ap.add_argument("--out", help="write the results as JSON")
+    args = ap.parse_args(argv)
+
+    if args.importtime:
+        importtime(args.importtime)
+        return 0
+    results = {m: measure(m, args.repeat) for m in args.modes.split(",") if m}
+    for mode, r in results.items():
+        print(f"{mode:<11} import {r['import_ms']:>8.1f} ms   rss {r['rss_mb']:>6.1f} MB   "
+              f"{r['modules']:>5} modules   heavy: {', '.join(r['heavy']) or '-'}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
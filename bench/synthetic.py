@@ -0,0 +1,114 @@
+# ======================
+# TwLive3.0 - Generator sintetic pentru benchmark
+# - pornește de la capturile reale (web/data/__liveonsat.html, __sporteventz_selenium.html)
+# - multiplică box-urile LiveOnSat / rândurile SportEventz până la N jocuri,
+#   cu echipe și ore noi (deterministe, după seed)
+# - o parte din jocuri apar în ambele surse (nume ușor diferite), ca merge-ul să aibă ce potrivi
+# ======================
+
+import copy, os, random
+import lxml.html as H
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "web", "data")
+LOS_FIXTURE = os.path.join(FIXTURES, "__liveonsat.html")
+SE_FIXTURE = os.path.join(FIXTURES, "__sporteventz_selenium.html")
+
+SHARED = 0.6   # fracțiunea de jocuri prezente în ambele surse
+
+_SYLLABLES = ["ka", "lo", "mi", "ra", "te", "vu", "sa", "ne", "do", "pi", "gu", "be", "zo", "fa", "ri",
+              "chi", "tor", "lan", "mer", "vis", "dal", "gor", "nat", "sul", "bra", "cel", "dor", "fen"]
+_SUFFIXES = ["", "", "", " FC", " United", " City", " SC", " 04", " Athletic"]
+
+
+def _has_class(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+def load_fixture(path: str) -> str:
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", errors="ignore")
+
+
+def team_names(n: int, seed: int = 7) -> list:
+    """n perechi (home, away) distincte, pronunțabile, deterministe."""
+    rnd = random.Random(seed)
+    seen, out = set(), []
+    while len(out) < n:
+        def name():
+            word = "".join(rnd.choice(_SYLLABLES) for _ in range(rnd.randint(2, 3))).capitalize()
+            return word + rnd.choice(_SUFFIXES)
+        home, away = name(), name()
+        if home != away and (home, away) not in seen:
+            seen.add((home, away))
+            out.append((home, away))
+    return out
+
+
+def kickoff(i: int, n: int) -> str:
+    """Orele sunt împrăștiate uniform pe zi (ca fereastra de potrivire să conteze)."""
+    minutes = (i * 1440 // max(1, n)) % 1440
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def scale_liveonsat(n: int, html: str | None = None, seed: int = 7) -> str:
+    """Pagina LiveOnSat cu n box-uri (blockfix); headingurile de competiție se repetă ciclic."""
+    doc = H.fromstring(html or load_fixture(LOS_FIXTURE))
+    boxes = doc.xpath(f"//div[{_has_class('blockfix')}]")
+    container = boxes[0].getparent()
+    template = list(container)            # headinguri + box-uri, în ordinea documentului
+    names = team_names(n, seed)
+    for child in template:
+        container.remove(child)
+    made = 0
+    while made < n:
+        for child in template:
+            if made >= n:
+                break
+            el = copy.deepcopy(child)
+            if isinstance(el.tag, str) and "blockfix" in (el.get("class") or "").split():
+                teams = el.xpath(f".//div[{_has_class('fix_text')}]//div[{_has_class('fLeft')}]")
+                times = el.xpath(f".//div[{_has_class('fLeft_time_live')} or {_has_class('fLeft_time')}]")
+                if not teams or not times:
+                    continue
+                home, away = names[made]
+                teams[0].text = f"{home} v {away}"
+                for t in times:
+                    for sub in list(t):
+                        t.remove(sub)
+                    t.text = f"ST: {kickoff(made, n)}"
+                made += 1
+            container.append(el)
+    return H.tostring(doc, encoding="unicode")
+
+
+def scale_sporteventz(n: int, html: str | None = None, seed: int = 7, date_label: str = "Freitag, 29. August 2025") -> str:
+    """
+    Pagina SportEventz (randată) cu n rânduri .MagicTableRow.
+    Primele SHARED*n jocuri sunt cele din scale_liveonsat (același seed), scrise puțin altfel.
+    """
+    doc = H.fromstring(html or load_fixture(SE_FIXTURE))
+    rows = doc.xpath(f"//*[{_has_class('MagicTableRow')}]")
+    holders = [r.xpath("ancestor::tr[1]")[0] if r.xpath("ancestor::tr[1]") else r for r in rows]
+    container = holders[0].getparent()
+    for h in holders:
+        h.getparent().remove(h)
+    shared = int(n * SHARED)
+    los_names = team_names(n, seed)
+    own_names = team_names(n, seed + 1)
+    for i in range(n):
+        el = copy.deepcopy(holders[i % len(holders)])
+        if i < shared:
+            home, away = los_names[i]
+            home = "FC " + home if i % 3 == 0 else home   # variante ca în sursele reale
+            when = kickoff(i, n)
+        else:
+            home, away = own_names[i]
+            when = kickoff(i * 7 + 3, n)
+        for cls, value in (("MagicTableRowMainHomeTeamName", home), ("MagicTableRowMainAwayTeamName", away)):
+            for node in el.xpath(f".//*[{_has_class(cls)}]"):
+                node.text = value
+        for h3 in el.xpath(f".//*[{_has_class('MagicTableRowFootline')}]//h3"):
+            h3.text = f"{date_label} {when}"
+        container.append(el)
+    return H.tostring(doc, encoding="unicode")
@@ -0,0 +1,214 @@
+# ======================
+# TwLive3.0 - Pool de browsere headless (Chrome) pentru fallback-ul Selenium
+# - driverele rămân pornite între scrape-uri și sunt refolosite
+# - reciclare după N utilizări sau când driverul a căzut
+# - așteptări explicite (WebDriverWait) în loc de sleep-uri fixe
+# - statistici: latența checkout-ului și timpul de randare al paginii
+# ======================
+
+import os, time, threading, queue
+from contextlib import contextmanager
+
+# selenium / webdriver_manager se importă abia la primul driver (vezi _new_driver):
+# procesele care nu ajung la fallback-ul Selenium nu plătesc importul
+
+POOL_SIZE = int(os.environ.get("TWLIVE_BROWSER_POOL_SIZE", "1"))
+MAX_USES = int(os.environ.get("TWLIVE_BROWSER_MAX_USES", "25"))
+RENDER_TIMEOUT = float(os.environ.get("TWLIVE_BROWSER_WAIT", "20"))   # secunde pentru apariția rândurilor
+LAZY_TIMEOUT = float(os.environ.get("TWLIVE_BROWSER_LAZY_WAIT", "8"))  # ... și pentru rândurile încărcate leneș
+LAZY_POLL = 0.5        # secunde între două numărări ale rândurilor
+LAZY_STABLE_POLLS = 2  # numărul de rânduri nu mai crește de atâtea ori la rând -> gata
+
+
+def _rows_settled(by, css: str):
+    """
+    Condiție pentru WebDriverWait: derulează până jos și numără elementele `css`;
+    adevărată când numărul nu a mai crescut LAZY_STABLE_POLLS verificări la rând.
+    """
+    state = {"count": -1, "stable": 0}
+
+    def check(driver):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        count = len(driver.find_elements(by, css))
+        state["stable"] = state["stable"] + 1 if count <= state["count"] else 0
+        state["count"] = max(count, state["count"])
+        return state["stable"] >= LAZY_STABLE_POLLS
+
+    return check
+
+
+class _Slot:
+    """Un driver Chrome + câte pagini a randat."""
+    __slots__ = ("driver", "uses")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class _Timing:
+    """Contor simplu: ultima valoare, media și maximul (ms)."""
+    def __init__(self):
+        self.count, self.total, self.last, self.max = 0, 0.0, 0.0, 0.0
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total += ms
+        self.last = ms
+        self.max = max(self.max, ms)
+
+    def as_dict(self) -> dict:
+        avg = self.total / self.count if self.count else 0.0
+        return {"count": self.count, "last_ms": round(self.last, 1),
+                "avg_ms": round(avg, 1), "max_ms": round(self.max, 1)}
+
+
+class BrowserPool:
+    """
+    Pool de drivere Chrome headless, de lungă durată.
+    - cel mult `size` drivere, create leneș la primul checkout;
+    - un driver e reciclat (quit + înlocuit) după `max_uses` pagini sau la crash;
+    - render() deschide un URL și așteaptă explicit un selector CSS.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, max_uses: int = MAX_USES, log=print):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self._log = log
+        self._idle = queue.LifoQueue()   # driverul cel mai recent folosit e cel mai "cald"
+        self._created = 0
+        self._lock = threading.Lock()
+        self._driver_path = None
+        self._closed = False
+        self.recycled = 0
+        self.crashes = 0
+        self.checkout_ms = _Timing()
+        self.render_ms = _Timing()
+
+    # ---------- drivere ----------
+    def _new_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+        if self._driver_path is None:
+            # ChromeDriverManager().install() o singură dată per proces
+            self._driver_path = ChromeDriverManager().install()
+        opts = Options()
+        # opțiunea 'new' elimină warning-uri pe Chrome 115+
+        opts.add_argument("--headless=new")
+        opts.add_argument("--no-sandbox")
+        opts.add_argument("--disable-gpu")
+        opts.add_argument("--disable-dev-shm-usage")
+        opts.add_argument("--window-size=1366,900")
+        return webdriver.Chrome(service=Service(self._driver_path), options=opts)
+
+    def _retire(self, slot: _Slot):
+        try:
+            slot.driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    @contextmanager
+    def checkout(self, timeout: float | None = None):
+        """Împrumută un driver; la ieșire îl pune înapoi sau îl reciclează."""
+        if self._closed:
+            raise RuntimeError("browser pool is closed")
+        t0 = time.perf_counter()
+        slot = None
+        try:
+            slot = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    slot = _Slot(self._new_driver())
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    slot = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"no browser available within {timeout:.0f}s "
+                                       f"(pool size {self.size}, all in use)") from None
+        self.checkout_ms.add((time.perf_counter() - t0) * 1000)
+
+        from selenium.common.exceptions import WebDriverException
+        crashed = False
+        try:
+            yield slot.driver
+        except WebDriverException:
+            crashed = True
+            raise
+        finally:
+            slot.uses += 1
+            if crashed or self._closed or slot.uses >= self.max_uses:
+                if crashed:
+                    self.crashes += 1
+                    self._log("browser pool: driver crashed, replacing it")
+                else:
+                    self.recycled += 1
+                self._retire(slot)
+            else:
+                self._idle.put(slot)
+
+    def render(self, url: str, wait_css: str, timeout: float = RENDER_TIMEOUT) -> str:
+        """
+        Deschide `url`, așteaptă elementele `wait_css`, apoi derulează până jos până când
+        numărul lor nu mai crește (rândurile încărcate leneș), cel mult LAZY_TIMEOUT s.
+        Returnează HTML-ul final; dacă elementele nu apar în `timeout`, ce s-a randat până atunci.
+        Fără driver liber în `timeout` -> TimeoutError.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+        with self.checkout(timeout=timeout) as driver:
+            t0 = time.perf_counter()
+            driver.get(url)
+            wait = WebDriverWait(driver, timeout)
+            try:
+                wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, wait_css)))
+            except TimeoutException:
+                self._log(f"browser pool: no '{wait_css}' after {timeout:.0f}s on {url}")
+            else:
+                try:
+                    WebDriverWait(driver, LAZY_TIMEOUT, poll_frequency=LAZY_POLL).until(
+                        _rows_settled(By.CSS_SELECTOR, wait_css))
+                except TimeoutException:
+                    self._log(f"browser pool: '{wait_css}' still growing after {LAZY_TIMEOUT:.0f}s on {url}")
+            html = driver.page_source
+            self.render_ms.add((time.perf_counter() - t0) * 1000)
+            return html
+
+    # ---------- stare ----------
+    def stats(self) -> dict:
+        with self._lock:
+            created = self._created
+        return {
+            "size": self.size,
+            "live": created,
+            "idle": self._idle.qsize(),
+            "max_uses": self.max_uses,
+            "recycled": self.recycled,
+            "crashes": self.crashes,
+            "checkout": self.checkout_ms.as_dict(),
+            "render": self.render_ms.as_dict(),
+        }
+
+    def close(self):
+        """Oprește toate driverele libere; cele împrumutate sunt oprite la returnare."""
+        self._closed = True
+        while True:
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(slot)
@@ -0,0 +1,349 @@
+# ======================
+# TwLive3.0 - Capturi HTML pentru debug (în locul fișierelor __*.html suprascrise la fiecare scrape)
+# - opt-in / eșantionat: TWLIVE_CAPTURE = off (implicit) | on | errors | 0.1 (fracțiune + erori)
+# - paginile stau în memorie cât rulează scrape-ul; la final se scriu doar dacă scrape-ul e păstrat
+# - conținut adresat prin hash: blobs/<aa>/<sha1>.html.gz, o pagină neschimbată e stocată o singură dată
+# - index SQLite (index.db): scrape-uri (id, dată, stare, run din depozit) + capturi (sursă, tip, URL, hash)
+# - retenție: ultimele TWLIVE_CAPTURE_KEEP scrape-uri și cel mult TWLIVE_CAPTURE_MAX_MB pe disc
+#
+#   python -m scraper.captures list [--date 2025-08-29] [--source LiveOnSat]
+#   python -m scraper.captures show <scrape_id>
+#   python -m scraper.captures replay <scrape_id> [--out out.json]   # parsere + merge, offline
+#   python -m scraper.captures export <scrape_id> --dir data/replay   # pentru serverul din replay.py
+# ======================
+
+import argparse, gzip, hashlib, json, os, random, sqlite3, sys, threading, time, uuid
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAPTURE_DIR = os.environ.get("TWLIVE_CAPTURE_DIR", os.path.join(ROOT, "data", "captures"))
+MODE = os.environ.get("TWLIVE_CAPTURE", "off").strip().lower()
+KEEP_SCRAPES = int(os.environ.get("TWLIVE_CAPTURE_KEEP", "200"))
+MAX_BYTES = int(float(os.environ.get("TWLIVE_CAPTURE_MAX_MB", "100")) * 1024 * 1024)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrapes (
+    id      TEXT PRIMARY KEY,
+    date    TEXT NOT NULL,
+    created REAL NOT NULL,
+    status  TEXT NOT NULL,            -- ok | error
+    reason  TEXT NOT NULL,            -- on | sampled | errors
+    run_id  INTEGER                   -- run-ul din store.py, dacă există
+);
+CREATE INDEX IF NOT EXISTS scrapes_date ON scrapes(date, created);
+
+CREATE TABLE IF NOT EXISTS captures (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    scrape_id TEXT NOT NULL REFERENCES scrapes(id) ON DELETE CASCADE,
+    seq       INTEGER NOT NULL,       -- ordinea în scrape
+    source    TEXT NOT NULL,
+    kind      TEXT NOT NULL,          -- http | selenium
+    url       TEXT,
+    hash      TEXT NOT NULL,
+    bytes     INTEGER NOT NULL,
+    created   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS captures_scrape ON captures(scrape_id, seq);
+CREATE INDEX IF NOT EXISTS captures_source ON captures(source, scrape_id);
+CREATE INDEX IF NOT EXISTS captures_hash ON captures(hash);
+
+CREATE TABLE IF NOT EXISTS blobs (
+    hash   TEXT PRIMARY KEY,
+    stored INTEGER NOT NULL           -- bytes pe disc (gzip)
+);
+"""
+
+
+def sample_rate(mode: str) -> float:
+    """off -> 0, on -> 1, errors -> 0 (doar erorile), altfel fracțiunea dată."""
+    if mode in ("", "0", "off", "no", "false", "errors"):
+        return 0.0
+    if mode in ("1", "on", "yes", "true", "all"):
+        return 1.0
+    try:
+        return min(1.0, max(0.0, float(mode)))
+    except ValueError:
+        return 0.0
+
+
+class Capture:
+    """Paginile unui singur scrape, ținute în memorie până la finish()."""
+
+    def __init__(self, date_iso: str, sampled: bool, reason: str = "sampled"):
+        self.id = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+        self.date = date_iso
+        self.sampled = sampled
+        self.reason = reason if sampled else "errors"   # de ce e păstrat: on | sampled | errors
+        self.created = time.time()
+        self.items = []   # (source, kind, url, body bytes)
+        self._lock = threading.Lock()   # sursele adaugă din thread-uri diferite
+
+    def add(self, source: str, kind: str, url: str, body):
+        if body is None:
+            return
+        if isinstance(body, str):
+            body = body.encode("utf-8", errors="ignore")
+        with self._lock:
+            self.items.append((source, kind, url, body))
+
+
+class CaptureStore:
+    def __init__(self, directory: str = CAPTURE_DIR, keep: int = KEEP_SCRAPES, max_bytes: int = MAX_BYTES):
+        self.dir = directory
+        self.keep = max(1, keep)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.dir, "blobs"), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(os.path.join(self.dir, "index.db"), timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.dir, "blobs", digest[:2], digest + ".html.gz")
+
+    def _put_blob(self, digest: str, data: bytes) -> int | None:
+        """Scrie blob-ul (deja comprimat) dacă nu există; returnează bytes scriși (None = exista deja)."""
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            return None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return len(data)
+
+    def save(self, capture: Capture, status: str, reason: str, run_id: int | None = None) -> dict:
+        """
+        Scrie blob-urile noi și indexul scrape-ului, apoi aplică retenția.
+        Verificarea "blob-ul există", scrierea lui și rândurile care îl referă sunt în aceeași
+        tranzacție de scriere (BEGIN IMMEDIATE) ca prune(): un prune concurent, și din alt proces,
+        nu poate șterge blob-ul ca orfan între verificare și insert.
+        """
+        with capture._lock:
+            items = list(capture.items)
+        digests = [hashlib.sha1(body).hexdigest() for _, _, _, body in items]
+        # comprimăm în afara lock-ului, doar ce pare să lipsească (se reverifică mai jos)
+        packed = {d: gzip.compress(body, 6) for d, (_, _, _, body) in zip(digests, items)
+                  if not os.path.exists(self._blob_path(d))}
+        rows, new_blobs, written = [], [], 0
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for seq, ((source, kind, url, body), digest) in enumerate(zip(items, digests)):
+                if digest not in packed and not os.path.exists(self._blob_path(digest)):
+                    packed[digest] = gzip.compress(body, 6)   # șters de un prune între timp
+                stored = self._put_blob(digest, packed[digest]) if digest in packed else None
+                if stored is not None:
+                    new_blobs.append((digest, stored))
+                    written += stored
+                rows.append((capture.id, seq, source, kind, url, digest, len(body), capture.created))
+            conn.execute("INSERT OR REPLACE INTO scrapes(id, date, created, status, reason, run_id) "
+                         "VALUES (?, ?, ?, ?, ?, ?)",
+                         (capture.id, capture.date, capture.created, status, reason, run_id))
+            conn.executemany("INSERT INTO captures(scrape_id, seq, source, kind, url, hash, bytes, created) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("INSERT OR IGNORE INTO blobs(hash, stored) VALUES (?, ?)", new_blobs)
+        removed = self.prune()
+        return {"id": capture.id, "pages": len(rows), "new_blobs": len(new_blobs),
+                "written": written, "pruned": removed}
+
+    # ---------- retenție ----------
+    def prune(self) -> int:
+        """Șterge cele mai vechi scrape-uri peste limite și blob-urile rămase fără capturi."""
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            old = [r["id"] for r in conn.execute(
+                "SELECT id FROM scrapes ORDER BY created DESC LIMIT -1 OFFSET ?", (self.keep,))]
+            conn.executemany("DELETE FROM scrapes WHERE id = ?", [(i,) for i in old])
+            removed = len(old)
+            if self.max_bytes > 0:
+                while True:
+                    total = conn.execute(
+                        "SELECT COALESCE(SUM(stored), 0) FROM blobs WHERE hash IN (SELECT hash FROM captures)"
+                    ).fetchone()[0]
+                    if total <= self.max_bytes:
+                        break
+                    oldest = conn.execute("SELECT id FROM scrapes ORDER BY created LIMIT 1 OFFSET 0").fetchone()
+                    newest = conn.execute("SELECT id FROM scrapes ORDER BY created DESC LIMIT 1").fetchone()
+                    if oldest is None or oldest["id"] == newest["id"]:
+                        break   # ultimul scrape rămâne, chiar dacă e mai mare decât limita
+                    conn.execute("DELETE FROM scrapes WHERE id = ?", (oldest["id"],))
+                    removed += 1
+            orphans = [r["hash"] for r in conn.execute(
+                "SELECT hash FROM blobs WHERE hash NOT IN (SELECT hash FROM captures)")]
+            conn.executemany("DELETE FROM blobs WHERE hash = ?", [(h,) for h in orphans])
+            # fișierele se șterg tot în tranzacție: un save() concurent așteaptă și le rescrie
+            for digest in orphans:
+                try:
+                    os.remove(self._blob_path(digest))
+                except OSError:
+                    pass
+        return removed
+
+    # ---------- citire ----------
+    def scrapes(self, date_iso: str | None = None, source: str | None = None, limit: int = 50) -> list:
+        sql = ("SELECT s.*, COUNT(c.id) AS pages, COALESCE(SUM(c.bytes), 0) AS bytes "
+               "FROM scrapes s LEFT JOIN captures c ON c.scrape_id = s.id")
+        where, args = [], []
+        if date_iso:
+            where.append("s.date = ?")
+            args.append(date_iso)
+        if source:
+            where.append("s.id IN (SELECT scrape_id FROM captures WHERE source = ?)")
+            args.append(source)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " GROUP BY s.id ORDER BY s.created DESC LIMIT ?"
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(sql, (*args, limit))]
+
+    def pages(self, scrape_id: str) -> list:
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(
+                "SELECT * FROM captures WHERE scrape_id = ? ORDER BY seq", (scrape_id,))]
+
+    def scrape(self, scrape_id: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM scrapes WHERE id = ?", (scrape_id,)).fetchone()
+        return dict(row) if row else None
+
+    def body(self, digest: str) -> bytes:
+        with open(self._blob_path(digest), "rb") as f:
+            return gzip.decompress(f.read())
+
+    def usage(self) -> dict:
+        with self._connect() as conn:
+            scrapes = conn.execute("SELECT COUNT(*) FROM scrapes").fetchone()[0]
+            pages, raw = conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM captures").fetchone()
+            blobs, stored = conn.execute("SELECT COUNT(*), COALESCE(SUM(stored), 0) FROM blobs").fetchone()
+        return {"scrapes": scrapes, "pages": pages, "raw_bytes": raw, "blobs": blobs, "stored_bytes": stored}
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> CaptureStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = CaptureStore()
+        return _STORE
+
+
+# ---------- folosite de scraper.main ----------
+def begin(date_iso: str, mode: str | None = None) -> Capture | None:
+    """Capture pentru un scrape nou, sau None când capturile sunt oprite (fără niciun cost)."""
+    mode = MODE if mode is None else mode
+    if mode in ("", "0", "off", "no", "false"):
+        return None
+    rate = sample_rate(mode)
+    return Capture(date_iso, sampled=random.random() < rate, reason="on" if rate >= 1 else "sampled")
+
+
+def finish(capture: Capture | None, failed: bool, run_id: int | None = None) -> dict | None:
+    """Păstrează scrape-ul dacă a fost eșantionat sau (în orice mod activ) dacă a eșuat."""
+    if capture is None or not capture.items:
+        return None
+    if not capture.sampled and not failed:
+        return None
+    return get_store().save(capture, "error" if failed else "ok", capture.reason, run_id)
+
+
+# ---------- CLI ----------
+def last_pages(pages: list) -> dict:
+    """Ultima captură per sursă = pagina dată parserului (după reîncercări / Selenium)."""
+    out = {}
+    for p in pages:
+        out[p["source"]] = p
+    return out
+
+
+def replay(scrape_id: str, store: CaptureStore | None = None) -> dict:
+    """Rulează parserele și merge-ul peste paginile capturate ale unui scrape (fără rețea)."""
+    try:
+        from . import scraper
+    except ImportError:
+        import scraper
+    store = store or get_store()
+    meta = store.scrape(scrape_id)
+    if meta is None:
+        raise KeyError(scrape_id)
+    by_source, stats = {}, {}
+    for source, page in last_pages(store.pages(scrape_id)).items():
+        adapter = scraper.REGISTRY.get(source)
+        if adapter is None:
+            continue
+        stats[source] = {}
+        t0 = time.perf_counter()
+        by_source[source] = adapter.parse(store.body(page["hash"]).decode("utf-8", errors="ignore"), meta["date"],
+                                  stats=stats[source])
+        stats[source].update(parse_ms=round((time.perf_counter() - t0) * 1000, 1),
+                             games=len(by_source[source]))
+    # ordinea registrului, ca în scraper.main
+    by_source = {name: by_source[name] for name in scraper.REGISTRY.names() if name in by_source}
+    merged = scraper.merge_sources(by_source)
+    return {"scrape_id": scrape_id, "date": meta["date"], "sources": stats,
+            "counters": {**{s: len(g) for s, g in by_source.items()}, "Total": len(merged)},
+            "games": merged}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Browse and replay captured scraper pages.")
+    ap.add_argument("--dir", default=CAPTURE_DIR)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ls = sub.add_parser("list", help="captured scrapes, newest first")
+    ls.add_argument("--date")
+    ls.add_argument("--source")
+    ls.add_argument("--limit", type=int, default=50)
+    sh = sub.add_parser("show", help="pages of one scrape")
+    sh.add_argument("scrape_id")
+    rp = sub.add_parser("replay", help="run the parsers and the merge over one scrape")
+    rp.add_argument("scrape_id")
+    rp.add_argument("--out", help="write the merged result as JSON")
+    ex = sub.add_parser("export", help="write one scrape as recordings for scraper/replay.py")
+    ex.add_argument("scrape_id")
+    ex.add_argument("--dir", dest="replay_dir", required=True)
+    sub.add_parser("usage", help="disk usage of the store")
+    args = ap.parse_args(argv)
+
+    store = CaptureStore(args.dir)
+    if getattr(args, "scrape_id", None) is not None and store.scrape(args.scrape_id) is None:
+        print(f"unknown scrape id: {args.scrape_id}", file=sys.stderr)
+        return 2
+    if args.cmd == "list":
+        for s in store.scrapes(args.date, args.source, args.limit):
+            print(f"{s['id']}  {s['date']}  {s['status']:<5} {s['reason']:<7} "
+                  f"{s['pages']:>2} pages {s['bytes'] / 1024:>8.0f} KB  run={s['run_id'] or '-'}")
+    elif args.cmd == "show":
+        for p in store.pages(args.scrape_id):
+            print(f"{p['seq']:>2} {p['source']:<12} {p['kind']:<8} {p['bytes']:>8} B  {p['hash'][:12]}  {p['url']}")
+    elif args.cmd == "replay":
+        out = replay(args.scrape_id, store)
+        print(json.dumps({k: v for k, v in out.items() if k != "games"}, indent=2))
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(out, f, ensure_ascii=False, indent=1)
+    elif args.cmd == "export":
+        try:
+            from . import replay as replay_mod
+        except ImportError:
+            import replay as replay_mod
+        meta = store.scrape(args.scrape_id)
+        rec = replay_mod.Recorder(args.replay_dir)
+        for page in last_pages(store.pages(args.scrape_id)).values():
+            rec.save(page["url"], meta["date"], store.body(page["hash"]))
+        print(f"exported {args.scrape_id} to {args.replay_dir}")
+    else:
+        print(json.dumps(store.usage(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# ======================
+# TwLive3.0 - Feed de modificări per dată
+# - fiecare joc are "id" (stabil între scrape-uri) și "hash" (conținutul lui)
+# - la fiecare scrape calculăm delta față de snapshot-ul anterior al datei:
+#   added / removed / changed, cu o versiune nouă
+# - clienții cer doar modificările de după versiunea pe care o au deja
+# ======================
+
+import hashlib, json, threading, time
+
+HISTORY = 50   # câte delte păstrăm per dată; cereri mai vechi primesc snapshot complet
+
+
+def game_hash(g: dict) -> str:
+    """Hash-ul conținutului unui joc (fără câmpurile id/hash)."""
+    body = {k: v for k, v in g.items() if k not in ("id", "hash")}
+    raw = json.dumps(body, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class _DateFeed:
+    __slots__ = ("version", "games", "deltas")
+
+    def __init__(self):
+        self.version = 0
+        self.games = {}     # id -> joc (snapshot curent)
+        self.deltas = []    # [(version, added, removed_ids, changed)]
+
+
+class ChangeFeed:
+    """Snapshot + istoric de delte per dată, în memorie."""
+
+    def __init__(self, history: int = HISTORY):
+        self.history = history
+        self._dates = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_version(previous: int) -> int:
+        # milisecunde: versiunile rămân crescătoare și după un restart al procesului
+        return max(previous + 1, time.time_ns() // 1_000_000)
+
+    def record(self, date_iso: str, games: list) -> int:
+        """Înregistrează snapshot-ul nou al datei; returnează versiunea curentă."""
+        current = {g["id"]: g for g in games if g.get("id")}
+        with self._lock:
+            feed = self._dates.setdefault(date_iso, _DateFeed())
+            old = feed.games
+            added = [g for i, g in current.items() if i not in old]
+            removed = [i for i in old if i not in current]
+            changed = [g for i, g in current.items() if i in old and old[i].get("hash") != g.get("hash")]
+            if feed.version and not (added or removed or changed):
+                return feed.version
+            feed.version = self._new_version(feed.version)
+            feed.games = current
+            feed.deltas.append((feed.version, added, removed, changed))
+            del feed.deltas[:-self.history]
+            return feed.version
+
+    def version(self, date_iso: str) -> int:
+        with self._lock:
+            feed = self._dates.get(date_iso)
+            return feed.version if feed else 0
+
+    def since(self, date_iso: str, since: int | None) -> dict:
+        """
+        Modificările datei după versiunea `since`.
+        Fără istoric suficient (sau since lipsă) -> {"reset": True, "games": snapshot}.
+        """
+        with self._lock:
+            feed = self._dates.get(date_iso)
+            if feed is None:
+                # nimic înregistrat pentru dată: clientul trebuie să-și golească lista, nu s-o păstreze
+                return {"date": date_iso, "version": 0, "reset": True, "games": []}
+            out = {"date": date_iso, "version": feed.version}
+            if since == feed.version:
+                return {**out, "reset": False, "added": [], "removed": [], "changed": []}
+            # `since` trebuie să fie o versiune încă păstrată în istoric
+            known = {v for v, *_ in feed.deltas}
+            if not since or since not in known:
+                return {**out, "reset": True, "games": list(feed.games.values())}
+
+            first, last = {}, {}   # id -> prima operație / ultima stare (joc sau None)
+            for version, added, removed, changed in feed.deltas:
+                if version <= since:
+                    continue
+                for g in added:
+                    first.setdefault(g["id"], "added")
+                    last[g["id"]] = g
+                for g in changed:
+                    first.setdefault(g["id"], "changed")
+                    last[g["id"]] = g
+                for i in removed:
+                    first.setdefault(i, "removed")
+                    last[i] = None
+        res = {"added": [], "removed": [], "changed": []}
+        for i, g in last.items():
+            if g is None:
+                if first[i] != "added":
+                    res["removed"].append(i)
+            elif first[i] == "added":
+                res["added"].append(g)
+            else:
+                res["changed"].append(g)
+        return {**out, "reset": False, **res}
@@ -0,0 +1,60 @@
+# ======================
+# TwLive3.0 - Intervale de zile (from/to)
+# - lista de date a unui interval și răspunsul combinat peste mai multe zile
+# - fără dependențe de scraping: le folosesc atât scraper-ul (main_range),
+#   cât și serverul web pentru /api/games?from=&to=
+# ======================
+
+import os
+from datetime import date, datetime, timedelta
+
+import pytz
+
+VIENNA = pytz.timezone("Europe/Vienna")
+RANGE_CONCURRENCY = int(os.environ.get("TWLIVE_RANGE_CONCURRENCY", "3"))
+MAX_RANGE_DAYS = 14
+
+
+def date_range(from_iso: str, to_iso: str) -> list:
+    """Lista de date ISO între from și to (inclusiv). ValueError pentru interval invalid."""
+    start, end = date.fromisoformat(from_iso), date.fromisoformat(to_iso)
+    if end < start:
+        raise ValueError("'to' is before 'from'")
+    n = (end - start).days + 1
+    if n > MAX_RANGE_DAYS:
+        raise ValueError(f"Range too long ({n} days, max {MAX_RANGE_DAYS}).")
+    return [(start + timedelta(days=i)).isoformat() for i in range(n)]
+
+
+def combine_days(results: list) -> dict:
+    """
+    Unește rezultatele mai multor zile [(date_iso, out), ...] într-un singur răspuns:
+    jocurile tuturor zilelor (sortate), contoare însumate, starea fiecărei zile.
+    """
+    games, days, meta = [], {}, {}
+    counters = {}   # toate sursele din contoarele zilelor (oricâte are registrul) + "Total"
+    for date_iso, out in results:
+        out = out if isinstance(out, dict) else {"error": "no result"}
+        if "error" in out:
+            days[date_iso] = {"status": "error", "error": out.get("error")}
+            continue
+        games.extend(out.get("games", []))
+        for k, n in (out.get("counters") or {}).items():
+            counters[k] = counters.get(k, 0) + n
+        days[date_iso] = {"status": "ok", "counters": out.get("counters"),
+                          "generated_at": out.get("generated_at")}
+        if out.get("_meta"):
+            meta[date_iso] = out["_meta"]
+    counters["Total"] = counters.pop("Total", 0)   # la final, ca în răspunsul unei zile
+    games.sort(key=lambda x: (x["time_local"], x["teams_display"].lower()))
+    dates = [d for d, _ in results]
+    return {
+        "from": dates[0] if dates else None,
+        "to": dates[-1] if dates else None,
+        "generated_at": f"{datetime.now(VIENNA):%Y-%m-%d %H:%M:%S}",
+        "counters": counters,
+        "timezone": "Europe/Vienna (GMT+2)",
+        "days": days,
+        "games": games,
+        "_meta": {"days": meta},
+    }
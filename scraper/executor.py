@@ -0,0 +1,244 @@
+# ======================
+# TwLive3.0 - Executor de scrape-uri în procese separate
+# - main() rulează într-un proces worker, nu în procesul web: parse-ul (BeautifulSoup)
+#   și merge-ul (fuzzy) nu mai țin GIL-ul worker-ului Flask
+# - workerii sunt porniți cu "spawn" și rămân calzi între joburi (sesiunea HTTP,
+#   jocurile parsate, browserele din pool); reciclați după MAX_JOBS joburi
+# - fiecare job are un termen limită dur: un worker blocat (ex. Selenium) e oprit
+#   (SIGTERM, apoi SIGKILL) și înlocuit la următorul job
+# - IPC pe un Pipe per worker:
+#     părinte -> worker: ("scrape", date_iso)
+#     worker -> părinte: ("progress", event) ... ("done", result, metrics_delta)
+#   erorile vin tot ca rezultat: {"error": ..., "error_kind": timeout | crash | cancelled | exception}
+# - "spawn" reimportă scriptul principal în worker: codul de pornire din el trebuie să stea
+#   sub `if __name__ == "__main__":` (ca în app.py)
+# ======================
+
+import os, signal, threading, time, traceback, atexit
+import multiprocessing as mp
+
+try:
+    from . import metrics
+except ImportError:  # rulat ca script
+    import metrics
+
+WORKERS = int(os.environ.get("TWLIVE_SCRAPE_WORKERS", "2"))
+JOB_TIMEOUT = float(os.environ.get("TWLIVE_SCRAPE_TIMEOUT", "300"))   # secunde per job, tot cu tot
+MAX_JOBS = int(os.environ.get("TWLIVE_WORKER_MAX_JOBS", "50"))        # joburi per worker până la reciclare
+KILL_GRACE = 3.0   # secunde între SIGTERM și SIGKILL
+POLL = 0.25        # cât de des verificăm anularea / worker-ul mort cât așteptăm
+
+WORKER_EVENTS = metrics.REGISTRY.counter(
+    "twlive_scrape_worker_events_total", "Scrape worker lifecycle (started, recycled, timeout, crash, cancelled).",
+    ("event",))
+
+
+# ---------- procesul worker ----------
+def _exit_on_term(signum, frame):
+    # SIGTERM -> SystemExit, ca atexit să închidă browserele din pool
+    raise SystemExit(0)
+
+
+def _worker_main(conn):
+    """Bucla unui worker: importă scraper-ul o dată, apoi rulează joburile primite pe `conn`."""
+    signal.signal(signal.SIGTERM, _exit_on_term)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # Ctrl+C oprește părintele, care ne oprește pe noi
+    from scraper import scraper
+    send_lock = threading.Lock()   # sursele raportează progresul din thread-uri diferite
+
+    def send(msg):
+        with send_lock:
+            conn.send(msg)
+
+    send(("ready", os.getpid()))
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg[0] != "scrape":
+            return
+        date_iso = msg[1]
+        before = metrics.REGISTRY.state()
+        try:
+            result = scraper.main(date_iso, progress=lambda event: send(("progress", event)))
+        except Exception as e:
+            result = {"error": str(e), "error_kind": "exception", "traceback": traceback.format_exc()}
+        delta = metrics.REGISTRY.diff(before, metrics.REGISTRY.state())
+        send(("done", result, delta))
+
+
+class _Worker:
+    __slots__ = ("process", "conn", "jobs", "pid")
+
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe(duplex=True)
+        self.process = ctx.Process(target=_worker_main, args=(child,), name="scrape-worker", daemon=True)
+        self.process.start()
+        child.close()
+        self.jobs = 0
+        self.pid = self.process.pid
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, grace: float = KILL_GRACE):
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(grace)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(1)
+
+
+class ScrapeExecutor:
+    """
+    Pool de `size` procese pentru scraper.main(). run() blochează thread-ul apelant
+    (un thread din ReloadJobs) cât rulează jobul, nu procesul web.
+    """
+
+    def __init__(self, size: int = WORKERS, timeout: float = JOB_TIMEOUT, max_jobs: int = MAX_JOBS, log=print):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_jobs = max(1, max_jobs)
+        self._log = log
+        self._ctx = mp.get_context("spawn")   # fără fork dintr-un proces cu thread-uri
+        self._idle = []
+        self._busy = set()
+        self._slots = threading.Semaphore(self.size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.counts = {"jobs": 0, "ok": 0, "error": 0, "timeout": 0, "crash": 0, "cancelled": 0,
+                       "started": 0, "recycled": 0}
+
+    # ---------- workeri ----------
+    def _count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+        if key in ("started", "recycled", "timeout", "crash", "cancelled"):
+            WORKER_EVENTS.inc(event=key)
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                w = self._idle.pop()
+                if w.alive():
+                    self._busy.add(w)
+                    return w
+                w.stop()
+        w = _Worker(self._ctx)
+        self._count("started")
+        self._log(f"scrape executor: worker {w.pid} started")
+        with self._lock:
+            self._busy.add(w)
+        return w
+
+    def _checkin(self, w: _Worker):
+        with self._lock:
+            self._busy.discard(w)
+            keep = not self._closed and w.jobs < self.max_jobs and w.alive()
+            if keep:
+                self._idle.append(w)
+        if not keep:
+            if w.jobs >= self.max_jobs:
+                self._count("recycled")
+            w.stop()
+
+    def _discard(self, w: _Worker):
+        with self._lock:
+            self._busy.discard(w)
+        w.stop()
+
+    def prestart(self, n: int | None = None):
+        """Pornește workerii dinainte (importul scraper-ului se face acum, nu la primul job)."""
+        for _ in range(min(self.size, n or self.size)):
+            with self._lock:
+                if len(self._idle) + len(self._busy) >= self.size:
+                    return
+            w = self._checkout()
+            self._checkin(w)
+
+    # ---------- joburi ----------
+    def run(self, date_iso: str, progress=None, timeout: float | None = None, cancel=None) -> dict:
+        """
+        Rulează scraper.main(date_iso) într-un worker și returnează rezultatul lui.
+        `progress(event)` primește evenimentele de etapă; `cancel` (threading.Event) oprește jobul.
+        Timeout / worker mort / anulare -> {"error", "error_kind"}; worker-ul e înlocuit.
+        """
+        if self._closed:
+            return {"error": "scrape executor is closed", "error_kind": "exception"}
+        timeout = self.timeout if timeout is None else timeout
+        self._slots.acquire()
+        try:
+            self._count("jobs")
+            w = self._checkout()
+            w.jobs += 1
+            deadline = time.monotonic() + timeout
+            try:
+                w.conn.send(("scrape", date_iso))
+            except OSError:
+                return self._fail(w, "crash", "scrape worker is gone")
+            while True:
+                if cancel is not None and cancel.is_set():
+                    return self._fail(w, "cancelled", "cancelled")
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return self._fail(w, "timeout", f"scrape timed out after {timeout:.0f}s")
+                try:
+                    if not w.conn.poll(min(left, POLL)):
+                        if not w.alive():
+                            return self._fail(w, "crash", f"scrape worker exited ({w.process.exitcode})")
+                        continue
+                    msg = w.conn.recv()
+                except (EOFError, OSError):
+                    return self._fail(w, "crash", f"scrape worker exited ({w.process.exitcode})")
+                if msg[0] == "progress":
+                    if progress is not None:
+                        progress(msg[1])
+                elif msg[0] == "done":
+                    _, result, delta = msg
+                    metrics.REGISTRY.apply(delta)
+                    self._checkin(w)
+                    failed = isinstance(result, dict) and "error" in result
+                    self._count("error" if failed else "ok")
+                    return result
+                # "ready" (worker proaspăt) -> ignorat
+        finally:
+            self._slots.release()
+
+    def _fail(self, w: _Worker, kind: str, message: str) -> dict:
+        self._log(f"scrape executor: worker {w.pid} {kind}: {message}")
+        self._discard(w)
+        self._count(kind)
+        return {"error": message, "error_kind": kind}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": self.size, "idle": len(self._idle), "busy": len(self._busy),
+                    "job_timeout": self.timeout, **self.counts}
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            workers = self._idle + list(self._busy)
+            self._idle, self._busy = [], set()
+        for w in workers:
+            w.stop(grace=1.0)
+
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor(log=print) -> ScrapeExecutor:
+    """Executorul procesului (workerii pornesc la primul job)."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ScrapeExecutor(log=log)
+            atexit.register(_EXECUTOR.close)
+        return _EXECUTOR
@@ -0,0 +1,266 @@
+# ======================
+# TwLive3.0 - Log comun (app + scraper) pentru web/data/reload.log
+# - scrierea se face pe un thread de fundal, în loturi, cu fișierul ținut deschis
+# - rotație după mărime și după vechime (reload.log -> reload.log.1 ... .N); vechimea e a fișierului
+#   (ora primei linii), nu a handle-ului nostru; rotația se face sub un lock între procese
+# - mai multe procese (workeri gunicorn, executorul de scrape) scriu în același fișier: înainte de
+#   fiecare lot verificăm că handle-ul nostru e încă reload.log (alt proces poate să-l fi rotit)
+# - ultimele linii stau și în memorie (ring buffer)
+# - citirea tail-ului face seek de la coada fișierului -> cost constant, oricât de mare ar fi
+# ======================
+
+import os, re, sys, time, threading, queue, atexit
+from collections import deque
+from datetime import datetime
+
+try:
+    from .teams_normalize import _file_lock
+except ImportError:
+    from teams_normalize import _file_lock
+
+MAX_BYTES = int(os.environ.get("TWLIVE_LOG_MAX_BYTES", str(1024 * 1024)))   # rotație peste 1 MB
+MAX_AGE = float(os.environ.get("TWLIVE_LOG_MAX_DAYS", "7")) * 86400         # ... sau după 7 zile
+BACKUPS = int(os.environ.get("TWLIVE_LOG_BACKUPS", "3"))                    # reload.log.1 .. .3
+RING_LINES = 2000      # linii păstrate în memorie
+FLUSH_EVERY = 0.5      # secunde între scrierile pe disc
+FIRST_LINE_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]")   # "[2025-08-29 11:40:22] ..."
+
+
+class Logbook:
+    """
+    Un fișier de log cu writer în fundal.
+    write() nu atinge discul: pune linia în coadă și în ring buffer.
+    """
+
+    def __init__(self, path: str, max_bytes: int = MAX_BYTES, max_age: float = MAX_AGE,
+                 backups: int = BACKUPS, ring_lines: int = RING_LINES, flush_every: float = FLUSH_EVERY):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backups = max(0, backups)
+        self.flush_every = flush_every
+        self.rotations = 0
+        self._ring = deque(maxlen=ring_lines)
+        self._queue = queue.SimpleQueue()
+        self._file = None
+        self._born = (None, None)   # ((st_dev, st_ino), ora primei linii) pentru fișierul curent
+        self._io_lock = threading.Lock()      # fișierul: writer vs. rotație/flush
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="logbook", daemon=True)
+        self._thread.start()
+
+    # ---------- scriere ----------
+    def write(self, line: str):
+        if not line.endswith("\n"):
+            line += "\n"
+        self._ring.append(line)
+        if not self._closed:
+            self._queue.put(line)
+
+    def _writer(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_every)
+            except queue.Empty:
+                continue
+            batch, waiters, stop = [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write_batch("".join(batch))
+            for ev in waiters:
+                ev.set()
+            if stop:
+                with self._io_lock:
+                    if self._file:
+                        self._file.close()
+                        self._file = None
+                return
+
+    def _write_batch(self, text: str):
+        with self._io_lock:
+            try:
+                self._reopen_if_moved()
+                self._maybe_rotate()
+            except OSError:
+                pass   # rotația e opțională; textul se scrie oricum mai jos
+            try:
+                if self._file is None:
+                    self._open()
+                self._file.write(text)
+                self._file.flush()
+            except Exception as e:
+                # logul nu are voie să oprească aplicația, dar nici să piardă liniile în tăcere
+                self._file = None
+                try:
+                    sys.stderr.write(f"logbook: write to {self.path} failed ({e}):\n{text}")
+                except Exception:
+                    pass
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _reopen_if_moved(self):
+        """Închide handle-ul dacă fișierul a fost rotit / trunchiat de alt proces (se redeschide path)."""
+        if self._file is None:
+            return
+        try:
+            ours = os.fstat(self._file.fileno())
+            now = os.stat(self.path)
+            moved = (ours.st_dev, ours.st_ino) != (now.st_dev, now.st_ino) or now.st_size < self._file.tell()
+        except OSError:
+            moved = True   # reload.log nu mai există (redenumit în reload.log.1)
+        if moved:
+            self._file.close()
+            self._file = None
+
+    def _file_started(self, st) -> float | None:
+        """Ora primei linii din fișier (memorată per inode); None dacă nu are forma "[Y-m-d H:M:S]"."""
+        key = (st.st_dev, st.st_ino)
+        if self._born[0] != key:
+            started = None
+            try:
+                with open(self.path, encoding="utf-8", errors="replace") as f:
+                    m = FIRST_LINE_RE.match(f.readline(64))
+                if m:
+                    started = datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S").timestamp()
+            except (OSError, ValueError):
+                pass
+            self._born = (key, started)
+        return self._born[1]
+
+    def _needs_rotation(self) -> bool:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if st.st_size >= self.max_bytes:
+            return True
+        if self.max_age <= 0 or st.st_size == 0:
+            return False
+        started = self._file_started(st)
+        return started is not None and time.time() - started > self.max_age
+
+    def _maybe_rotate(self):
+        if not self._needs_rotation():
+            return
+        # alt proces poate roti în același timp: decidem din nou sub lock, ca să nu mutăm
+        # de două ori backup-urile (și fișierul abia rotit de el)
+        with _file_lock(self.path + ".lock"):
+            if not self._needs_rotation():
+                return
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            try:
+                if self.backups:
+                    for i in range(self.backups - 1, 0, -1):
+                        src = f"{self.path}.{i}"
+                        if os.path.exists(src):
+                            os.replace(src, f"{self.path}.{i + 1}")
+                    os.replace(self.path, f"{self.path}.1")
+                else:
+                    open(self.path, "w", encoding="utf-8").close()
+            except FileNotFoundError:
+                return   # rotit între timp de cineva care nu ține lock-ul; scriem în fișierul nou
+            self.rotations += 1
+
+    def flush(self, timeout: float = 5.0):
+        """
+        Așteaptă până când tot ce e în coada procesului curent a ajuns pe disc.
+        Liniile altor procese ajung în fișier după cel mult FLUSH_EVERY s (writer-ul lor).
+        """
+        if self._closed:
+            return
+        ev = threading.Event()
+        self._queue.put(ev)
+        ev.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    # ---------- citire ----------
+    def recent(self, lines: int) -> list:
+        """Ultimele `lines` linii scrise de procesul curent (din memorie)."""
+        if lines <= 0:
+            return []
+        return list(self._ring)[-lines:]
+
+    def read(self, limit: int = 10000, before: int | None = None, after: int | None = None) -> dict:
+        """
+        O fereastră de cel mult `limit` bytes din fișier, tăiată la margini de linie.
+          before=N -> bucata care se termină la offset-ul N (pagina anterioară)
+          after=N  -> bucata care începe la offset-ul N (liniile noi)
+          nimic    -> coada fișierului
+        Returnează {"log", "start", "end", "size", "more", "rotated"}; start/end sunt cursori.
+        """
+        self.flush()
+        limit = max(1, limit)
+        with self._io_lock:
+            try:
+                f = open(self.path, "rb")
+            except OSError:
+                return {"log": "", "start": 0, "end": 0, "size": 0, "more": False, "rotated": False}
+            with f:
+                size = os.fstat(f.fileno()).st_size
+                rotated = after is not None and after > size   # cursor dintr-un fișier rotit între timp
+                if after is not None and not rotated:
+                    start, end = after, min(size, after + limit)
+                else:
+                    end = size if before is None or rotated else max(0, min(before, size))
+                    start = max(0, end - limit)
+                f.seek(start)
+                data = f.read(end - start)
+
+        if after is not None and not rotated:
+            # nu returnăm o linie pe jumătate; restul vine la cererea următoare
+            cut = data.rfind(b"\n") + 1
+            if end < size and cut:
+                data, end = data[:cut], start + cut
+            more = end < size
+        else:
+            if start > 0:
+                cut = data.find(b"\n") + 1
+                if cut:
+                    data, start = data[cut:], start + cut
+            more = start > 0
+        return {"log": data.decode("utf-8", errors="replace"), "start": start, "end": end,
+                "size": size, "more": more, "rotated": rotated}
+
+
+# ---------- instanțe comune ----------
+_BOOKS = {}
+_BOOKS_LOCK = threading.Lock()
+
+
+def get(path: str) -> Logbook:
+    """Un singur Logbook per fișier și proces (app.log și scraper.log îl împart)."""
+    key = os.path.abspath(path)
+    with _BOOKS_LOCK:
+        book = _BOOKS.get(key)
+        if book is None:
+            book = _BOOKS[key] = Logbook(key)
+        return book
+
+
+@atexit.register
+def _close_all():
+    with _BOOKS_LOCK:
+        books = list(_BOOKS.values())
+    for book in books:
+        book.close()
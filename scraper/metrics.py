@@ -0,0 +1,211 @@
+# ======================
+# TwLive3.0 - Metrici în format Prometheus (fără dependențe)
+# - Counter / Gauge / Histogram cu etichete, într-un registru comun al procesului
+# - scraper-ul înregistrează etapele (fetch, parse, merge, write), reîncercările,
+#   bytes primiți și numărul de jocuri; app.py le expune pe /metrics
+# - un scrape rulat în alt proces (scraper/executor.py) trimite înapoi diferența
+#   (state() înainte/după -> diff()), aplicată în procesul web cu apply()
+# ======================
+
+import threading
+
+# limitele bucket-urilor (secunde) pentru duratele etapelor: de la parse-uri de ms la fetch-uri lente
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 90)
+BYTES_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6)
+INF_LABEL = 'le="+Inf"'
+
+
+def _labels_key(names: tuple, labels: dict) -> tuple:
+    return tuple(str(labels.get(n, "")) for n in names)
+
+
+def _fmt_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _header(self) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = _labels_key(self.label_names, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [f"{self.name}{_fmt_labels(self.label_names, k)} {_num(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = _labels_key(self.label_names, labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels=(), buckets=STAGE_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = _labels_key(self.label_names, labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]   # counts, sum, count
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((k, (list(c), s, n)) for k, (c, s, n) in self._values.items())
+        lines = self._header()
+        for key, (counts, total, n) in items:
+            for bound, c in zip(self.buckets, counts):
+                le = 'le="%s"' % _num(bound)
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.label_names, key, le)} {c}")
+            lines.append(f"{self.name}_bucket{_fmt_labels(self.label_names, key, INF_LABEL)} {n}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.label_names, key)} {_num(round(total, 6))}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.label_names, key)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def state(self) -> dict:
+        """Copie a valorilor: {nume: {cheie etichete: valoare}} (histograme: [counts, sum, count])."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        out = {}
+        for m in metrics:
+            with m._lock:
+                out[m.name] = {k: ([list(v[0]), v[1], v[2]] if isinstance(m, Histogram) else v)
+                               for k, v in m._values.items()}
+        return out
+
+    def diff(self, before: dict, after: dict) -> dict:
+        """Ce s-a schimbat între două state(): delte pentru counters/histograme, valori noi pentru gauges."""
+        out = {}
+        with self._lock:
+            kinds = {name: m.kind for name, m in self._metrics.items()}
+        for name, values in after.items():
+            old = before.get(name, {})
+            changed = {}
+            for key, v in values.items():
+                prev = old.get(key)
+                if kinds.get(name) == "gauge":
+                    if prev != v:
+                        changed[key] = v
+                elif kinds.get(name) == "histogram":
+                    prev = prev or [[0] * len(v[0]), 0.0, 0]
+                    if v[2] != prev[2]:
+                        changed[key] = [[a - b for a, b in zip(v[0], prev[0])], v[1] - prev[1], v[2] - prev[2]]
+                elif v != (prev or 0):
+                    changed[key] = v - (prev or 0)
+            if changed:
+                out[name] = changed
+        return out
+
+    def apply(self, delta: dict):
+        """Aplică un diff() venit din alt proces peste metricile cu același nume de aici."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        for name, values in delta.items():
+            m = metrics.get(name)
+            if m is None:
+                continue
+            with m._lock:
+                for key, v in values.items():
+                    key = tuple(key)
+                    if isinstance(m, Histogram):
+                        entry = m._values.setdefault(key, [[0] * len(m.buckets), 0.0, 0])
+                        entry[0] = [a + b for a, b in zip(entry[0], v[0])]
+                        entry[1] += v[1]
+                        entry[2] += v[2]
+                    elif isinstance(m, Gauge):
+                        m._values[key] = v
+                    else:
+                        m._values[key] = m._values.get(key, 0) + v
+
+    def _add(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labels=()) -> Counter:
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()) -> Gauge:
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=STAGE_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ---------- metricile scraper-ului ----------
+STAGE_SECONDS = REGISTRY.histogram(
+    "twlive_scrape_stage_seconds", "Duration of one scrape stage (fetch, parse, selenium, merge, write).",
+    ("stage", "source"))
+SCRAPES = REGISTRY.counter("twlive_scrapes_total", "Finished scrapes by outcome.", ("status",))
+SOURCE_RESULTS = REGISTRY.counter(
+    "twlive_source_results_total", "Source pipeline outcomes (ok, reused, error, timeout, open, stale).", ("source", "status"))
+RETRIES = REGISTRY.counter("twlive_fetch_retries_total", "HTTP attempts after the first one.", ("source",))
+RESPONSE_BYTES = REGISTRY.histogram(
+    "twlive_response_bytes", "Size of fetched page bodies.", ("source",), BYTES_BUCKETS)
+SELENIUM_FALLBACKS = REGISTRY.counter(
+    "twlive_selenium_fallbacks_total", "Pages that needed the headless browser.", ("source",))
+GAMES = REGISTRY.gauge("twlive_games", "Games in the last scrape, per source and merged.", ("source",))
+BREAKER_STATE = REGISTRY.gauge(
+    "twlive_source_circuit_state", "Circuit breaker per source (0 closed, 1 half-open, 2 open).", ("source",))
+
+
+def render() -> str:
+    return REGISTRY.render()
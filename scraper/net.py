@@ -0,0 +1,205 @@
+# ======================
+# TwLive3.0 - Strat HTTP comun pentru scraper
+# - o singură requests.Session (keep-alive, pool de conexiuni, compresie)
+# - validatori per URL (ETag / Last-Modified) -> GET-uri condiționale
+# - hash de conținut: 304 sau pagină identică => refolosim jocurile deja parsate
+# - token bucket per host în loc de pauze aleatoare (3–8 s) între cereri
+# - TWLIVE_UPSTREAM: cererile merg la un server local (scraper/replay.py) în locul site-urilor reale
+# ======================
+
+import os, hashlib, threading, time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodează 'br' doar dacă e instalat)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+POOL_MAXSIZE = 8          # conexiuni keep-alive per host
+PARSED_MAX_ENTRIES = 64   # (sursă, dată) păstrate în cache-ul de jocuri parsate
+
+# host -> (cereri pe secundă, burst); hosturile necunoscute nu sunt limitate
+HOST_RATES = {
+    "liveonsat.com": (float(os.environ.get("TWLIVE_RATE_LIVEONSAT", "0.2")), 1),
+    "sporteventz.com": (float(os.environ.get("TWLIVE_RATE_SPORTEVENTZ", "1")), 2),
+}
+
+# ex. http://127.0.0.1:8765 -> https://liveonsat.com/2day.php?… devine http://127.0.0.1:8765/liveonsat.com/2day.php?…
+UPSTREAM = os.environ.get("TWLIVE_UPSTREAM", "").rstrip("/")
+
+
+class RateLimited(requests.exceptions.RequestException):
+    """Nu am primit un token pentru host în timpul rămas."""
+
+
+class TokenBucket:
+    """Token bucket clasic: `rate` tokeni/s, cel mult `burst` adunați."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float | None = None) -> bool:
+        """Ia un token, așteptând cel mult `max_wait` secunde; False dacă nu încape."""
+        limit = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if limit is not None and now + wait > limit:
+                return False
+            time.sleep(wait)
+
+
+def host_key(url: str) -> str:
+    """Hostul fără 'www.' (aceeași limită pentru www.sporteventz.com și sporteventz.com)."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def upstream_url(url: str, upstream: str | None = None) -> str:
+    """URL-ul cerut efectiv: neschimbat fără upstream, altfel <upstream>/<host>/<path>?<query>."""
+    upstream = UPSTREAM if upstream is None else upstream
+    if not upstream:
+        return url
+    parts = urlsplit(url)
+    base = urlsplit(upstream)
+    path = f"{base.path}/{(parts.hostname or '').lower()}{parts.path or '/'}"
+    return urlunsplit((base.scheme, base.netloc, path, parts.query, ""))
+
+
+def content_hash(data) -> str:
+    """sha1 peste bytes (sau text utf-8)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8", errors="ignore")
+    return hashlib.sha1(data).hexdigest()
+
+
+class FetchedPage:
+    """
+    Rezultatul unui fetch:
+      body          -> textul paginii (None la 304)
+      content_hash  -> hash-ul conținutului (la 304: hash-ul ultimei versiuni)
+      not_modified  -> serverul a răspuns 304
+    """
+    __slots__ = ("url", "status", "body", "content_hash", "not_modified")
+
+    def __init__(self, url, status, body, content_hash=None, not_modified=False):
+        self.url = url
+        self.status = status
+        self.body = body
+        self.content_hash = content_hash
+        self.not_modified = not_modified
+
+
+class HttpLayer:
+    """Sesiune comună + validatori per URL; sigură pentru thread-urile surselor."""
+
+    def __init__(self, pool_maxsize: int = POOL_MAXSIZE):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+        self._validators = {}   # url -> {"etag", "last_modified", "hash"}
+        self._buckets = {host: TokenBucket(rate, burst) for host, (rate, burst) in HOST_RATES.items()}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket | None:
+        return self._buckets.get(host_key(url))
+
+    def get(self, url: str, headers: dict | None = None, timeout: float = 30,
+            conditional: bool = True, max_wait: float | None = None, deadline: float | None = None) -> tuple:
+        """
+        GET cu validatorii salvați (dacă `conditional`), după ce luăm un token
+        pentru host (așteptăm cel mult `max_wait` secunde, altfel RateLimited).
+        `deadline` (time.monotonic): timeout-ul socket-ului e min(timeout, timpul rămas),
+        calculat după așteptarea token-ului; nu mai rămâne nimic -> requests Timeout, fără cerere.
+        Returnează (FetchedPage, requests.Response); ridică HTTPError pentru 4xx/5xx.
+        Cu UPSTREAM setat cererea pleacă spre serverul local; `url`, validatorii și
+        token bucket-ul rămân ale URL-ului original.
+        """
+        bucket = self.bucket(url)
+        if bucket is not None and not bucket.acquire(max_wait):
+            raise RateLimited(f"no request slot for {host_key(url)} within {max_wait:.0f}s")
+        if deadline is not None:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise requests.exceptions.Timeout(f"deadline reached before the request to {host_key(url)}")
+            timeout = min(timeout, left)
+        hdrs = dict(headers or {})
+        hdrs["Accept-Encoding"] = ACCEPT_ENCODING
+        with self._lock:
+            known = dict(self._validators.get(url) or {})
+        if conditional and known.get("hash"):
+            if known.get("etag"):
+                hdrs["If-None-Match"] = known["etag"]
+            if known.get("last_modified"):
+                hdrs["If-Modified-Since"] = known["last_modified"]
+
+        r = self.session.get(upstream_url(url), headers=hdrs, timeout=timeout)
+        if r.status_code == 304 and known.get("hash"):
+            return FetchedPage(url, 304, None, known["hash"], not_modified=True), r
+        r.raise_for_status()
+        return FetchedPage(url, r.status_code, r.text, content_hash(r.content)), r
+
+    def remember(self, page: FetchedPage, response):
+        """Salvează validatorii unui răspuns acceptat (apelat după validarea conținutului)."""
+        with self._lock:
+            self._validators[page.url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "hash": page.content_hash,
+            }
+
+    def forget(self, url: str):
+        with self._lock:
+            self._validators.pop(url, None)
+
+
+class ParsedCache:
+    """
+    Ultimele jocuri parsate per (sursă, dată), împreună cu hash-ul paginii.
+    Dacă pagina nouă are același hash (sau e 304), parserul nu mai rulează.
+    """
+
+    def __init__(self, max_entries: int = PARSED_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # (source, date_iso) -> (hash, games)
+        self._lock = threading.Lock()
+
+    def get(self, source: str, date_iso: str, page_hash: str | None):
+        if not page_hash:
+            return None
+        with self._lock:
+            entry = self._entries.get((source, date_iso))
+            if entry is None or entry[0] != page_hash:
+                return None
+            self._entries.move_to_end((source, date_iso))
+            return entry[1]
+
+    def has(self, source: str, date_iso: str) -> bool:
+        with self._lock:
+            return (source, date_iso) in self._entries
+
+    def put(self, source: str, date_iso: str, page_hash: str | None, games: list):
+        if not page_hash:
+            return
+        with self._lock:
+            self._entries[(source, date_iso)] = (page_hash, games)
+            self._entries.move_to_end((source, date_iso))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,149 @@
+# ======================
+# TwLive3.0 - Export static pentru GitHub Pages (fără server: fără /api/*)
+# - scrape pentru o fereastră de zile (ieri .. +6 implicit), apoi site-ul static în --out:
+#   index.html + app.js/styles.css/logo.jpg, data/games/<dată>.json (+ .gz/.br), data/manifest.json
+# - shard-urile sunt imutabile: UI-ul le cere ca data/games/<dată>.json?v=<hash> (hash-ul din manifest),
+#   deci orice CDN le poate ține oricât; doar manifest.json (mic) e recitit
+# - o zi al cărei scrape a eșuat își păstrează shard-ul existent din --out (ultimul bun)
+# - zilele ieșite din fereastră sunt șterse; fișierele de debug (__*.html, reload.log) nu sunt publicate
+#
+#   python -m scraper.publish --out site [--back 1] [--ahead 6]   # scrape + export
+#   python -m scraper.publish --out site --no-scrape              # doar export din web/data/games
+# ======================
+
+import argparse, glob, hashlib, json, os, re, shutil, sys
+from datetime import date, datetime, timedelta
+
+try:
+    from . import days, snapshot
+except ImportError:
+    import days, snapshot
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB_DIR = os.path.join(ROOT, "web")
+DAYS_DIR = os.path.join(WEB_DIR, "data", "games")   # unde scrie scraper.write_day_file
+ASSETS = ("app.js", "styles.css", "logo.jpg")
+BACK_DAYS = int(os.environ.get("TWLIVE_STATIC_BACK", "1"))
+AHEAD_DAYS = int(os.environ.get("TWLIVE_STATIC_AHEAD", "6"))
+MANIFEST = "manifest.json"
+
+_ASSET_REF_RE = re.compile(r'(src|href)="(' + "|".join(re.escape(a) for a in ASSETS) + r')(\?v=[^"]*)?"')
+_SHARD_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.json(\.gz|\.br|\.etag)?$")
+
+
+def window(today: date, back: int = BACK_DAYS, ahead: int = AHEAD_DAYS) -> list:
+    """Datele ISO publicate: today-back .. today+ahead (cel mult days.MAX_RANGE_DAYS)."""
+    back, ahead = max(0, back), max(0, ahead)
+    if back + ahead + 1 > days.MAX_RANGE_DAYS:
+        raise ValueError(f"Window too long ({back + ahead + 1} days, max {days.MAX_RANGE_DAYS}).")
+    return [(today + timedelta(days=i)).isoformat() for i in range(-back, ahead + 1)]
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:10]
+
+
+def copy_assets(out_dir: str):
+    """
+    Fișierele UI-ului; în index.html URL-urile lor primesc ?v=<hash>, ca la serverul Flask,
+    plus <meta name="twlive-static"> după care app.js știe că e site static (citește manifestul).
+    """
+    for name in ASSETS:
+        shutil.copyfile(os.path.join(WEB_DIR, name), os.path.join(out_dir, name))
+    with open(os.path.join(WEB_DIR, "index.html"), encoding="utf-8") as f:
+        html = _ASSET_REF_RE.sub(
+            lambda m: f'{m.group(1)}="{m.group(2)}?v={_file_hash(os.path.join(WEB_DIR, m.group(2)))}"', f.read())
+    html = html.replace("<head>", f'<head>\n  <meta name="twlive-static" content="data/{MANIFEST}">', 1)
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+
+
+def _public(out: dict) -> dict:
+    """Ziua fără _meta (timpi, capturi, breaker-e): UI-ul static nu le folosește."""
+    return {k: v for k, v in out.items() if k != "_meta"}
+
+
+def export_shards(dates: list, out_dir: str, src_dir: str = DAYS_DIR) -> dict:
+    """
+    Scrie shard-urile zilelor din `dates` în out_dir/data/games și șterge restul.
+    Returnează {dată: intrare de manifest}; o zi fără fișier nou își păstrează shard-ul vechi.
+    """
+    games_dir = os.path.join(out_dir, "data", "games")
+    os.makedirs(games_dir, exist_ok=True)
+    wanted = set(dates)
+    for path in glob.glob(os.path.join(games_dir, "*")):
+        m = _SHARD_RE.match(os.path.basename(path))
+        if not m or m.group(1) not in wanted:
+            os.remove(path)
+
+    entries = {}
+    for d in dates:
+        dst = os.path.join(games_dir, f"{d}.json")
+        src = os.path.join(src_dir, f"{d}.json")
+        if os.path.exists(src):
+            out = _public(json.loads(snapshot.load(src).body))
+            if not os.path.exists(dst) or snapshot.load(dst).etag != snapshot.Snapshot.of(out).etag:
+                snapshot.write(dst, out)   # conținut nou -> alt hash în manifest
+        if not os.path.exists(dst):
+            continue
+        snap = snapshot.load(dst)
+        out = json.loads(snap.body)
+        entries[d] = {
+            "v": snap.etag.strip('"'),
+            "games": len(out.get("games", [])),
+            "generated_at": out.get("generated_at"),
+            "bytes": len(snap.body),
+            "gzip": len(snap.variants["gzip"]),
+        }
+    return entries
+
+
+def export(out_dir: str, dates: list, src_dir: str = DAYS_DIR) -> dict:
+    """Site-ul static complet în out_dir; returnează manifestul scris."""
+    os.makedirs(out_dir, exist_ok=True)
+    copy_assets(out_dir)
+    manifest = {
+        "static": True,
+        "generated_at": f"{datetime.now(days.VIENNA):%Y-%m-%d %H:%M:%S}",
+        "timezone": "Europe/Vienna (GMT+2)",
+        "from": dates[0],
+        "to": dates[-1],
+        "dates": export_shards(dates, out_dir, src_dir),
+    }
+    snapshot.write(os.path.join(out_dir, "data", MANIFEST), manifest)
+    return manifest
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Scrape a window of days and write the static (GitHub Pages) site.")
+    ap.add_argument("--out", default=os.path.join(ROOT, "site"), help="site directory (kept between runs)")
+    ap.add_argument("--today", help="YYYY-MM-DD (default: today in Vienna)")
+    ap.add_argument("--back", type=int, default=BACK_DAYS, help="days before today")
+    ap.add_argument("--ahead", type=int, default=AHEAD_DAYS, help="days after today")
+    ap.add_argument("--no-scrape", action="store_true", help="only export the existing web/data/games files")
+    args = ap.parse_args(argv)
+
+    today = date.fromisoformat(args.today) if args.today else datetime.now(days.VIENNA).date()
+    dates = window(today, args.back, args.ahead)
+    failed = []
+    if not args.no_scrape:
+        try:
+            from . import scraper
+        except ImportError:
+            import scraper
+        result = scraper.main_range(dates[0], dates[-1])
+        failed = [d for d, s in result["days"].items() if s["status"] == "error"]
+
+    manifest = export(args.out, dates)
+    for d in dates:
+        e = manifest["dates"].get(d)
+        note = "scrape failed, kept previous shard" if d in failed and e else "scrape failed" if d in failed else ""
+        print(f"{d}  " + (f"{e['games']:>4} games  v={e['v']}" if e else "   - no shard") + (f"  ({note})" if note else ""))
+    print(f"wrote {len(manifest['dates'])}/{len(dates)} shards to {args.out}")
+    # eșec doar dacă n-a ieșit nicio zi: site-ul de azi ar fi gol
+    return 0 if manifest["dates"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+# ======================
+# TwLive3.0 - Record / replay pentru sursele scraper-ului
+# - Recorder: salvează răspunsurile acceptate (după validare) pe URL și dată
+# - server local care le servește în locul liveonsat.com / sporteventz.com, cu:
+#     latență (+ jitter), erori 5xx și pagini de blocare mici (ca cele detectate
+#     de fetch_liveonsat_page: < 5000 bytes, fără "blockfix"), plus ETag / 304
+# - scraper-ul folosește serverul prin TWLIVE_UPSTREAM (vezi net.py), fără alte schimbări
+#
+#   python -m scraper.replay seed  --dir data/replay                      # din capturile web/data/__*.html
+#   python -m scraper.replay serve --dir data/replay --latency 0.3 --jitter 0.2 --error-rate 0.05 --block-rate 0.1
+#   TWLIVE_UPSTREAM=http://127.0.0.1:8765 TWLIVE_RATE_LIVEONSAT=100 python app.py
+#
+#   Pentru a înregistra trafic real: TWLIVE_RECORD_DIR=data/replay python scraper/scraper.py 2025-08-29
+# ======================
+
+import argparse, hashlib, json, os, random, sys, tempfile, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+try:
+    from .teams_normalize import _file_lock
+except ImportError:
+    from teams_normalize import _file_lock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DIR = os.path.join(ROOT, "data", "replay")
+DEFAULT_PORT = 8765
+RECORD_DIR = os.environ.get("TWLIVE_RECORD_DIR", "")   # gol = nu înregistrăm
+
+BLOCK_PAGE = (b"<html><head><title>Access denied</title></head><body>"
+              b"<h1>Access denied</h1><p>Too many requests from your network.</p></body></html>")
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+class Recorder:
+    """
+    Director de înregistrări:
+      index.json          -> {url: {"host", "path", "date", "file", "content_type", "recorded_at"}}
+      bodies/<sha1>.html  -> corpul răspunsului
+    Mai mulți recorderi (workeri, thread-uri din main_range) pot scrie în același director:
+    save() recitește index.json sub un lock de fișier și adaugă doar intrarea lui.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR):
+        self.dir = directory
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _index_path(self) -> str:
+        return os.path.join(self.dir, "index.json")
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        """tmp unic per scriitor (proces și thread) în același director, apoi os.replace."""
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def save(self, url: str, date_iso: str | None, body, content_type: str = "text/html; charset=utf-8"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        parts = urlsplit(url)
+        name = f"{url_key(url)}.html"
+        os.makedirs(os.path.join(self.dir, "bodies"), exist_ok=True)
+        entry = {"host": (parts.hostname or "").lower(), "path": parts.path, "date": date_iso,
+                 "file": name, "content_type": content_type, "recorded_at": time.time()}
+        with self._lock, _file_lock(self._index_path() + ".lock"):
+            self._write_atomic(os.path.join(self.dir, "bodies", name), body)
+            index = self._load_index()   # intrările scrise între timp de alți recorderi
+            index[url] = entry
+            self._write_atomic(self._index_path(), json.dumps(index, indent=1).encode("utf-8"))
+            self._index = index
+
+    def lookup(self, url: str) -> dict | None:
+        """Înregistrarea exactă a URL-ului sau, altfel, cea mai nouă pentru același host + path."""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                parts = urlsplit(url)
+                host = (parts.hostname or "").lower()
+                same = [e for e in self._index.values() if e["host"] == host and e["path"] == parts.path]
+                entry = max(same, key=lambda e: e["recorded_at"], default=None)
+        return entry
+
+    def body(self, entry: dict) -> bytes:
+        with open(os.path.join(self.dir, "bodies", entry["file"]), "rb") as f:
+            return f.read()
+
+    def entries(self) -> dict:
+        with self._lock:
+            return dict(self._index)
+
+
+_RECORDERS = {}
+_RECORDERS_LOCK = threading.Lock()
+
+
+def get(directory: str) -> Recorder:
+    """Un Recorder per director în proces (index-ul e ținut în memorie)."""
+    key = os.path.abspath(directory)
+    with _RECORDERS_LOCK:
+        if key not in _RECORDERS:
+            _RECORDERS[key] = Recorder(key)
+        return _RECORDERS[key]
+
+
+def record(url: str, date_iso: str | None, body):
+    """Înregistrează un răspuns acceptat dacă TWLIVE_RECORD_DIR e setat; altfel nu face nimic."""
+    if RECORD_DIR and body:
+        get(RECORD_DIR).save(url, date_iso, body)
+
+
+# ---------- serverul local ----------
+class StandInConfig:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, block_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.block_rate = block_rate
+        self.random = random.Random(seed)
+        self.counts = {"served": 0, "not_modified": 0, "errors": 0, "blocked": 0, "missing": 0}
+        self.lock = threading.Lock()
+
+    def count(self, key: str):
+        with self.lock:
+            self.counts[key] += 1
+
+
+def make_handler(recorder: Recorder, cfg: StandInConfig):
+    class StandInHandler(BaseHTTPRequestHandler):
+        """GET /<host>/<path>?<query> -> răspunsul înregistrat pentru https://<host>/<path>?<query>."""
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):   # fără un rând pe stderr la fiecare cerere
+            pass
+
+        def _send(self, status: int, body: bytes = b"", headers: dict | None = None):
+            self.send_response(status)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass   # clientul a renunțat (timeout / worker oprit)
+
+        def do_GET(self):
+            if self.path == "/__stats":
+                with cfg.lock:
+                    body = json.dumps(cfg.counts).encode()
+                return self._send(200, body, {"Content-Type": "application/json"})
+
+            with cfg.lock:
+                delay = max(0.0, cfg.latency + cfg.random.uniform(-cfg.jitter, cfg.jitter))
+                roll = cfg.random.random()
+            time.sleep(delay)
+            if roll < cfg.error_rate:
+                cfg.count("errors")
+                return self._send(503, b"Service Unavailable", {"Content-Type": "text/plain"})
+            if roll < cfg.error_rate + cfg.block_rate:
+                cfg.count("blocked")
+                return self._send(200, BLOCK_PAGE, {"Content-Type": "text/html; charset=utf-8"})
+
+            host, _, rest = self.path.lstrip("/").partition("/")
+            entry = recorder.lookup(f"https://{host}/{rest}")
+            if entry is None:
+                cfg.count("missing")
+                return self._send(404, b"not recorded", {"Content-Type": "text/plain"})
+            body = recorder.body(entry)
+            etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                cfg.count("not_modified")
+                return self._send(304, b"", {"ETag": etag})
+            cfg.count("served")
+            self._send(200, body, {"Content-Type": entry.get("content_type") or "text/html", "ETag": etag})
+
+    return StandInHandler
+
+
+def serve(directory: str, host: str = "127.0.0.1", port: int = DEFAULT_PORT, **cfg) -> ThreadingHTTPServer:
+    """Pornește serverul (în thread propriu) și îl returnează; server.shutdown() îl oprește."""
+    server = ThreadingHTTPServer((host, port), make_handler(Recorder(directory), StandInConfig(**cfg)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stand-in", daemon=True).start()
+    return server
+
+
+# ---------- CLI ----------
+def _seed(directory: str, date_iso: str):
+    """Înregistrări din capturile din web/data/ pentru ziua lor (2025-08-29)."""
+    from datetime import date as _date
+    try:
+        from . import scraper
+    except ImportError:
+        import scraper
+    d = _date.fromisoformat(date_iso)
+    rec = Recorder(directory)
+    web_data = os.path.join(ROOT, "web", "data")
+    with open(os.path.join(web_data, "__liveonsat.html"), "rb") as f:
+        rec.save(scraper.liveonsat_url_for_day(d), date_iso, f.read())
+    # pagina randată (după Selenium): în replay nu mai e nevoie de browser
+    with open(os.path.join(web_data, "__sporteventz_selenium.html"), "rb") as f:
+        rec.save(scraper.sporteventz_url_for_date(d), date_iso, f.read())
+    print(f"seeded {len(rec.entries())} recordings in {directory}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Record/replay stand-in for the scraper's sources.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("seed", help="create recordings from the captures in web/data/")
+    s.add_argument("--dir", default=DEFAULT_DIR)
+    s.add_argument("--date", default="2025-08-29")
+    v = sub.add_parser("serve", help="serve recordings in place of the real sites")
+    v.add_argument("--dir", default=DEFAULT_DIR)
+    v.add_argument("--host", default="127.0.0.1")
+    v.add_argument("--port", type=int, default=DEFAULT_PORT)
+    v.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    v.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of random extra latency")
+    v.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    v.add_argument("--block-rate", type=float, default=0.0, help="share of requests answered with a block page")
+    v.add_argument("--seed", type=int, default=None)
+    ls = sub.add_parser("list", help="show what is recorded")
+    ls.add_argument("--dir", default=DEFAULT_DIR)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "seed":
+        _seed(args.dir, args.date)
+    elif args.cmd == "list":
+        for url, e in sorted(Recorder(args.dir).entries().items(), key=lambda kv: (kv[1]["date"] or "", kv[0])):
+            print(f"{e['date'] or '-':<10}  {e['host']:<20} {url}")
+    else:
+        server = serve(args.dir, args.host, args.port, latency=args.latency, jitter=args.jitter,
+                       error_rate=args.error_rate, block_rate=args.block_rate, seed=args.seed)
+        print(f"stand-in on http://{args.host}:{args.port}  (TWLIVE_UPSTREAM=http://{args.host}:{args.port})")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
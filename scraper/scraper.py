@@ -6,20 +6,23 @@
 # - Merge smart: dedupă pe timp +/- 2 min & fuzzy 65
 # ======================
 
-import os, re, json, sys, traceback, time
+import os, re, json, sys, traceback, time, unicodedata, tracemalloc, threading, atexit, hashlib, sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
 import pytz
 import random
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
 from rapidfuzz import fuzz
 from urllib.parse import quote
 
-# Selenium (fallback pentru SportEventz când randarea e în JS)
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+# Selenium (fallback pentru SportEventz când randarea e în JS) – pool de browsere refolosite
+try:
+    from . import (browser_pool, captures, changes, days, logbook, metrics, net, replay, search, snapshot,
+                   sources, store, teams_normalize)
+except ImportError:  # rulat ca script: python scraper/scraper.py
+    import browser_pool, captures, changes, days, logbook, metrics, net, replay, search, snapshot, sources, store, teams_normalize
 
 # --- Fuzzy matching: rapidfuzz (dacă e instalat) sau fallback cu difflib ---
 try:
@@ -27,6 +30,14 @@ try:
 except Exception:
     _rf_fuzz = None
 
+# --- Scoring în lot (rapidfuzz.process + numpy); fără ele -> scor pereche cu pereche ---
+try:
+    import numpy as np
+    from rapidfuzz import process as _rf_process
+except Exception:
+    np = None
+    _rf_process = None
+
 import difflib
 
 def _token_set_ratio(a: str, b: str) -> int:
@@ -52,10 +63,23 @@ def _token_set_ratio(a: str, b: str) -> int:
 VIENNA = pytz.timezone("Europe/Vienna")   # fusul nostru
 ROOT = os.path.dirname(os.path.dirname(__file__))
 WEB_DATA = os.path.join(ROOT, "web", "data")
+DAYS_DIR = os.path.join(WEB_DATA, "games")   # un fișier JSON per dată: games/YYYY-MM-DD.json
 os.makedirs(WEB_DATA, exist_ok=True)
 UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126 Safari/537.36"
-HIGHLIGHT = ["DAZN", "SKY SPORT", "CANAL PLUS ACTION", "CANAL + ACTION", "SPORTDIGITAL"]
-STOPWORDS = set("fc cf afc sc ac fk sv cd aek csm club calcio de la el los the".split())
+HIGHLIGHT = search.HIGHLIGHT
+STOPWORDS = teams_normalize.STOPWORDS
+
+# Interval de zile: câte date rulăm simultan și lungimea maximă acceptată
+RANGE_CONCURRENCY = days.RANGE_CONCURRENCY
+MAX_RANGE_DAYS = days.MAX_RANGE_DAYS
+
+# Termen limită (secunde) per sursă pentru fetch + parse; sursele rulează în paralel
+SOURCE_DEADLINES = {
+    "LiveOnSat": float(os.environ.get("TWLIVE_DEADLINE_LIVEONSAT", "75")),
+    "SportEventz": float(os.environ.get("TWLIVE_DEADLINE_SPORTEVENTZ", "60")),
+}
+# încercarea din half_open (sursa tocmai a picat): termen scurt, fără șirul complet de reîncercări
+BREAKER_PROBE_DEADLINE = float(os.environ.get("TWLIVE_BREAKER_PROBE", "20"))
 
 # List of free proxies to try (these will be rotated)
 FREE_PROXIES = [
@@ -68,17 +92,20 @@ FREE_PROXIES = [
     "https://34.142.51.21:80"
 ]
 
+# Sesiune HTTP comună (keep-alive, GET condiționale) + jocuri parsate per hash de pagină
+HTTP = net.HttpLayer()
+PARSED = net.ParsedCache()
+
 # ---------- HELPERI LOG / TIMP ----------
 def now_vienna():
     """Ora curentă în Europe/Vienna (doar pentru log/metadata)."""
     return datetime.now(VIENNA)
 
 def log(msg: str):
-    """Scrie în consolă + în web/data/reload.log."""
+    """Scrie în consolă + în web/data/reload.log (prin writer-ul comun din logbook)."""
     line = f"[{now_vienna():%Y-%m-%d %H:%M:%S}] {msg}"
     print(line)
-    with open(os.path.join(WEB_DATA, "reload.log"), "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    logbook.get(os.path.join(WEB_DATA, "reload.log")).write(line)
 
 def parse_time_local(date_iso: str, time_str: str) -> str:
     """
@@ -97,12 +124,8 @@ def dt_parse_local_str(s: str) -> datetime:
     return datetime.strptime(s, "%Y-%m-%d %H:%M")
 
 def clean_name(name: str) -> str:
-    """Normalizează pentru fuzzy-match: scoate semne, stopwords, vs/v/- etc."""
-    s = re.sub(r"[^\w\s\-']", " ", name, flags=re.I).lower()
-    s = re.sub(r"\b(vs?|versus)\b", " ", s)
-    s = re.sub(r"[-:]", " ", s)
-    toks = [t for t in re.split(r"\s+", s) if t and t not in STOPWORDS]
-    return " ".join(toks)
+    """Normalizează pentru fuzzy-match: scoate semne, stopwords, vs/v/- etc. (memoizat, vezi teams_normalize)."""
+    return teams_normalize.clean(name)
 
 def highlight_first(chs):
     """Canalele importante (DAZN/Sky/…) primele, apoi alfabetic; unicitate păstrată."""
@@ -137,57 +160,118 @@ def sporteventz_url_for_date(d: date) -> str:
     qp = "&".join(f"{k}={quote(v, safe='')}" for k, v in params.items())
     return f"{SE_BASE}?{qp}"
 
+_BROWSER_POOL = None
+_BROWSER_POOL_LOCK = threading.Lock()
+
+def get_browser_pool():
+    """Pool-ul de browsere al procesului (creat la primul fallback Selenium)."""
+    global _BROWSER_POOL
+    with _BROWSER_POOL_LOCK:
+        if _BROWSER_POOL is None:
+            _BROWSER_POOL = browser_pool.BrowserPool(log=log)
+            atexit.register(_BROWSER_POOL.close)
+        return _BROWSER_POOL
+
 def fetch_sporteventz_via_selenium(query_date_iso: str) -> BeautifulSoup:
+    """Fallback Selenium, ca soup (vezi render_sporteventz_selenium)."""
+    return BeautifulSoup(render_sporteventz_selenium(query_date_iso), "lxml")
+
+def render_sporteventz_selenium(query_date_iso: str) -> str:
     """
-    Fallback: deschide pagina publică (soccer), lasă JS-ul să randeze,
-    apoi returnează HTML-ul final.
+    Fallback: deschide pagina publică (soccer) într-un browser din pool,
+    așteaptă explicit rândurile .MagicTableRow, apoi returnează HTML-ul final.
     """
     url = "https://www.sporteventz.com/de/soccer"
     log(f"sporteventz: Selenium fallback -> {url} (date={query_date_iso})")
-    opts = Options()
-    # opțiunea 'new' elimină warning-uri pe Chrome 115+
-    opts.add_argument("--headless=new")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--window-size=1366,900")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=opts)
-    try:
-        driver.get(url)
-        time.sleep(3.0)  # așteptăm rândurile
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1.5)
-        html = driver.page_source
-        with open(os.path.join(WEB_DATA, "__sporteventz_selenium.html"),
-                  "w", encoding="utf-8", errors="ignore") as f:
-            f.write(html)
-        return BeautifulSoup(html, "lxml")
-    finally:
-        driver.quit()
+    pool = get_browser_pool()
+    html = pool.render(url, ".MagicTableRow")
+    st = pool.stats()
+    log(f"sporteventz: browser checkout={st['checkout']['last_ms']}ms render={st['render']['last_ms']}ms")
+    return html
+
+def _remaining(deadline, cap: float) -> float:
+    """Timeout pentru următorul pas: min(cap, timp rămas până la deadline)."""
+    if deadline is None:
+        return cap
+    return max(0.0, min(cap, deadline - time.monotonic()))
+
+def _http_get(source: str, date_iso: str, url: str, headers: dict, cap: float, deadline=None):
+    """
+    GET prin sesiunea comună, limitat de token bucket-ul hostului (cel mult până la deadline).
+    Trimitem validatorii doar dacă avem jocurile parsate pentru (sursă, dată);
+    un 304 fără ele -> cerem din nou, necondiționat.
+    """
+    max_wait = None if deadline is None else _remaining(deadline, float("inf"))
+
+    def get(conditional):
+        # timeout-ul socket-ului se calculează în HTTP.get, după așteptarea în token bucket
+        return HTTP.get(url, headers=headers, conditional=conditional, max_wait=max_wait,
+                        timeout=cap, deadline=deadline)
 
-def fetch_sporteventz_html(d: date) -> BeautifulSoup:
+    page, r = get(PARSED.has(source, date_iso))
+    if page.not_modified and PARSED.get(source, date_iso, page.content_hash) is None:
+        page, r = get(False)
+    return page, r
+
+# element real cu clasa MagicTableRow (nu doar numele clasei într-un șablon JS)
+SE_ROW_ELEMENT_RE = re.compile(r"""<[a-z][^>]*\bclass\s*=\s*["'][^"']*\bMagicTableRow\b""", re.I)
+
+def fetch_sporteventz_html(d: date, deadline: float | None = None) -> BeautifulSoup:
     """Încercăm endpoint-ul component/magictable; dacă e doar șablon JS => Selenium."""
+    page = fetch_sporteventz_page(d, deadline=deadline)
+    if page is None:
+        return None
+    if page.body is None:  # 304: pagina e neschimbată, dar aici vrem un soup
+        HTTP.forget(page.url)
+        page = fetch_sporteventz_page(d, deadline=deadline)
+    return BeautifulSoup(page.body, "lxml")
+
+def fetch_sporteventz_page(d: date, deadline: float | None = None, stats: dict | None = None,
+                           capture: captures.Capture | None = None) -> net.FetchedPage:
+    """
+    Ca fetch_sporteventz_html, dar returnează pagina brută (net.FetchedPage):
+    body=None + not_modified la 304, ca jocurile parsate anterior să fie refolosite.
+    `stats` (opțional) primește http_status, bytes și timpul fallback-ului Selenium.
+    `capture` (opțional) primește paginile primite (HTTP și randarea Selenium).
+    """
     url = sporteventz_url_for_date(d)
+    date_iso = d.strftime("%Y-%m-%d")
+    stats = {} if stats is None else stats
     try:
-        r = requests.get(url, headers=SE_HEADERS, timeout=30)
+        page, r = _http_get("SportEventz", date_iso, url, SE_HEADERS, 30, deadline)
         log(f"sporteventz: HTTP {r.status_code}, bytes={len(r.content)}, url={url}")
-        r.raise_for_status()
-        html = r.text
-        with open(os.path.join(WEB_DATA, "__sporteventz.html"),
-                  "w", encoding="utf-8", errors="ignore") as f:
-            f.write(html)
+        stats.update(http_status=r.status_code, bytes=len(r.content))
+        if page.not_modified:
+            return page
+        html = page.body
+        if capture is not None:
+            capture.add("SportEventz", "http", url, r.content)
         has_rows_marker = ("MagicTableRow" in html) or ("jtable-data-row" in html)
         log(f"sporteventz: has_rows_marker={has_rows_marker}")
-        soup = BeautifulSoup(html, "lxml")
         # dacă markerii există, dar DOM-ul nu are elemente reale -> randare JS -> Selenium
-        if has_rows_marker and not soup.select(".MagicTableRow"):
-            return fetch_sporteventz_via_selenium(d.strftime("%Y-%m-%d"))
-        return soup
+        if has_rows_marker and not SE_ROW_ELEMENT_RE.search(html):
+            t0 = time.monotonic()
+            rendered = render_sporteventz_selenium(date_iso)
+            if capture is not None:
+                capture.add("SportEventz", "selenium", url, rendered)
+            stats["selenium"] = round(time.monotonic() - t0, 3)
+            metrics.SELENIUM_FALLBACKS.inc(source="SportEventz")
+            metrics.STAGE_SECONDS.observe(stats["selenium"], stage="selenium", source="SportEventz")
+            # înregistrăm pagina randată sub URL-ul magictable: la replay nu mai e nevoie de browser
+            replay.record(url, date_iso, rendered)
+            return net.FetchedPage(url, 200, rendered, net.content_hash(rendered))
+        HTTP.remember(page, r)
+        replay.record(url, date_iso, r.content)
+        return page
     except requests.exceptions.RequestException as e:
         log(f"Error fetching SportEventz HTML: {e}")
         return None
 
-def parse_sporteventz_soup(soup: BeautifulSoup, date_iso: str):
+def parse_sporteventz_html(html: str, date_iso: str, stats: dict | None = None):
+    """parse_sporteventz_soup peste HTML brut."""
+    return parse_sporteventz_soup(BeautifulSoup(html, "lxml"), date_iso, stats=stats)
+
+def parse_sporteventz_soup(soup: BeautifulSoup, date_iso: str, stats: dict | None = None):
     """
     Parser robust pentru SportEventz:
     - <tr class="jtable-data-row"> > .MagicTableRow (varianta tabel)
@@ -257,6 +341,8 @@ def parse_sporteventz_soup(soup: BeautifulSoup, date_iso: str):
             })
         log(f"SportEventz parsed games (tr variant): {len(games)}")
         if games:
+            if stats is not None:
+                stats["variant"] = "tr"
             return games
 
     # -- varianta cu .MagicTableRow direct --
@@ -279,6 +365,8 @@ def parse_sporteventz_soup(soup: BeautifulSoup, date_iso: str):
             "channels": channels
         })
     log(f"SportEventz parsed games (div variant): {len(games)}")
+    if stats is not None:
+        stats["variant"] = "div"
     return games
 
 # =========================================================
@@ -292,6 +380,57 @@ def liveonsat_url_for_day(d: date) -> str:
             f"start_dd={dd}&start_mm={mm}&start_yyyy={yy}"
             f"&end_dd={dd}&end_mm={mm}&end_yyyy={yy}")
 
+# regex-uri compilate o singură dată (nu per box)
+LOS_TIME_LABEL_RE = re.compile(
+    r"\b(?:ST|KO|START|BEGIN|ANPFIFF|ANSTOSS)\b[^\d]{0,8}(\d{1,2}:\d{2})",
+    flags=re.I
+)
+LOS_TIME_RE = re.compile(r"\b(\d{1,2}:\d{2})\b")
+LOS_TEAMS_RE = re.compile(r"(.+?)\s+(?:v|vs\.?|–|-)\s+(.+)$", re.I)
+LOS_COMP_CLASS = ("title", "head", "comp", "league", "country")
+LOS_COMP_WORDS_RE = re.compile(
+    r"(UEFA|Liga|League|Cup|Cupa|Serie|Bundesliga|Premier|LaLiga|Conference|Europa|World|Qualifier|Qualification|Play[- ]?Off|Round|Week|Group|Women|Cupa|Romaniei|Puchar|Pohar|Copa)",
+    re.I
+)
+
+def best_time_from_text(text: str) -> str | None:
+    """
+    Alege ora dintr-un text de box LiveOnSat (vezi choose_best_time).
+    1) eticheta ST; 2) KO/START/BEGIN/ANPFIFF/ANSTOSS; 3) o oră plauzibilă.
+    """
+    text = text.replace("\xa0", " ")  # NBSP -> spațiu normal
+
+    # 2) Căutăm etichete explicite cu HH:MM
+    labeled = []
+    for m in LOS_TIME_LABEL_RE.finditer(text):
+        label_zone = m.group(0).upper()
+        hhmm = m.group(1)
+        if "ST" in label_zone:     # prioritate maximă pentru ST
+            return hhmm
+        labeled.append(hhmm)
+    if labeled:
+        return labeled[0]          # prima etichetă găsită (KO/START/etc.)
+
+    # 3) Fără etichete: strângem TOATE HH:MM
+    all_times = LOS_TIME_RE.findall(text)
+    if not all_times:
+        return None
+
+    def to_minutes(hhmm: str) -> int:
+        h, m = hhmm.split(":")
+        return int(h) * 60 + int(m)
+
+    # unice + sortate
+    candidates = sorted(set(all_times), key=to_minutes)
+
+    # preferăm o fereastră "de zi": 09:00–23:59
+    day_window = [t for t in candidates if 9*60 <= to_minutes(t) <= 23*60+59]
+    if day_window:
+        return day_window[0]       # cea mai mică din fereastră (startul)
+
+    # fallback: cea mai mare (ex. de seară) – mai realistă decât 05:00
+    return candidates[-1]
+
 def choose_best_time(box) -> str | None:
     """
     Extrage ora corectă dintr-un 'box' LiveOnSat.
@@ -306,42 +445,7 @@ def choose_best_time(box) -> str | None:
         fragments = [" ".join(t.stripped_strings) for t in time_nodes]
         if not fragments:
             fragments = [" ".join(box.stripped_strings)]
-        text = "  ".join(fragments).replace("\xa0", " ")  # NBSP -> spațiu normal
-        
-        # 2) Căutăm etichete explicite cu HH:MM
-        labeled = []
-        label_regex = re.compile(
-            r"\b(?:ST|KO|START|BEGIN|ANPFIFF|ANSTOSS)\b[^\d]{0,8}(\d{1,2}:\d{2})",
-            flags=re.I
-        )
-        for m in label_regex.finditer(text):
-            label_zone = m.group(0).upper()
-            hhmm = m.group(1)
-            if "ST" in label_zone:     # prioritate maximă pentru ST
-                return hhmm
-            labeled.append(hhmm)
-        if labeled:
-            return labeled[0]          # prima etichetă găsită (KO/START/etc.)
-        
-        # 3) Fără etichete: strângem TOATE HH:MM
-        all_times = re.findall(r"\b(\d{1,2}:\d{2})\b", text)
-        if not all_times:
-            return None
-        
-        def to_minutes(hhmm: str) -> int:
-            h, m = hhmm.split(":")
-            return int(h) * 60 + int(m)
-        
-        # unice + sortate
-        candidates = sorted(set(all_times), key=to_minutes)
-        
-        # preferăm o fereastră "de zi": 09:00–23:59
-        day_window = [t for t in candidates if 9*60 <= to_minutes(t) <= 23*60+59]
-        if day_window:
-            return day_window[0]       # cea mai mică din fereastră (startul)
-        
-        # fallback: cea mai mare (ex. de seară) – mai realistă decât 05:00
-        return candidates[-1]
+        return best_time_from_text("  ".join(fragments))
     except Exception as e:
         log(f"Error in choose_best_time: {e}")
         return None
@@ -353,8 +457,8 @@ def find_los_competition(box) -> str:
     Heuristică: clasă ce conține title/head/comp/league sau text cu termeni tipici.
     """
     try:
-        KEY_CLASS = ("title", "head", "comp", "league", "country")
-        KEY_WORDS = r"(UEFA|Liga|League|Cup|Cupa|Serie|Bundesliga|Premier|LaLiga|Conference|Europa|World|Qualifier|Qualification|Play[- ]?Off|Round|Week|Group|Women|Cupa|Romaniei|Puchar|Pohar|Copa)"
+        KEY_CLASS = LOS_COMP_CLASS
+        KEY_WORDS = LOS_COMP_WORDS_RE
         
         node = box.find_previous(["div", "h1", "h2", "h3", "h4", "strong"])
         checks = 0
@@ -368,7 +472,7 @@ def find_los_competition(box) -> str:
                 if len(txt) >= 3 and not re.fullmatch(r"[-–—\s]+", txt):
                     return txt
                     
-            if txt and re.search(KEY_WORDS, txt, re.I):
+            if txt and KEY_WORDS.search(txt):
                 if len(txt) >= 3 and len(txt) < 200:
                     return txt
                     
@@ -400,7 +504,7 @@ def parse_liveonsat_soup(soup: BeautifulSoup, date_iso: str):
                     continue
                 
                 teams = fleft.get_text(" ", strip=True)
-                m_teams = re.search(r"(.+?)\s+(?:v|vs\.?|–|-)\s+(.+)$", teams, re.I)
+                m_teams = LOS_TEAMS_RE.search(teams)
                 if not m_teams:
                     continue
                 
@@ -437,16 +541,160 @@ def parse_liveonsat_soup(soup: BeautifulSoup, date_iso: str):
         log(traceback.format_exc())
         return []  # Return empty list on error
 
-def fetch_liveonsat_html(d: date) -> BeautifulSoup:
-    """Cere pagina 2day.php pentru ziua d și returnează soup."""
+# ---------- parser LiveOnSat într-o singură trecere (lxml, incremental) ----------
+LOS_STREAM_CHUNK = 64 * 1024
+PARSE_MEMSTATS = os.environ.get("TWLIVE_PARSE_MEMSTATS") == "1"   # peak memory prin tracemalloc (mai lent)
+LOS_HEADING_TAGS = {"h1", "h2", "h3", "h4", "strong"}
+
+def _classes(el) -> list:
+    return (el.get("class") or "").split()
+
+def _el_text(el) -> str:
+    """Echivalentul get_text(" ", strip=True) din BeautifulSoup pentru un element lxml."""
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+def _los_heading_text(el) -> str | None:
+    """Textul unui heading de competiție (aceleași reguli ca find_los_competition) sau None."""
+    cls = " ".join(_classes(el)).lower()
+    by_class = any(k in cls for k in LOS_COMP_CLASS)
+    if not by_class and el.tag not in LOS_HEADING_TAGS:
+        return None
+    txt = _el_text(el)
+    if not txt:
+        return None
+    if by_class and re.search(r"[A-Za-z]", txt) and len(txt) >= 3 and not re.fullmatch(r"[-–—\s]+", txt):
+        return txt
+    if LOS_COMP_WORDS_RE.search(txt) and 3 <= len(txt) < 200:
+        return txt
+    return None
+
+def _los_game_from_box(box, date_iso: str, comp: str) -> dict | None:
+    """Un joc din `div.blockfix` (element lxml); aceleași câmpuri ca parse_liveonsat_soup."""
+    time_nodes, fleft, channels = [], None, []
+    seen_links = {}   # id -> element; ținem proxy-urile lxml în viață ca id-urile să rămână unice
+    for el in box.iter():
+        if not isinstance(el.tag, str):
+            continue
+        cls = _classes(el)
+        if "fLeft_time_live" in cls or "fLeft_time" in cls:
+            time_nodes.append(el)
+        if fleft is None and "fix_text" in cls:
+            fleft = next((x for x in el.iter() if x is not el and "fLeft" in _classes(x)), None)
+        if "fLeft_live" in cls:
+            for a in el.iter("a"):
+                if id(a) in seen_links:
+                    continue
+                seen_links[id(a)] = a
+                txt = re.sub(r"\s+", " ", _el_text(a)).strip()
+                if len(txt) >= 2:
+                    channels.append(txt)
+
+    fragments = [_el_text(t) for t in time_nodes] or [_el_text(box)]
+    time_str = best_time_from_text("  ".join(fragments))
+    if not time_str or fleft is None:
+        return None
+    m_teams = LOS_TEAMS_RE.search(_el_text(fleft))
+    if not m_teams:
+        return None
+    home, away = m_teams.group(1).strip(), m_teams.group(2).strip()
+    return {
+        "source": "LiveOnSat",
+        "time_local": parse_time_local(date_iso, time_str),
+        "time_str": time_str,
+        "time_display": time_str,
+        "home": home, "away": away,
+        "teams_display": f"{home} v {away}",
+        "competition": comp,
+        "channels": highlight_first(channels)
+    }
+
+def parse_liveonsat_stream(html, date_iso: str, stats: dict | None = None, measure_memory: bool = PARSE_MEMSTATS):
+    """
+    Parser LiveOnSat într-o singură trecere, fără arbore BeautifulSoup:
+    documentul e dat pe bucăți unui HTMLPullParser (lxml), în ordinea documentului.
+    - reținem ultimul heading de competiție întâlnit (în loc de find_los_competition
+      care caută înapoi până la 40 de noduri pentru fiecare box);
+    - la închiderea fiecărui div.blockfix extragem jocul, apoi eliberăm subarborele.
+    `stats` (opțional) primește parse_ms, boxes și – cu measure_memory – peak_kb (tracemalloc).
+    """
+    games = []
+    if not html:
+        return games
+    t0 = time.perf_counter()
+    tracing = measure_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    try:
+        parser = etree.HTMLPullParser(events=("start", "end"))
+        comp, depth, boxes = "", 0, 0
+        for pos in range(0, len(html), LOS_STREAM_CHUNK):
+            parser.feed(html[pos:pos + LOS_STREAM_CHUNK])
+            for event, el in parser.read_events():
+                is_box = el.tag == "div" and "blockfix" in _classes(el)
+                if event == "start":
+                    depth += is_box
+                    continue
+                if is_box:
+                    depth -= 1
+                    boxes += 1
+                    try:
+                        g = _los_game_from_box(el, date_iso, comp)
+                        if g:
+                            games.append(g)
+                    except Exception as box_error:
+                        log(f"Error parsing a box: {box_error}")
+                elif depth == 0:
+                    heading = _los_heading_text(el)
+                    if heading:
+                        comp = heading
+                else:
+                    continue
+                # subarborele e procesat: îl golim și scoatem frații anteriori din memorie
+                el.clear()
+                parent = el.getparent()
+                while parent is not None and el.getprevious() is not None:
+                    del parent[0]
+        parser.close()
+        if stats is not None:
+            stats["boxes"] = boxes
+    except Exception as e:
+        log(f"Error in parse_liveonsat_stream: {e}")
+        log(traceback.format_exc())
+    finally:
+        if stats is not None:
+            stats["parse_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        if tracing:
+            stats is not None and stats.update(peak_kb=tracemalloc.get_traced_memory()[1] // 1024)
+            tracemalloc.stop()
+    log(f"LiveOnSat parsed games (stream): {len(games)}")
+    return games
+
+def fetch_liveonsat_html(d: date, deadline: float | None = None) -> BeautifulSoup:
+    """Cere pagina 2day.php pentru ziua d și returnează soup (gol dacă suntem blocați)."""
+    url = liveonsat_url_for_day(d)
+    HTTP.forget(url)  # vrem corpul paginii, nu un 304
+    page = fetch_liveonsat_page(d, deadline=deadline)
+    return BeautifulSoup(page.body or "<html><body></body></html>", "html.parser")
+
+def fetch_liveonsat_page(d: date, deadline: float | None = None, stats: dict | None = None,
+                         capture: captures.Capture | None = None) -> net.FetchedPage:
+    """
+    Cere pagina 2day.php pentru ziua d prin sesiunea comună și returnează net.FetchedPage
+    (body "" dacă suntem blocați; body None + not_modified la 304).
+    `deadline` (time.monotonic) oprește reîncercările care nu mai încap în timp.
+    `stats` (opțional) primește retries, http_status, bytes și blocked.
+    `capture` (opțional) primește fiecare răspuns, inclusiv paginile de blocare.
+    """
     url = liveonsat_url_for_day(d)
+    date_iso = d.strftime("%Y-%m-%d")
+    stats = {} if stats is None else stats
+    stats["retries"] = 0
     
     # Enhanced browser-like headers with more variations
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
         'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
         'Referer': 'https://liveonsat.com/',
         'sec-ch-ua': '"Chromium";v="126", "Google Chrome";v="126", "Not;A=Brand";v="99"',
         'sec-ch-ua-mobile': '?0',
@@ -461,10 +709,7 @@ def fetch_liveonsat_html(d: date) -> BeautifulSoup:
         'Priority': 'high'
     }
     
-    # Create a session to maintain cookies
-    session = requests.Session()
-    session.headers.update(headers)
-    
+    # Sesiunea comună (HTTP) păstrează cookie-urile și conexiunile între scrape-uri
     # Add retry logic
     max_retries = 3
     retry_delay = 5
@@ -479,53 +724,65 @@ def fetch_liveonsat_html(d: date) -> BeautifulSoup:
     
     # Try different approaches
     for attempt in range(max_retries):
+        stats["retries"] = attempt
         try:
-            # Random delay between 3-8 seconds to avoid rate limiting
-            time.sleep(random.uniform(3, 8))
+            # Ritmul cererilor e controlat de token bucket-ul hostului (net.HOST_RATES),
+            # nu de pauze aleatoare de 3-8 s
+            if _remaining(deadline, 5) < 5:
+                log("liveonsat: deadline reached, no time left for another attempt")
+                break
             
             # Rotate User-Agent for each attempt
             current_ua = random.choice(user_agents)
-            session.headers.update({'User-Agent': current_ua})
+            headers['User-Agent'] = current_ua
             log(f"Using User-Agent: {current_ua[:30]}...")
             
             # Make the request without proxy
-            r = session.get(url, timeout=45)
-            r.raise_for_status()
+            page, r = _http_get("LiveOnSat", date_iso, url, headers, 45, deadline)
+            if page.not_modified:
+                log(f"liveonsat: HTTP 304 (not modified), url={url}")
+                return page
             
             content_length = len(r.content)
             log(f"liveonsat: HTTP {r.status_code}, bytes={content_length}, url={url}")
+            stats["http_status"] = r.status_code
+            stats["bytes"] = stats.get("bytes", 0) + content_length
+            if capture is not None:
+                capture.add("LiveOnSat", "http", url, r.content)
             
             # Validate that we got a proper HTML response, not a blocked page
             if content_length < 5000:  # If response is too small, it's likely a block page
                 log(f"Response seems too small ({content_length} bytes), might be blocked")
                 raise Exception("Response too small, likely blocked")
                 
-            # Save the HTML for debugging
-            open(os.path.join(WEB_DATA, "__liveonsat.html"), "wb").write(r.content)
-            
-            # Parse with BeautifulSoup - use html.parser instead of lxml
-            soup = BeautifulSoup(r.text, "html.parser")
+            html = page.body
             
-            # Check if the page seems valid (has expected elements)
-            if not soup.select("div.blockfix") and not soup.select(".fix_text"):
+            # Check if the page seems valid (has expected elements) - fără a construi un soup
+            if "blockfix" not in html and "fix_text" not in html:
                 log("Response doesn't contain expected HTML elements, might be blocked")
                 raise Exception("Missing expected HTML elements")
                 
-            return soup
+            HTTP.remember(page, r)
+            replay.record(url, date_iso, r.content)
+            return page
             
         except Exception as e:
             log(f"Error on attempt {attempt+1}/{max_retries}: {e}")
             
             # If not the last attempt, wait and retry
             if attempt < max_retries - 1:
+                if _remaining(deadline, retry_delay + 1) < retry_delay + 1:
+                    log("liveonsat: deadline reached, skipping retry")
+                    break
                 log(f"Retrying in {retry_delay} seconds...")
                 time.sleep(retry_delay)
                 # Increase delay for next attempt
                 retry_delay *= 2
     
     # If all attempts fail, return an empty soup rather than trying Selenium
-    log("All direct attempts failed. LiveOnSat access blocked. Using empty soup.")
-    return BeautifulSoup("<html><body></body></html>", "html.parser")
+    log("All direct attempts failed. LiveOnSat access blocked. Using empty page.")
+    stats["blocked"] = True
+    return net.FetchedPage(url, 0, "")
 
 # =========================================================
 #                         MERGE
@@ -552,16 +809,261 @@ def _mins_diff(g1: dict, g2: dict) -> int:
     dt1, dt2 = _dt_from_game(g1), _dt_from_game(g2)
     return int(abs((dt1 - dt2).total_seconds()) // 60)
 
-def is_same_game(g1, g2) -> bool:
-    """Aceeași partidă dacă kick-off-urile sunt la max ±65 min și echipele se potrivesc fuzzy."""
-    # timp: tolerăm diferență de până la 65 minute (timezone/selector)
-    if _mins_diff(g1, g2) > 300:
-        return False
-    a1, b1 = clean_name(g1["home"]), clean_name(g1["away"])
-    a2, b2 = clean_name(g2["home"]), clean_name(g2["away"])
+MATCH_WINDOW_MIN = 300   # diferența maximă de kick-off (minute) pentru același meci
+MATCH_THRESHOLD = 70     # scor fuzzy minim (media home/away, direct sau încrucișat)
+MATCH_TIME_PENALTY = 2.0 # puncte scăzute per oră de diferență la kick-off (doar la alegerea perechii)
+
+def _teams_score(a1: str, b1: str, a2: str, b2: str) -> float:
+    """Scorul fuzzy pentru două perechi de nume deja curățate (max direct / încrucișat)."""
     direct = (_token_set_ratio(a1, a2) + _token_set_ratio(b1, b2)) / 2
     cross  = (_token_set_ratio(a1, b2) + _token_set_ratio(b1, a2)) / 2
-    return max(direct, cross) >= 70
+    return max(direct, cross)
+
+def _exact_pair(a1: str, b1: str, a2: str, b2: str) -> bool:
+    """Aceleași id-uri canonice (direct sau încrucișat) -> scor 100 fără fuzzy."""
+    return (a1 == a2 and b1 == b2) or (a1 == b2 and b1 == a2)
+
+def is_same_game(g1, g2) -> bool:
+    """Aceeași partidă dacă kick-off-urile sunt la max ±300 min și echipele se potrivesc (exact sau fuzzy)."""
+    # timp: tolerăm diferență de până la MATCH_WINDOW_MIN minute (timezone/selector)
+    if _mins_diff(g1, g2) > MATCH_WINDOW_MIN:
+        return False
+    canon = teams_normalize.canonical
+    a1, b1 = canon(g1["home"]), canon(g1["away"])
+    a2, b2 = canon(g2["home"]), canon(g2["away"])
+    if _exact_pair(a1, b1, a2, b2):
+        return True
+    return _teams_score(a1, b1, a2, b2) >= MATCH_THRESHOLD
+
+# ---------- index de candidați (blocking) ----------
+def _block_keys(*names: str) -> set:
+    """
+    Chei de blocking: primele 3 litere (fără diacritice) ale fiecărui token.
+    Două nume care trec pragul fuzzy au aproape mereu cel puțin o cheie comună.
+    """
+    keys = set()
+    for n in names:
+        for tok in n.split():
+            folded = unicodedata.normalize("NFKD", tok)
+            folded = "".join(c for c in folded if not unicodedata.combining(c))
+            keys.add(folded[:3])
+    return keys
+
+class _MatchInfo:
+    """Date precalculate o singură dată per joc: kick-off, id-uri canonice ale echipelor, chei de blocking."""
+    __slots__ = ("minute", "home", "away", "keys")
+
+    def __init__(self, g: dict):
+        self.minute = int((_dt_from_game(g) - datetime(1970, 1, 1)).total_seconds() // 60)
+        self.home = teams_normalize.canonical(g["home"])
+        self.away = teams_normalize.canonical(g["away"])
+        self.keys = _block_keys(self.home, self.away)
+
+class CandidateIndex:
+    """
+    Index pre-merge peste o listă de jocuri:
+    - bucket-uri de kick-off de lățime MATCH_WINDOW_MIN (căutăm în bucket-ul
+      jocului și în cei doi vecini, deci nu pierdem nimic din fereastră);
+    - blocking pe token-urile numelor curățate.
+    Doar candidații care trec ambele filtre ajung la comparația fuzzy.
+    """
+    def __init__(self, games: list):
+        self.info = [_MatchInfo(g) for g in games]
+        self._by_key = {}     # (bucket, key) -> [idx]
+        self._keyless = {}    # bucket -> [idx] pentru jocuri fără token-uri (comparate cu toți)
+        for i, m in enumerate(self.info):
+            b = m.minute // MATCH_WINDOW_MIN
+            if not m.keys:
+                self._keyless.setdefault(b, []).append(i)
+            for k in m.keys:
+                self._by_key.setdefault((b, k), []).append(i)
+
+    def candidates(self, m: _MatchInfo) -> list:
+        """Indicii (sortați) din index care pot fi același meci cu `m`."""
+        b = m.minute // MATCH_WINDOW_MIN
+        found = set()
+        for bb in (b - 1, b, b + 1):
+            found.update(self._keyless.get(bb, ()))
+            if not m.keys:
+                # fără token-uri: tot ce e în fereastra de timp
+                for (kb, _), idx in self._by_key.items():
+                    if kb == bb:
+                        found.update(idx)
+                continue
+            for k in m.keys:
+                found.update(self._by_key.get((bb, k), ()))
+        return sorted(i for i in found if abs(self.info[i].minute - m.minute) <= MATCH_WINDOW_MIN)
+
+# ---------- scoring în lot + asignare optimă ----------
+def _batch_scores(left: list, right: list, pairs: list) -> list:
+    """
+    Scorurile (ca în _teams_score) pentru toate perechile candidat (i, j) dintr-o dată:
+    patru apeluri cpdist (home/home, away/away, home/away, away/home) în loc de
+    4 apeluri Python per pereche.
+    """
+    if not pairs:
+        return []
+    scores = [100.0] * len(pairs)
+    # perechile rezolvate exact de tabela de alias-uri nu mai ajung la fuzzy
+    fuzzy = [k for k, (i, j) in enumerate(pairs)
+             if not _exact_pair(left[i].home, left[i].away, right[j].home, right[j].away)]
+    if not fuzzy:
+        return scores
+    if np is None or _rf_process is None or _rf_fuzz is None:
+        for k in fuzzy:
+            i, j = pairs[k]
+            scores[k] = _teams_score(left[i].home, left[i].away, right[j].home, right[j].away)
+        return scores
+    lh = [left[pairs[k][0]].home for k in fuzzy]
+    la = [left[pairs[k][0]].away for k in fuzzy]
+    rh = [right[pairs[k][1]].home for k in fuzzy]
+    ra = [right[pairs[k][1]].away for k in fuzzy]
+
+    def score(q, c):
+        # floor = același int() ca în _token_set_ratio
+        return np.floor(_rf_process.cpdist(q, c, scorer=_rf_fuzz.token_set_ratio, dtype=np.float64))
+
+    direct = (score(lh, rh) + score(la, ra)) / 2
+    cross = (score(lh, ra) + score(la, rh)) / 2
+    for k, sc in zip(fuzzy, np.maximum(direct, cross).tolist()):
+        scores[k] = sc
+    return scores
+
+def _hungarian(weights: list) -> list:
+    """
+    Asignare de pondere maximă pe o matrice n x m (n <= m), algoritmul Kuhn–Munkres.
+    Returnează pentru fiecare rând coloana aleasă.
+    """
+    n, m = len(weights), len(weights[0])
+    INF = float("inf")
+    u, v = [0.0] * (n + 1), [0.0] * (m + 1)
+    p, way = [0] * (m + 1), [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [INF] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0, delta, j1 = p[j0], INF, 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = -weights[i0 - 1][j - 1] - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j], way[j] = cur, j0
+                if minv[j] < delta:
+                    delta, j1 = minv[j], j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    rows = [0] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            rows[p[j] - 1] = j - 1
+    return rows
+
+# ---------- clustering în N surse ----------
+def _union_find():
+    parent = {}
+
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    return parent, find
+
+def _assign_rows(w: list) -> list:
+    """_hungarian pe o matrice oarecare: perechile (rând, coloană) alese, doar cele cu pondere > 0."""
+    if not w or not w[0]:
+        return []
+    flip = len(w) > len(w[0])
+    if flip:
+        w = [list(col) for col in zip(*w)]
+    out = []
+    for r, c in enumerate(_hungarian(w)):
+        if w[r][c] > 0:   # pereche fictivă (pondere 0) -> fără potrivire
+            out.append((c, r) if flip else (r, c))
+    return out
+
+def cluster_games(by_source: dict) -> list:
+    """
+    Grupează jocurile din oricâte surse într-o singură trecere:
+    - toate jocurile, sortate după kick-off, într-un singur CandidateIndex;
+    - perechi candidat doar între surse diferite, scorate în lot (_batch_scores);
+    - pe fiecare componentă conexă a grafului de perechi, sursele se adaugă pe rând
+      (ordinea din `by_source`) cu asignare optimă unu-la-unu față de clusterele deja formate.
+    Un cluster are cel mult un joc per sursă. Returnează clusterele ca
+    {"games": {sursă: joc}, "links": [(joc ancoră, joc adăugat, scor)]}, în ordinea
+    primei apariții (sursă, poziție în sursă).
+    """
+    rank = {name: r for r, name in enumerate(by_source)}
+    flat = [(rank[name], k, name, g) for name, games in by_source.items() for k, g in enumerate(games or [])]
+    flat.sort(key=lambda t: (_dt_from_game(t[3]), t[0], t[1]))
+    index = CandidateIndex([t[3] for t in flat])
+    info = index.info
+    pairs = []
+    for i, m in enumerate(info):
+        for j in index.candidates(m):
+            if j > i and flat[j][0] != flat[i][0]:
+                # sursa cu rangul mai mic în stânga, ca la scorul pe perechi
+                pairs.append((i, j) if flat[i][0] < flat[j][0] else (j, i))
+    edges = {}
+    for (i, j), sc in zip(pairs, _batch_scores(info, info, pairs)):
+        if sc < MATCH_THRESHOLD:
+            continue
+        hours = abs(info[i].minute - info[j].minute) / 60
+        edges[(i, j)] = edges[(j, i)] = (sc - MATCH_TIME_PENALTY * hours, sc)
+
+    parent, find = _union_find()
+    for i, j in edges:
+        parent[find(i)] = find(j)
+    components = {}
+    for n in range(len(flat)):
+        components.setdefault(find(n), []).append(n)
+
+    clusters = []
+    for nodes in components.values():
+        by_rank = {}
+        for n in nodes:
+            by_rank.setdefault(flat[n][0], []).append(n)
+        comp = []   # [membri (indici în flat), legături]
+        for r in sorted(by_rank):
+            new = by_rank[r]
+            w, best = [], {}
+            for ci, (members, _) in enumerate(comp):
+                row = []
+                for gi, n in enumerate(new):
+                    cand = [(edges[(m, n)], m) for m in members if (m, n) in edges]
+                    (weight, sc), anchor = max(cand) if cand else ((0.0, 0.0), None)
+                    row.append(weight)
+                    best[(ci, gi)] = (anchor, sc)
+                w.append(row)
+            taken = set()
+            for ci, gi in _assign_rows(w):
+                anchor, sc = best[(ci, gi)]
+                comp[ci][0].append(new[gi])
+                comp[ci][1].append((anchor, new[gi], sc))
+                taken.add(gi)
+            comp.extend(([n], []) for gi, n in enumerate(new) if gi not in taken)
+        clusters.extend(comp)
+
+    clusters.sort(key=lambda c: min(flat[n][:2] for n in c[0]))
+    return [{"games": {flat[n][2]: flat[n][3] for n in members},
+             "links": [(flat[a][3], flat[b][3], sc) for a, b, sc in links]}
+            for members, links in clusters]
 
 def pick_time_display(g: dict) -> str:
     """
@@ -577,69 +1079,302 @@ def pick_time_display(g: dict) -> str:
     tl = g.get("time_local", "")
     return tl[11:16] if len(tl) >= 16 else ""
 
-def merge_all(los, se):
-    merged, used = [], [False] * len(se)
-    for g in los:
-        matched_h = None
-        matched_i = -1
-        for i, h in enumerate(se):
-            if used[i]:
-                continue
-            if is_same_game(g, h):
-                matched_h = h
-                matched_i = i
-                break
-        # începem cu datele din LiveOnSat
-        ch = list(dict.fromkeys(g["channels"]))
-        sources = {"LiveOnSat"}
-        # ora/ziua pentru output
-        tdisp = _hhmm_from_game(g)
-        date_iso = _date_part(g) or f"{now_vienna():%Y-%m-%d}"
-        # competiția – după regulile cerute:
-        # - doar LiveOnSat  -> competiția L-o-S
-        # - doar SportEventz -> competiția S-E  (vezi bucla de mai jos)
-        # - ambele -> competiția S-E
-        comp = g.get("competition", "") or ""
-        if matched_h is not None:
-            used[matched_i] = True
-            # unește canalele și sursele
-            ch = list(dict.fromkeys(ch + matched_h["channels"]))
-            sources.add("SportEventz")
-            # ora: preferăm din SportEventz (e mai stabilă la TZ)
-            tdisp = _hhmm_from_game(matched_h) or tdisp
-            # competiție: preferăm SportEventz când avem ambele
-            comp = matched_h.get("competition", "") or comp
-        merged.append(
-            {
-                "time_local": f"{date_iso} {tdisp}",
-                "time_display": tdisp,
-                "teams_display": g["teams_display"],  # denumire după LiveOnSat (cum ai cerut)
-                "competition": comp,
-                "channels": highlight_first(ch),
-                "sources": sorted(sources),
-            }
-        )
-    # ce rămâne doar în SportEventz
-    for i, h in enumerate(se):
-        if used[i]:
+def learn_aliases(links: list) -> int:
+    """
+    Perechile potrivite sigur (direct sau încrucișat, scor per echipă) merg în tabela
+    de alias-uri; numele diferite devin alias după câteva scrape-uri (vezi teams_normalize).
+    `links`: [(joc, joc, scor)] din cluster_games.
+    """
+    table, learned = teams_normalize.get_table(), 0
+    for a, b, score in links:
+        if score < teams_normalize.LEARN_MIN_SCORE:
             continue
-        merged.append(
-            {
-                "time_local": h["time_local"],
-                "time_display": _hhmm_from_game(h),
-                "teams_display": h["teams_display"],
-                "competition": h.get("competition", "") or "",
-                "channels": highlight_first(h["channels"]),
-                "sources": ["SportEventz"],
-            }
-        )
+        a1, b1 = teams_normalize.canonical(a["home"]), teams_normalize.canonical(a["away"])
+        a2, b2 = teams_normalize.canonical(b["home"]), teams_normalize.canonical(b["away"])
+        if _exact_pair(a1, b1, a2, b2):
+            continue
+        direct = (_token_set_ratio(a1, a2), _token_set_ratio(b1, b2))
+        cross = (_token_set_ratio(a1, b2), _token_set_ratio(b1, a2))
+        if sum(direct) >= sum(cross):
+            pairs = ((a["home"], b["home"], direct[0]), (a["away"], b["away"], direct[1]))
+        else:
+            pairs = ((a["home"], b["away"], cross[0]), (a["away"], b["home"], cross[1]))
+        for x, y, sc in pairs:
+            learned += table.learn(x, y, sc)
+    return learned
+
+# ---------- precedență per câmp ----------
+# câmp -> sursele preferate, în ordine; sursele nelistate urmează în ordinea din registru.
+# Se ia prima valoare nevidă; la "channels" se unesc canalele tuturor surselor, în ordinea asta.
+# Suprascriere: TWLIVE_FIELD_PRECEDENCE='{"competition": ["LiveOnSat"]}'
+FIELD_PRECEDENCE = {
+    "teams_display": ["LiveOnSat", "SportEventz"],   # denumirile după LiveOnSat
+    "time_display": ["SportEventz", "LiveOnSat"],    # ora din SportEventz (mai stabilă la TZ)
+    "competition": ["SportEventz", "LiveOnSat"],
+    "channels": ["LiveOnSat", "SportEventz"],
+}
+
+def _load_precedence(raw: str | None) -> dict:
+    if not raw:
+        return dict(FIELD_PRECEDENCE)
+    try:
+        override = json.loads(raw)
+        return {**FIELD_PRECEDENCE, **{field: list(names) for field, names in override.items()}}
+    except (ValueError, TypeError, AttributeError) as e:
+        log(f"TWLIVE_FIELD_PRECEDENCE ignored: {e}")
+        return dict(FIELD_PRECEDENCE)
+
+FIELD_PRECEDENCE = _load_precedence(os.environ.get("TWLIVE_FIELD_PRECEDENCE"))
+
+def _by_precedence(games: dict, field: str, precedence: dict) -> list:
+    """Jocurile clusterului în ordinea de precedență pentru `field`."""
+    order = [s for s in precedence.get(field, ()) if s in games]
+    return [games[s] for s in order] + [g for s, g in games.items() if s not in order]
+
+def _merge_cluster(games: dict, links: list, precedence: dict) -> dict:
+    """Un joc din output dintr-un cluster {sursă: joc}, după regulile de precedență (+ freshness)."""
+    teams = _by_precedence(games, "teams_display", precedence)[0]
+    timed = next((g for g in _by_precedence(games, "time_display", precedence) if _hhmm_from_game(g)), teams)
+    tdisp = _hhmm_from_game(timed)
+    date_iso = _date_part(timed) or _date_part(teams) or f"{now_vienna():%Y-%m-%d}"
+    comp = next((g.get("competition") for g in _by_precedence(games, "competition", precedence)
+                 if g.get("competition")), "")
+    ch = [c for g in _by_precedence(games, "channels", precedence) for c in g["channels"]]
+    item = {
+        "time_local": f"{date_iso} {tdisp}",
+        "time_display": tdisp,
+        "teams_display": teams["teams_display"],
+        "competition": comp,
+        "channels": highlight_first(list(dict.fromkeys(ch))),
+        "sources": sorted(games),
+        # stale = doar din jocurile last-known-good ale unor surse căzute; fresh dacă o sursă l-a confirmat acum
+        "freshness": "fresh" if any(not g.get("stale") for g in games.values()) else "stale",
+    }
+    stale = sorted(s for s, g in games.items() if g.get("stale"))
+    if stale:
+        item["stale_sources"] = stale
+    if links:
+        item["confidence"] = round(min(sc for _, _, sc in links) / 100, 2)   # cea mai slabă legătură
+    return item
+
+def merge_sources(by_source: dict, precedence: dict | None = None) -> list:
+    """
+    Merge pentru oricâte surse: {sursă: [joc]} -> lista unificată, sortată după oră.
+    Ordinea din `by_source` e ordinea implicită a surselor (clustering, precedență).
+    """
+    precedence = FIELD_PRECEDENCE if precedence is None else precedence
+    clusters = cluster_games(by_source)
+    learn_aliases([link for c in clusters for link in c["links"]])
+    merged = [_merge_cluster(c["games"], c["links"], precedence) for c in clusters]
     merged.sort(key=lambda x: (x["time_local"], x["teams_display"].lower()))
+    stamp_identity(merged)
     return merged
 
+def merge_all(los, se):
+    """merge_sources pentru cele două surse istorice (bench, cod vechi)."""
+    return merge_sources({"LiveOnSat": los, "SportEventz": se})
+
+def game_identity(g: dict) -> str:
+    """
+    Id stabil între scrape-uri: data + numele echipelor normalizate (nu ora, nu canalele),
+    ca o mutare de oră sau un canal nou să fie "changed", nu "removed + added".
+    """
+    teams = re.split(r"\s+v\s+", g.get("teams_display", ""), maxsplit=1)
+    key = _date_part(g) + "|" + "|".join(clean_name(t) for t in teams)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+def stamp_identity(games: list):
+    """Adaugă "id" (unic în listă) și "hash" (conținut) fiecărui joc."""
+    seen = {}
+    for g in games:
+        gid = game_identity(g)
+        seen[gid] = seen.get(gid, 0) + 1
+        g["id"] = gid if seen[gid] == 1 else f"{gid}-{seen[gid]}"
+        g["hash"] = changes.game_hash(g)
+
+# =========================================================
+#                   FETCH + PARSE PARALEL
+# =========================================================
+# sursele = adaptoare în sources.REGISTRY (ordinea de înregistrare = ordinea la merge);
+# parse(raw, date_iso, stats=dict) completează stats cu detalii (parse_ms, boxes, ...)
+REGISTRY = sources.REGISTRY
+REGISTRY.register(sources.FunctionSource(
+    "LiveOnSat", fetch_liveonsat_page, parse_liveonsat_stream, SOURCE_DEADLINES["LiveOnSat"]))
+REGISTRY.register(sources.FunctionSource(
+    "SportEventz", fetch_sporteventz_page, parse_sporteventz_html, SOURCE_DEADLINES["SportEventz"]))
+
+def _notify(progress, stage: str, source: str | None = None, **info):
+    """Trimite un eveniment de progres (dacă avem callback); erorile lui nu opresc scrape-ul."""
+    if progress is None:
+        return
+    try:
+        progress({"stage": stage, "source": source, **info})
+    except Exception as e:
+        log(f"progress callback error: {e}")
+
+def _run_source(adapter: sources.SourceAdapter, query_date: date, date_iso: str, deadline: float,
+                progress=None, capture=None):
+    """
+    Pipeline pentru o singură sursă: fetch, apoi parse imediat ce HTML-ul a sosit.
+    Dacă pagina e 304 sau are același hash ca data trecută, refolosim jocurile parsate.
+    Cu breaker-ul sursei deschis nu facem nicio cerere. Returnează (games | None, timings).
+    """
+    name = adapter.name
+    if not adapter.breaker.allow():
+        timings = {"status": "open", "fetch": 0.0, "parse": 0.0, "games": 0,
+                   "retry_in": round(adapter.breaker.retry_in(), 1)}
+        log(f"{name}: circuit open, skipped (retry in {timings['retry_in']:.0f}s)")
+        metrics.SOURCE_RESULTS.inc(source=name, status="open")
+        _notify(progress, "fetch", name, **timings)
+        return None, timings
+    if adapter.breaker.state == sources.CircuitBreaker.HALF_OPEN:
+        log(f"{name}: circuit half-open, probing with a {BREAKER_PROBE_DEADLINE:.0f}s deadline")
+        deadline = min(deadline, time.monotonic() + BREAKER_PROBE_DEADLINE)
+    _notify(progress, "fetch", name, status="fetching")
+    t0 = time.monotonic()
+    fetch_stats = {}
+    page = adapter.fetch(query_date, deadline=deadline, stats=fetch_stats, capture=capture)
+    t1 = time.monotonic()
+    timings = {"fetch": round(t1 - t0, 3), **fetch_stats}
+    metrics.STAGE_SECONDS.observe(t1 - t0, stage="fetch", source=name)
+    metrics.RETRIES.inc(fetch_stats.get("retries", 0), source=name)
+    if "bytes" in fetch_stats:
+        metrics.RESPONSE_BYTES.observe(fetch_stats["bytes"], source=name)
+    if page is None:
+        timings.update(status="error", parse=0.0, games=0)
+        metrics.SOURCE_RESULTS.inc(source=name, status="error")
+        _notify(progress, "fetch", name, **timings)
+        return None, timings
+    games = PARSED.get(name, date_iso, page.content_hash)
+    if games is not None:
+        timings.update(status="ok", parse=0.0, games=len(games),
+                       reused="not_modified" if page.not_modified else "same_hash")
+        metrics.SOURCE_RESULTS.inc(source=name, status="reused")
+        metrics.GAMES.set(len(games), source=name)
+        _notify(progress, "parse", name, **timings)
+        return games, timings
+    _notify(progress, "parse", name, status="parsing", fetch=timings["fetch"])
+    stats = {}
+    games = adapter.parse(page.body, date_iso, stats=stats)
+    PARSED.put(name, date_iso, page.content_hash, games)
+    t2 = time.monotonic()
+    timings.update(stats)
+    timings.update(status="ok", parse=round(t2 - t1, 3), games=len(games))
+    metrics.STAGE_SECONDS.observe(t2 - t1, stage="parse", source=name)
+    metrics.SOURCE_RESULTS.inc(source=name, status="ok")
+    metrics.GAMES.set(len(games), source=name)
+    _notify(progress, "parse", name, **timings)
+    return games, timings
+
+BREAKER_LEVELS = {sources.CircuitBreaker.CLOSED: 0, sources.CircuitBreaker.HALF_OPEN: 1, sources.CircuitBreaker.OPEN: 2}
+
+def _sync_breakers():
+    """Starea breaker-elor salvată de alți workeri / rulări anterioare (dacă e mai nouă)."""
+    try:
+        saved = store.get_store().load_breakers()
+    except sqlite3.Error as e:
+        log(f"Breaker state read failed: {e}")
+        return
+    for name, state in saved.items():
+        adapter = REGISTRY.get(name)
+        if adapter is not None:
+            adapter.breaker.restore(state)
+
+def _last_known_good(name: str, date_iso: str, games, timings: dict):
+    """
+    Sursă reușită -> jocurile ei devin last-known-good pentru dată.
+    Sursă eșuată / blocată / cu breaker-ul deschis -> ultimele jocuri bune, marcate "stale".
+    Returnează jocurile de folosit la merge (None = nimic).
+    """
+    failed = games is None or timings.get("blocked") or timings.get("status") != "ok"
+    try:
+        if not failed:
+            if games and "reused" not in timings:
+                store.get_store().save_source_games(name, date_iso, games)
+            return games
+        lkg = store.get_store().load_source_games(name, date_iso)
+    except sqlite3.Error as e:
+        log(f"{name}: last-known-good store failed: {e}")
+        return games
+    if lkg is None:
+        return games
+    stale, fetched = lkg
+    timings.update(stale=True, stale_games=len(stale), stale_age=round(time.time() - fetched))
+    metrics.SOURCE_RESULTS.inc(source=name, status="stale")
+    log(f"{name}: using {len(stale)} last-known-good games from {timings['stale_age'] / 60:.0f} min ago")
+    return [dict(g, stale=True) for g in stale]
+
+def fetch_all_sources(query_date: date, date_iso: str, progress=None, capture=None):
+    """
+    Rulează toate sursele din REGISTRY în paralel, fiecare cu termenul ei (adapter.deadline).
+    Returnează (games_by_source, timings_by_source), în ordinea registrului; o sursă care
+    a eșuat sau a depășit termenul are games = None, sau ultimele ei jocuri bune pentru
+    dată (marcate "stale", timings[sursă]["stale"] = True).
+    `progress(event)` primește evenimente {"stage", "source", "status", ...}.
+    `capture` (captures.Capture, opțional) primește paginile brute ale surselor.
+    """
+    _sync_breakers()
+    start = time.monotonic()
+    results = REGISTRY.run_all(
+        lambda a: _run_source(a, query_date, date_iso, start + a.deadline, progress, capture), start)
+    games, timings = {}, {}
+    for name, (state, value) in results.items():
+        adapter = REGISTRY.get(name)
+        if state == "ok":
+            games[name], timings[name] = value
+        else:
+            if state == "timeout":
+                log(f"{name}: deadline of {adapter.deadline:.0f}s exceeded")
+                timings[name] = {"status": "timeout"}
+            else:
+                log(f"{name}: pipeline error: {value}")
+                timings[name] = {"status": "error", "error": str(value)}
+            games[name] = None
+            timings[name].update(fetch=round(time.monotonic() - start, 3), parse=0.0, games=0)
+            metrics.SOURCE_RESULTS.inc(source=name, status=state)
+            _notify(progress, "fetch", name, **timings[name])
+        t = timings[name]
+        t["deadline"] = adapter.deadline
+        status = "blocked" if t.get("blocked") else t["status"]
+        adapter.record(status, t.get("games", 0), t.get("fetch", 0.0) + t.get("parse", 0.0), t.get("error"))
+        t["breaker"] = adapter.breaker.state
+        metrics.BREAKER_STATE.set(BREAKER_LEVELS[adapter.breaker.state], source=name)
+        if status != "open":
+            try:
+                store.get_store().save_breaker(name, adapter.breaker.snapshot())
+            except sqlite3.Error as e:
+                log(f"{name}: breaker state write failed: {e}")
+        games[name] = _last_known_good(name, date_iso, games[name], t)
+    return games, timings
+
 # =========================================================
 #                         MAIN
 # =========================================================
-def main(query_date_str=None):
+def write_day_file(out: dict):
+    """Scrie rezultatul unei zile în games/YYYY-MM-DD.json (+ .gz/.br/.etag)."""
+    return snapshot.write(os.path.join(DAYS_DIR, f"{out['date']}.json"), out)
+
+def _finish_capture(capture, failed: bool, run_id=None):
+    """captures.finish; capturile sunt pentru debug, deci o eroare aici nu oprește scrape-ul."""
+    try:
+        kept = captures.finish(capture, failed, run_id)
+    except (OSError, sqlite3.Error) as e:
+        log(f"Capture write failed: {e}")
+        return None
+    if kept:
+        log(f"Capture {kept['id']}: {kept['pages']} pages, {kept['new_blobs']} new blobs "
+            f"({kept['written'] / 1024:.0f} KB), pruned {kept['pruned']} scrapes")
+    return kept
+
+def main(query_date_str=None, progress=None, write_latest=True):
+    """
+    Scrape complet pentru o zi: fetch + parse (paralel) -> merge -> run nou în depozitul
+    SQLite, games/<dată>.json și (dacă `write_latest`) merged.json ca export.
+    _meta: per sursă fetch/parse/selenium (s), retries, bytes, games; apoi merge, write.
+    `progress` (opțional) primește evenimente de etapă, vezi fetch_all_sources.
+    Paginile brute merg în scraper/captures.py (doar dacă TWLIVE_CAPTURE e activ).
+    """
+    capture = None
     try:
         # --- dată din argument sau azi (Viena) ---
         if query_date_str:
@@ -650,35 +1385,70 @@ def main(query_date_str=None):
             query_date = now_vienna().date()
         date_iso = query_date.strftime("%Y-%m-%d")
         log(f"Scrape start for {date_iso}")
+        capture = captures.begin(date_iso)
         
-        # --- fetch + parse pentru ziua cerută ---
-        los_soup = fetch_liveonsat_html(query_date)
-        if los_soup is None:
-            raise Exception("Failed to fetch LiveOnSat HTML")
+        # --- fetch + parse pentru ziua cerută (sursele în paralel) ---
+        t_start = time.monotonic()
+        by_source, timings = fetch_all_sources(query_date, date_iso, progress, capture)
         
-        se_soup = fetch_sporteventz_html(query_date)
-        if se_soup is None:
-            raise Exception("Failed to fetch SportEventz HTML")
+        for name, games in by_source.items():
+            # sursă căzută fără jocuri last-known-good -> continuăm fără ea
+            by_source[name] = games or []
+            log(f"{name}: {len(by_source[name])}" + (" (stale)" if timings[name].get("stale") else ""))
+        if not any(by_source.values()) and not any(t["status"] == "ok" for t in timings.values()):
+            failed = ", ".join(f"{n} {t['status']}" for n, t in timings.items())
+            raise Exception(f"All sources failed ({failed})")
         
-        los = parse_liveonsat_soup(los_soup, date_iso)
-        log(f"LiveOnSat: {len(los)}")
-        
-        se = parse_sporteventz_soup(se_soup, date_iso)
-        log(f"SportEventz: {len(se)}")
-        
-        merged = merge_all(los, se)
+        _notify(progress, "merge")
+        t_merge = time.monotonic()
+        merged = merge_sources(by_source)
+        merge_s = time.monotonic() - t_merge
+        metrics.STAGE_SECONDS.observe(merge_s, stage="merge", source="")
+        metrics.GAMES.set(len(merged), source="merged")
         log(f"Merged total: {len(merged)}")
         
         out = {
             "date": date_iso,
             "generated_at": f"{now_vienna():%Y-%m-%d %H:%M:%S}",
-            "counters": {"LiveOnSat": len(los), "SportEventz": len(se), "Total": len(merged)},
+            "counters": {**{name: len(games) for name, games in by_source.items()}, "Total": len(merged)},
             "timezone": "Europe/Vienna (GMT+2)",
             "games": merged,
+            "_meta": {
+                "sources": timings,
+                "merge": round(merge_s, 3),
+                "scrape_elapsed": round(time.monotonic() - t_start, 3),
+            },
         }
+        if _BROWSER_POOL is not None:
+            out["_meta"]["browser_pool"] = _BROWSER_POOL.stats()
         
-        with open(os.path.join(WEB_DATA, "merged.json"), "w", encoding="utf-8") as f:
-            json.dump(out, f, ensure_ascii=False, indent=2)
+        _notify(progress, "write")
+        t_write = time.monotonic()
+        run_id = None
+        try:
+            run_id = store.get_store().save(out)
+            log(f"Store: run {run_id} for {date_iso}")
+        except Exception as e:
+            # depozitul e o optimizare; fișierele JSON rămân sursa pentru UI
+            log(f"Store write failed: {e}")
+        try:
+            if teams_normalize.get_table().save():
+                log(f"Team aliases saved ({len(teams_normalize.get_table())} aliases)")
+        except OSError as e:
+            log(f"Team aliases write failed: {e}")
+        # o sursă eșuată / blocată / stale (fără jocuri proaspete) -> păstrăm paginile chiar dacă nu e eșantionat
+        degraded = any(t.get("status") != "ok" or not t.get("games") or t.get("stale") for t in timings.values())
+        kept = _finish_capture(capture, degraded, run_id)
+        if kept:
+            out["_meta"]["capture"] = kept["id"]
+        write_day_file(out)
+        if write_latest:
+            snapshot.write(os.path.join(WEB_DATA, "merged.json"), out)
+        # durata scrierii apare doar în rezultatul returnat (fișierele erau deja scrise)
+        write_s = time.monotonic() - t_write
+        metrics.STAGE_SECONDS.observe(write_s, stage="write", source="")
+        metrics.SCRAPES.inc(status="ok")
+        out["_meta"]["write"] = round(write_s, 3)
         
         log("OK: JSON written.")
         return out  # Return the data
@@ -686,15 +1456,42 @@ def main(query_date_str=None):
         # scriem eroarea în merged.json ca UI-ul să aibă ce citi
         log("ERROR: " + str(e))
         log(traceback.format_exc())
+        metrics.SCRAPES.inc(status="error")
+        _finish_capture(capture, True)
         err = {
             "date": f"{now_vienna():%Y-%m-%d}",
             "generated_at": f"{now_vienna():%Y-%m-%d %H:%M:%S}",
             "error": str(e),
             "games": [],
         }
-        with open(os.path.join(WEB_DATA, "merged.json"), "w", encoding="utf-8") as f:
-            json.dump(err, f, ensure_ascii=False, indent=2)
+        if write_latest:
+            snapshot.write(os.path.join(WEB_DATA, "merged.json"), err)
         return err  # Return the error
 
+# =========================================================
+#                     INTERVAL DE ZILE
+# =========================================================
+# intervale de zile: în scraper/days.py (le folosește și serverul web fără scraper)
+date_range = days.date_range
+combine_days = days.combine_days
+
+def main_range(from_iso: str, to_iso: str, concurrency: int = RANGE_CONCURRENCY) -> dict:
+    """
+    Scrape pentru mai multe zile, cel mult `concurrency` în paralel; ritmul real al
+    cererilor e dat de token bucket-urile per host. Fiecare zi își scrie games/<dată>.json.
+    """
+    dates = date_range(from_iso, to_iso)
+    log(f"Range scrape {dates[0]} .. {dates[-1]} ({len(dates)} days, concurrency={concurrency})")
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="day") as pool:
+        outs = list(pool.map(lambda d: main(d, write_latest=False), dates))
+    combined = combine_days(list(zip(dates, outs)))
+    log(f"Range scrape done: {combined['counters']['Total']} games")
+    return combined
+
 if __name__ == "__main__":
-    sys.exit(main())
+    # python scraper.py [YYYY-MM-DD]              -> o zi
+    # python scraper.py YYYY-MM-DD YYYY-MM-DD     -> interval (fișier per zi în games/)
+    if len(sys.argv) >= 3:
+        result = main_range(sys.argv[1], sys.argv[2])
+        sys.exit(1 if all(d["status"] == "error" for d in result["days"].values()) else 0)
+    sys.exit(1 if "error" in main() else 0)
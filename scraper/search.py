@@ -0,0 +1,180 @@
+# ======================
+# TwLive3.0 - Index inversat pentru filtrare / căutare pe server
+# - construit o dată per snapshot (când se scrie), interogat la fiecare cerere
+# - canal: vocabularul de canale -> poziții; HIGHLIGHT (DAZN, SKY SPORT, …) ca facete precalculate
+# - competiție: vocabular -> poziții
+# - text liber: token (fără diacritice, litere mici) -> poziții; un termen se caută în
+#   vocabularul de tokeni (ca în UI: "liga" găsește și "bundesliga"), nu în lista de jocuri
+# - căutarea în vocabulare nu le parcurge: fiecare sufix al unui cuvânt e o cheie într-o listă
+#   sortată, deci "conține X" = "un sufix începe cu X" = bisect + intervalul de chei cu prefixul X
+# - pozițiile sunt indexuri în lista de jocuri deja sortată (ora de start, echipe)
+# - cursorul de paginare e legat de snapshot-urile din care vine (tag = hash peste id-urile jocurilor):
+#   dacă un reload a înlocuit lista între două pagini, pozițiile nu mai înseamnă același lucru ->
+#   StaleCursor (API-ul răspunde 409, clientul reia de la prima pagină)
+# ======================
+
+import bisect, hashlib, re, unicodedata
+
+# canalele scoase în față în UI și numărate ca facete
+HIGHLIGHT = ["DAZN", "SKY SPORT", "CANAL PLUS ACTION", "CANAL + ACTION", "SPORTDIGITAL"]
+
+TOKEN_RE = re.compile(r"\w+")
+TERM_SPLIT_RE = re.compile(r"[,\s]+")
+
+
+def fold(text: str) -> str:
+    """Litere mici, fără diacritice ("Unión" -> "union")."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokens(text: str) -> list:
+    return TOKEN_RE.findall(fold(text))
+
+
+class Vocabulary:
+    """
+    {cuvânt: set(poziții)} cu căutare după subșir în O(log V + potriviri):
+    toate sufixele cuvintelor, sortate, fiecare cu reuniunea pozițiilor cuvintelor care îl au.
+    """
+
+    def __init__(self, postings: dict):
+        self.postings = postings
+        by_suffix = {}
+        for word, positions in postings.items():
+            for i in range(len(word)):
+                by_suffix.setdefault(word[i:], set()).update(positions)
+        self._keys = sorted(by_suffix)
+        self._sets = [by_suffix[k] for k in self._keys]
+
+    def find(self, needle: str) -> set:
+        """Pozițiile cuvintelor care conțin `needle`."""
+        if not needle:
+            return set().union(*self.postings.values())
+        out = set()
+        i = bisect.bisect_left(self._keys, needle)
+        while i < len(self._keys) and self._keys[i].startswith(needle):
+            out |= self._sets[i]
+            i += 1
+        return out
+
+
+class StaleCursor(ValueError):
+    """Cursorul vine dintr-un alt snapshot al zilelor cerute (între timp a fost un reload)."""
+
+
+class GameIndex:
+    """
+    Index peste jocurile unei zile.
+      channels     -> {canal (fold): set(poziții)}
+      competitions -> {competiție (fold): set(poziții)}
+      terms        -> {token: set(poziții)} din echipe, competiție, canale și surse
+      highlight    -> {cheie HIGHLIGHT: set(poziții)}; facets -> {cheie: număr}
+    """
+
+    def __init__(self, games: list, highlight=()):
+        self.games = games
+        self.channels, self.competitions, self.terms = {}, {}, {}
+        self.highlight = {h: set() for h in highlight}
+        for pos, g in enumerate(games):
+            for ch in g.get("channels") or []:
+                self.channels.setdefault(fold(ch), set()).add(pos)
+                up = (ch or "").upper()
+                for h in self.highlight:
+                    if h in up:
+                        self.highlight[h].add(pos)
+            self.competitions.setdefault(fold(g.get("competition") or ""), set()).add(pos)
+            words = [g.get("teams_display") or "", g.get("competition") or "",
+                     *(g.get("channels") or []), *(g.get("sources") or [])]
+            for tok in tokens(" ".join(words)):
+                self.terms.setdefault(tok, set()).add(pos)
+        self.facets = {h: len(p) for h, p in self.highlight.items()}
+        ids = "\n".join(g.get("id") or f"{g.get('time_local')}|{g.get('teams_display')}" for g in games)
+        self.tag = hashlib.sha1(ids.encode("utf-8")).hexdigest()[:10]
+        self._channel_vocab = Vocabulary(self.channels)
+        self._competition_vocab = Vocabulary(self.competitions)
+        self._term_vocab = Vocabulary(self.terms)
+
+    # ---------- potriviri ----------
+    def _channel(self, value: str) -> set:
+        key = value.strip().upper()
+        if key in self.highlight:
+            return self.highlight[key]
+        return self._channel_vocab.find(fold(value.strip()))
+
+    def _competition(self, value: str) -> set:
+        return self._competition_vocab.find(fold(value.strip()))
+
+    def _term(self, term: str) -> set:
+        return self._term_vocab.find(term)
+
+    def match(self, channel: str | None = None, competition: str | None = None, q: str | None = None) -> list:
+        """Pozițiile (sortate) care trec toate filtrele date; fără filtre -> toate."""
+        result = None
+
+        def narrow(found):
+            nonlocal result
+            result = set(found) if result is None else result & found
+
+        if channel:
+            narrow(self._channel(channel))
+        if competition:
+            narrow(self._competition(competition))
+        for term in TERM_SPLIT_RE.split(q or ""):
+            # un termen ca "sky-sport" devine mai mulți tokeni, toți obligatorii
+            for tok in tokens(term):
+                narrow(self._term(tok))
+                if not result:
+                    return []
+        if result is None:
+            return list(range(len(self.games)))
+        return sorted(result)
+
+
+def encode_cursor(date_iso: str, pos: int, tag: str) -> str:
+    return f"{date_iso}:{pos}:{tag}"
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """'YYYY-MM-DD:N:tag' -> (date, N, tag); ValueError dacă nu are forma asta."""
+    rest, _, tag = (cursor or "").rpartition(":")
+    date_iso, _, pos = rest.rpartition(":")
+    if len(date_iso) != 10 or not pos.isdigit() or not tag.isalnum():
+        raise ValueError("invalid cursor")
+    return date_iso, int(pos), tag
+
+
+def snapshot_tag(indexes: list) -> str:
+    """Tag-ul setului de zile [(date_iso, GameIndex), ...] așa cum arată acum."""
+    raw = "|".join(f"{d}={index.tag}" for d, index in indexes)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:10]
+
+
+def query(indexes: list, channel=None, competition=None, q=None, limit=None, cursor=None) -> dict:
+    """
+    Filtrează mai multe zile [(date_iso, GameIndex), ...] (în ordinea datelor).
+    Returnează {"games", "total", "next_cursor", "facets"}; `cursor` vine din next_cursor.
+    StaleCursor dacă `cursor` e dintr-un snapshot mai vechi al zilelor.
+    """
+    tag = snapshot_tag(indexes)
+    after = None
+    if cursor:
+        *after, cursor_tag = decode_cursor(cursor)
+        if cursor_tag != tag:
+            raise StaleCursor("results changed since this cursor was issued; start again without it")
+        after = tuple(after)
+    games, total, next_cursor = [], 0, None
+    facets = {}
+    for date_iso, index in indexes:
+        for h, n in index.facets.items():
+            facets[h] = facets.get(h, 0) + n
+        for pos in index.match(channel, competition, q):
+            total += 1
+            if after is not None and (date_iso, pos) < after:
+                continue
+            if limit is not None and len(games) >= limit:
+                if next_cursor is None:
+                    next_cursor = encode_cursor(date_iso, pos, tag)
+                continue
+            games.append(index.games[pos])
+    return {"games": games, "total": total, "next_cursor": next_cursor, "facets": {"highlight": facets}}
@@ -0,0 +1,112 @@
+# ======================
+# TwLive3.0 - Snapshot-uri JSON gata de servit
+# - JSON compact (fără indent) -> ~jumătate din bytes
+# - ETag puternic (sha1 peste bytes) calculat o singură dată, la scriere
+# - variantele gzip / brotli generate tot la scriere (brotli doar dacă e instalat)
+# - scriere atomică: tmp + os.replace, cititorii nu văd fișiere pe jumătate
+# ======================
+
+import os, json, gzip, hashlib, tempfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+# sufixele fișierelor alăturate: merged.json.gz, merged.json.br, merged.json.etag
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+ETAG_SUFFIX = ".etag"
+
+
+def encode(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+class Snapshot:
+    """
+    Un răspuns JSON pregătit: bytes, ETag și variantele comprimate.
+    variants: {"gzip": bytes, "br": bytes} (br lipsește fără modulul brotli)
+    """
+    __slots__ = ("body", "etag", "variants")
+
+    def __init__(self, body: bytes, etag: str | None = None, variants: dict | None = None):
+        self.body = body
+        self.etag = etag or make_etag(body)
+        self.variants = variants if variants is not None else compress(body)
+
+    @classmethod
+    def of(cls, obj) -> "Snapshot":
+        return cls(encode(obj))
+
+
+def compress(body: bytes) -> dict:
+    out = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        out["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return out
+
+
+def _atomic_write(path: str, data: bytes):
+    # tmp unic și între thread-urile aceluiași proces (două reload-uri scriu merged.json deodată)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)   # mkstemp creează 0600; fișierele sunt servite și de alte procese
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write(path: str, obj) -> Snapshot:
+    """
+    Scrie `obj` ca JSON compact în `path`, plus path.gz / path.br și path.etag.
+    ETag-ul e scris ultimul: cine îl citește găsește deja variantele lui.
+    """
+    snap = Snapshot.of(obj)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    for enc, suffix in SUFFIXES.items():
+        if enc in snap.variants:
+            _atomic_write(path + suffix, snap.variants[enc])
+        elif os.path.exists(path + suffix):
+            os.remove(path + suffix)   # variantă veche, ar avea alt conținut
+    _atomic_write(path, snap.body)
+    _atomic_write(path + ETAG_SUFFIX, snap.etag.encode("ascii"))
+    return snap
+
+
+def load(path: str) -> Snapshot:
+    """
+    Citește un snapshot scris cu write(). Pentru fișiere vechi (fără .etag)
+    ETag-ul și variantele se calculează acum, o dată.
+    """
+    with open(path, "rb") as f:
+        body = f.read()
+    try:
+        with open(path + ETAG_SUFFIX, "r", encoding="ascii") as f:
+            etag = f.read().strip()
+    except OSError:
+        etag = None
+    if not etag or etag != make_etag(body):
+        # lipsă sau din altă scriere (fișierul a fost înlocuit între timp) -> refacem
+        return Snapshot(body)
+    variants = {}
+    for enc, suffix in SUFFIXES.items():
+        try:
+            with open(path + suffix, "rb") as f:
+                variants[enc] = f.read()
+        except OSError:
+            pass
+    if "gzip" not in variants:
+        variants = compress(body)
+    return Snapshot(body, etag, variants)
@@ -0,0 +1,234 @@
+# ======================
+# TwLive3.0 - Surse de program (adaptoare) + registru
+# - SourceAdapter: interfața unei surse: fetch (pagina brută), parse (jocuri), health (starea ei)
+#     fetch(d, deadline=, stats=, capture=) -> net.FetchedPage | None
+#     parse(body, date_iso, stats=) -> [game]; game = {"source", "time_local", "time_display",
+#                                                     "home", "away", "teams_display", "competition", "channels"}
+# - FunctionSource: adaptor peste o pereche de funcții existente (LiveOnSat, SportEventz)
+# - SourceRegistry: sursele înregistrate, în ordinea înregistrării (ordinea implicită la merge);
+#   run_all() rulează câte un task per sursă în paralel, fiecare cu termenul ei
+# - o sursă nouă = un adaptor + REGISTRY.register(...); merge-ul (scraper.merge_sources)
+#   lucrează cu oricâte surse
+# - CircuitBreaker per sursă: closed -> (BREAKER_FAILURES eșecuri la rând) open -> (după
+#   BREAKER_OPEN s) half_open: o singură încercare; succes -> closed, eșec -> open din nou,
+#   cu pauza dublată (cel mult BREAKER_MAX_OPEN s). Cât e open, sursa nu mai e cerută deloc.
+# ======================
+
+import os, threading, time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+
+
+BREAKER_FAILURES = int(os.environ.get("TWLIVE_BREAKER_FAILURES", "3"))      # eșecuri la rând până la open
+BREAKER_OPEN = float(os.environ.get("TWLIVE_BREAKER_OPEN", "300"))          # secunde în open, prima dată
+BREAKER_MAX_OPEN = float(os.environ.get("TWLIVE_BREAKER_MAX_OPEN", "3600"))  # plafonul pauzei dublate
+
+
+class CircuitBreaker:
+    """
+    Starea de sănătate a unei surse. Timpul e de perete (time.time), ca starea salvată
+    (snapshot / restore) să fie valabilă și în alt proces.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failures: int = BREAKER_FAILURES, open_s: float = BREAKER_OPEN,
+                 max_open_s: float = BREAKER_MAX_OPEN, clock=time.time):
+        self.threshold = max(1, failures)
+        self.open_s, self.max_open_s = open_s, max(open_s, max_open_s)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0        # eșecuri la rând
+        self.trips = 0           # deschideri la rând (pentru pauza dublată)
+        self.open_until = 0.0
+        self.updated = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """True dacă sursa poate fi cerută acum; în half_open lasă o singură încercare."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self._clock() < self.open_until:
+                    return False
+                self.state, self.updated = self.HALF_OPEN, self._clock()
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def success(self):
+        with self._lock:
+            self.state, self.failures, self.trips, self._probing = self.CLOSED, 0, 0, False
+            self.open_until, self.updated = 0.0, self._clock()
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.trips += 1
+                pause = min(self.max_open_s, self.open_s * 2 ** (self.trips - 1))
+                self.state, self.open_until = self.OPEN, self._clock() + pause
+            self.updated = self._clock()
+
+    def retry_in(self) -> float:
+        """Secunde până la următoarea încercare (0 dacă sursa poate fi cerută)."""
+        with self._lock:
+            return max(0.0, self.open_until - self._clock()) if self.state == self.OPEN else 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "trips": self.trips,
+                    "open_until": self.open_until, "updated": self.updated}
+
+    def restore(self, data: dict) -> bool:
+        """Preia o stare salvată (de alt worker / altă rulare) dacă e mai nouă decât a noastră."""
+        with self._lock:
+            if not data or data.get("updated", 0) <= self.updated:
+                return False
+            self.state = data.get("state", self.CLOSED)
+            if self.state == self.HALF_OPEN:
+                # încercarea celuilalt proces nu s-a terminat (sau a murit): o reluăm noi
+                self.state = self.OPEN
+            self.failures = int(data.get("failures", 0))
+            self.trips = int(data.get("trips", 0))
+            self.open_until = float(data.get("open_until", 0.0))
+            self.updated = float(data["updated"])
+            self._probing = False
+            return True
+
+
+class SourceAdapter:
+    """Baza unei surse; subclasele definesc name, deadline, fetch() și parse()."""
+
+    name = ""
+    deadline = 60.0   # secunde pentru fetch + parse, din momentul pornirii scrape-ului
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.breaker = CircuitBreaker()
+        self._health = {"status": None, "last_ok": None, "last_error": None, "error": None,
+                        "failures": 0, "runs": 0, "games": 0, "elapsed": None}
+
+    def fetch(self, d, deadline=None, stats=None, capture=None):
+        raise NotImplementedError
+
+    def parse(self, body, date_iso: str, stats=None) -> list:
+        raise NotImplementedError
+
+    # ---------- health ----------
+    def record(self, status: str, games: int = 0, elapsed: float | None = None, error: str | None = None):
+        """
+        Rezultatul unei rulări: ok / error / timeout / blocked, sau open (sărită de breaker,
+        nu contează nici ca succes, nici ca eșec).
+        """
+        now = time.time()
+        with self._lock:
+            h = self._health
+            h["status"] = status
+            if status != "open":
+                h["runs"] += 1
+                h["elapsed"] = elapsed
+                if status == "ok":
+                    h.update(last_ok=now, failures=0, games=games, error=None)
+                else:
+                    h.update(last_error=now, error=error or status)
+                    h["failures"] += 1
+        if status == "ok":
+            self.breaker.success()
+        elif status != "open":
+            self.breaker.failure()
+
+    def health(self) -> dict:
+        """Starea sursei: ultima rulare, eșecuri consecutive, ultimul succes / ultima eroare, breaker."""
+        with self._lock:
+            h = dict(self._health)
+        b = self.breaker.snapshot()
+        return {"name": self.name, "deadline": self.deadline, **h,
+                "breaker": b["state"], "retry_in": round(self.breaker.retry_in(), 1)}
+
+
+class FunctionSource(SourceAdapter):
+    """Adaptor peste funcții: fetch(d, deadline=, stats=, capture=) și parse(body, date_iso, stats=)."""
+
+    def __init__(self, name: str, fetch, parse, deadline: float = 60.0):
+        super().__init__()
+        self.name, self.deadline = name, deadline
+        self._fetch, self._parse = fetch, parse
+
+    def fetch(self, d, deadline=None, stats=None, capture=None):
+        return self._fetch(d, deadline=deadline, stats=stats, capture=capture)
+
+    def parse(self, body, date_iso: str, stats=None) -> list:
+        return self._parse(body, date_iso, stats=stats)
+
+
+class SourceRegistry:
+    def __init__(self):
+        self._adapters = {}
+        self._lock = threading.Lock()
+
+    def register(self, adapter: SourceAdapter) -> SourceAdapter:
+        """Adaugă (sau înlocuiește, după nume) o sursă."""
+        if not adapter.name:
+            raise ValueError("source adapter without a name")
+        with self._lock:
+            self._adapters[adapter.name] = adapter
+        return adapter
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._adapters.pop(name, None)
+
+    def get(self, name: str) -> SourceAdapter | None:
+        with self._lock:
+            return self._adapters.get(name)
+
+    def adapters(self) -> list:
+        with self._lock:
+            return list(self._adapters.values())
+
+    def names(self) -> list:
+        return [a.name for a in self.adapters()]
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._adapters)
+
+    def health(self) -> dict:
+        return {a.name: a.health() for a in self.adapters()}
+
+    def run_all(self, task, start: float | None = None) -> dict:
+        """
+        task(adapter) pentru fiecare sursă, în paralel; fiecare rezultat e așteptat cel mult
+        până la start + adapter.deadline. Returnează {nume: (stare, valoare)}, cu stare
+        "ok" (valoarea task-ului), "timeout" (None) sau "error" (excepția).
+        """
+        adapters = self.adapters()
+        start = time.monotonic() if start is None else start
+        results = {}
+        if not adapters:
+            return results
+        pool = ThreadPoolExecutor(max_workers=len(adapters), thread_name_prefix="source")
+        futures = {a.name: (a, pool.submit(task, a)) for a in adapters}
+        try:
+            for name, (a, fut) in futures.items():
+                try:
+                    results[name] = ("ok", fut.result(timeout=max(0.0, start + a.deadline - time.monotonic())))
+                except FuturesTimeout:
+                    results[name] = ("timeout", None)
+                except Exception as e:
+                    results[name] = ("error", e)
+        finally:
+            # nu așteptăm thread-urile rămase după termen (ex. Selenium blocat)
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
+
+REGISTRY = SourceRegistry()
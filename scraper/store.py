@@ -0,0 +1,218 @@
+# ======================
+# TwLive3.0 - Depozit SQLite pentru snapshot-uri
+# - un "run" per scrape și dată; jocurile ca rânduri (+ canalele într-un tabel separat)
+# - fiecare run e scris într-o singură tranzacție: cititorii văd run-ul vechi sau pe cel nou
+# - indexuri pe dată, oră de start, canal și competiție
+# - păstrăm ultimele RUNS_PER_DATE run-uri per dată (istoric)
+# - per sursă: ultimele jocuri bune per dată (last-known-good, cel mult LKG_DAYS zile)
+#   și starea circuit breaker-ului (comună workerilor și rulărilor)
+# ======================
+
+import os, json, sqlite3, threading, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.environ.get("TWLIVE_DB", os.path.join(ROOT, "data", "twlive.db"))
+RUNS_PER_DATE = int(os.environ.get("TWLIVE_STORE_RUNS", "20"))
+LKG_DAYS = float(os.environ.get("TWLIVE_LKG_DAYS", "14"))   # cât de vechi pot fi jocurile last-known-good
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    date         TEXT NOT NULL,
+    generated_at TEXT,
+    created      REAL NOT NULL,
+    head         TEXT NOT NULL          -- restul snapshot-ului (counters, timezone, _meta) ca JSON
+);
+CREATE INDEX IF NOT EXISTS runs_date ON runs(date, id);
+
+CREATE TABLE IF NOT EXISTS latest (
+    date   TEXT PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id)
+);
+
+CREATE TABLE IF NOT EXISTS games (
+    run_id      INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    pos         INTEGER NOT NULL,
+    date        TEXT NOT NULL,
+    game_id     TEXT,
+    kickoff     TEXT,
+    teams       TEXT,
+    competition TEXT,
+    data        TEXT NOT NULL,
+    PRIMARY KEY (run_id, pos)
+);
+CREATE INDEX IF NOT EXISTS games_date_kickoff ON games(date, kickoff);
+CREATE INDEX IF NOT EXISTS games_competition ON games(competition);
+
+CREATE TABLE IF NOT EXISTS game_channels (
+    run_id  INTEGER NOT NULL,
+    pos     INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    FOREIGN KEY (run_id, pos) REFERENCES games(run_id, pos) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS game_channels_channel ON game_channels(channel, run_id);
+CREATE INDEX IF NOT EXISTS game_channels_game ON game_channels(run_id, pos);
+
+CREATE TABLE IF NOT EXISTS source_games (
+    source  TEXT NOT NULL,
+    date    TEXT NOT NULL,
+    fetched REAL NOT NULL,
+    games   TEXT NOT NULL,              -- jocurile parsate ale sursei, ca JSON
+    PRIMARY KEY (source, date)
+);
+
+CREATE TABLE IF NOT EXISTS source_health (
+    source  TEXT PRIMARY KEY,
+    updated REAL NOT NULL,
+    state   TEXT NOT NULL               -- CircuitBreaker.snapshot() ca JSON
+);
+"""
+
+
+class SnapshotStore:
+    """
+    Snapshot-urile scraper-ului în SQLite (WAL: cititorii nu blochează scrierea).
+    O conexiune per thread; scrierile sunt serializate cu un lock.
+    """
+
+    def __init__(self, path: str = DB_PATH, runs_per_date: int = RUNS_PER_DATE):
+        self.path = path
+        self.runs_per_date = max(1, runs_per_date)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._conn() as con:
+            con.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=30)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute("PRAGMA foreign_keys=ON")
+            self._local.con = con
+        return con
+
+    # ---------- scriere ----------
+    def save(self, out: dict) -> int:
+        """Salvează snapshot-ul unei zile ca run nou și îl face curent; returnează id-ul run-ului."""
+        date_iso = out["date"]
+        head = {k: v for k, v in out.items() if k not in ("games", "date", "generated_at")}
+        games = out.get("games", [])
+        with self._write_lock:
+            con = self._conn()
+            with con:   # o singură tranzacție: run + jocuri + canale + pointerul "latest"
+                run_id = con.execute(
+                    "INSERT INTO runs(date, generated_at, created, head) VALUES (?, ?, ?, ?)",
+                    (date_iso, out.get("generated_at"), time.time(), json.dumps(head, ensure_ascii=False)),
+                ).lastrowid
+                con.executemany(
+                    "INSERT INTO games(run_id, pos, date, game_id, kickoff, teams, competition, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, pos, date_iso, g.get("id"), g.get("time_local"), g.get("teams_display"),
+                      g.get("competition"), json.dumps(g, ensure_ascii=False))
+                     for pos, g in enumerate(games)],
+                )
+                con.executemany(
+                    "INSERT INTO game_channels(run_id, pos, channel) VALUES (?, ?, ?)",
+                    [(run_id, pos, ch) for pos, g in enumerate(games) for ch in dict.fromkeys(g.get("channels") or [])],
+                )
+                con.execute("INSERT OR REPLACE INTO latest(date, run_id) VALUES (?, ?)", (date_iso, run_id))
+                self._prune(con, date_iso)
+        return run_id
+
+    def _prune(self, con, date_iso: str):
+        old = [r[0] for r in con.execute(
+            "SELECT id FROM runs WHERE date = ? ORDER BY id DESC LIMIT -1 OFFSET ?",
+            (date_iso, self.runs_per_date))]
+        if old:
+            marks = ",".join("?" * len(old))
+            con.execute(f"DELETE FROM game_channels WHERE run_id IN ({marks})", old)
+            con.execute(f"DELETE FROM games WHERE run_id IN ({marks})", old)
+            con.execute(f"DELETE FROM runs WHERE id IN ({marks})", old)
+
+    # ---------- per sursă ----------
+    def save_source_games(self, source: str, date_iso: str, games: list):
+        """Ultimele jocuri bune ale unei surse pentru o dată (înlocuiesc ce era)."""
+        now = time.time()
+        with self._write_lock:
+            con = self._conn()
+            with con:
+                con.execute("INSERT OR REPLACE INTO source_games(source, date, fetched, games) VALUES (?, ?, ?, ?)",
+                            (source, date_iso, now, json.dumps(games, ensure_ascii=False)))
+                con.execute("DELETE FROM source_games WHERE fetched < ?", (now - LKG_DAYS * 86400,))
+
+    def load_source_games(self, source: str, date_iso: str) -> tuple | None:
+        """(jocuri, momentul fetch-ului) sau None dacă nu avem nimic destul de recent."""
+        row = self._conn().execute(
+            "SELECT games, fetched FROM source_games WHERE source = ? AND date = ? AND fetched >= ?",
+            (source, date_iso, time.time() - LKG_DAYS * 86400)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def save_breaker(self, source: str, state: dict):
+        with self._write_lock:
+            con = self._conn()
+            with con:
+                con.execute("INSERT OR REPLACE INTO source_health(source, updated, state) VALUES (?, ?, ?)",
+                            (source, state.get("updated", time.time()), json.dumps(state)))
+
+    def load_breakers(self) -> dict:
+        """{sursă: stare salvată a breaker-ului}."""
+        return {src: json.loads(st) for src, st in self._conn().execute("SELECT source, state FROM source_health")}
+
+    # ---------- citire ----------
+    def latest_run(self, date_iso: str) -> dict | None:
+        """{"id", "created", "generated_at"} pentru run-ul curent al datei (sau None)."""
+        row = self._conn().execute(
+            "SELECT r.id, r.created, r.generated_at FROM latest l JOIN runs r ON r.id = l.run_id"
+            " WHERE l.date = ?", (date_iso,)).fetchone()
+        return dict(zip(("id", "created", "generated_at"), row)) if row else None
+
+    def load(self, date_iso: str, run_id: int | None = None) -> dict | None:
+        """Snapshot-ul complet (aceeași formă ca rezultatul scraper.main) sau None."""
+        con = self._conn()
+        if run_id is None:
+            run = self.latest_run(date_iso)
+            if run is None:
+                return None
+            run_id = run["id"]
+        row = con.execute("SELECT date, generated_at, head FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        out = {"date": row[0], "generated_at": row[1], **json.loads(row[2])}
+        out["games"] = [json.loads(d) for (d,) in con.execute(
+            "SELECT data FROM games WHERE run_id = ? ORDER BY pos", (run_id,))]
+        return out
+
+    def runs(self, date_iso: str) -> list:
+        """Istoricul run-urilor unei date, cel mai nou primul."""
+        return [dict(zip(("id", "created", "generated_at", "games"), r)) for r in self._conn().execute(
+            "SELECT r.id, r.created, r.generated_at, (SELECT COUNT(*) FROM games g WHERE g.run_id = r.id)"
+            " FROM runs r WHERE r.date = ? ORDER BY r.id DESC", (date_iso,))]
+
+    def dates(self) -> list:
+        return [d for (d,) in self._conn().execute("SELECT date FROM latest ORDER BY date")]
+
+    def games_on_channel(self, channel: str, date_iso: str | None = None) -> list:
+        """Jocurile curente care au canalul dat (opțional doar pentru o dată)."""
+        sql = ("SELECT g.data FROM game_channels c JOIN latest l ON l.run_id = c.run_id"
+               " JOIN games g ON g.run_id = c.run_id AND g.pos = c.pos WHERE c.channel = ?")
+        args = [channel]
+        if date_iso:
+            sql += " AND l.date = ?"
+            args.append(date_iso)
+        return [json.loads(d) for (d,) in self._conn().execute(sql + " ORDER BY g.date, g.kickoff", args)]
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> SnapshotStore:
+    """Depozitul comun al procesului (creat la prima utilizare)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = SnapshotStore()
+        return _STORE
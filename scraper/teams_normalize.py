@@ -0,0 +1,274 @@
+# ======================
+# TwLive3.0 - Normalizare nume de echipe
+# - clean(): numele curățat pentru fuzzy (semne, stopwords, vs/v/-), memoizat
+# - canonical(): id canonic = numele curățat, fără diacritice, trecut prin tabela de alias-uri;
+#   memoizat cu LRU (aceleași cluburi apar la fiecare scrape)
+# - tabela de alias-uri: data/team_aliases.json, editabilă de mână (scraper-ul doar o citește)
+#     {"aliases": {"milan": ["mailand"], ...}}
+#   se învață din merge-uri sigure: o pereche e promovată după LEARN_MIN_SEEN potriviri
+#   cu scor >= LEARN_MIN_SCORE per echipă (nu pentru echipe de rezervă / tineret)
+# - ce se învață stă în data/team_aliases.learned.json (runtime, neversionat), același format
+#   plus "pending": {"a|b": 2, ...}; save() îl recitește și îl unește sub un lock de fișier,
+#   ca workerii executorului să nu-și șteargă unul altuia alias-urile / numărătorile
+# - un fișier corupt e o eroare (ValueError), nu o tabelă goală care ar fi apoi suprascrisă
+# - merge-ul compară întâi id-urile canonice; fuzzy doar pentru ce tabela nu rezolvă
+# ======================
+
+import json, os, re, threading, unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALIASES_PATH = os.environ.get("TWLIVE_ALIASES", os.path.join(ROOT, "data", "team_aliases.json"))
+LEARNED_PATH = os.environ.get("TWLIVE_ALIASES_LEARNED", os.path.join(ROOT, "data", "team_aliases.learned.json"))
+CACHE_SIZE = int(os.environ.get("TWLIVE_NAME_CACHE", "8192"))
+
+STOPWORDS = set("fc cf afc sc ac fk sv cd aek csm club calcio de la el los the".split())
+LEARN_MIN_SCORE = 90   # scor fuzzy minim per echipă ca o pereche să conteze
+LEARN_MIN_SEEN = 3     # de câte ori trebuie văzută perechea până devine alias
+# un token din astea într-un singur nume = altă echipă (II, B, U19, feminin…), nu alt nume
+SQUAD_TOKENS = set("ii iii b c u17 u18 u19 u20 u21 u23 w women femenino feminine frauen reserves youth".split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean(name: str) -> str:
+    """Normalizează pentru fuzzy-match: scoate semne, stopwords, vs/v/- etc."""
+    s = re.sub(r"[^\w\s\-']", " ", name or "", flags=re.I).lower()
+    s = re.sub(r"\b(vs?|versus)\b", " ", s)
+    s = re.sub(r"[-:]", " ", s)
+    toks = [t for t in re.split(r"\s+", s) if t and t not in STOPWORDS]
+    return " ".join(toks)
+
+
+def fold(text: str) -> str:
+    """Fără diacritice ("unión" -> "union")."""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def key(name: str) -> str:
+    """Cheia din tabela de alias-uri: numele curățat, fără diacritice."""
+    return fold(clean(name))
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Lock exclusiv între procese pe `path` (fișier separat, nu cel înlocuit cu os.replace)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_json(path: str) -> dict:
+    """Conținutul unui fișier de alias-uri; {} dacă lipsește, ValueError dacă e corupt."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        raise ValueError(f"Corrupt alias file {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Corrupt alias file {path}: expected an object")
+    return data
+
+
+class AliasTable:
+    """
+    Alias (cheie) -> id canonic, plus perechile încă în observație.
+    Alias-urile de mână vin din `path`; cele învățate (și pending) din / în `learned_path`.
+    """
+
+    def __init__(self, path: str = ALIASES_PATH, learned_path: str = LEARNED_PATH):
+        self.path = path
+        self.learned_path = learned_path
+        self._lock = threading.Lock()
+        self._alias = {}      # cheie alias -> id canonic
+        self._groups = {}     # id canonic -> [alias-uri], ca în fișier
+        self._learned = {}    # alias -> id canonic, partea din learned_path (+ ce am învățat noi)
+        self._pending = {}    # "a|b" -> de câte ori am văzut perechea (toți workerii, la ultimul load/save)
+        self._seen = {}       # "a|b" -> de câte ori am văzut-o noi de la ultimul load/save
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        manual, learned = _read_json(self.path), _read_json(self.learned_path)
+        with self._lock:
+            self._apply(manual, learned)
+            self._seen, self._dirty = {}, False
+        canonical.cache_clear()
+
+    def _apply(self, manual: dict, learned: dict):
+        """Reface tabela din fișiere: întâi alias-urile de mână (au prioritate), apoi cele învățate."""
+        self._alias, self._groups, self._learned = {}, {}, {}
+        for canon, aliases in (manual.get("aliases") or {}).items():
+            canon = key(canon)
+            for a in aliases or []:
+                self._add(key(a), canon)
+        for canon, aliases in (learned.get("aliases") or {}).items():
+            for a in aliases or []:
+                if self._add(a, self._alias.get(canon, canon)):
+                    self._learned[a] = self._alias[a]
+        self._pending = {k: int(v) for k, v in (learned.get("pending") or {}).items()}
+
+    def _add(self, alias: str, canon: str):
+        if not alias or not canon or alias == canon or alias in self._alias:
+            return False
+        self._alias[alias] = canon
+        self._groups.setdefault(canon, []).append(alias)
+        return True
+
+    def resolve(self, k: str) -> str:
+        with self._lock:
+            return self._alias.get(k, k)
+
+    def add(self, alias: str, canon: str) -> bool:
+        """Alias adăugat din cod (nume brute), salvat cu cele învățate; False dacă e deja în tabelă."""
+        with self._lock:
+            ka = key(alias)
+            added = self._add(ka, self._alias.get(key(canon), key(canon)))
+            if added:
+                self._learned[ka] = self._alias[ka]
+            self._dirty |= added
+        if added:
+            canonical.cache_clear()
+        return added
+
+    def learn(self, a: str, b: str, score: float) -> bool:
+        """
+        O potrivire sigură între numele brute a și b (scor fuzzy per echipă).
+        Returnează True dacă perechea tocmai a devenit alias.
+        """
+        ka, kb = key(a), key(b)
+        if score < LEARN_MIN_SCORE or not ka or not kb or ka == kb:
+            return False
+        if (set(ka.split()) ^ set(kb.split())) & SQUAD_TOKENS:
+            return False
+        with self._lock:
+            ca, cb = self._alias.get(ka, ka), self._alias.get(kb, kb)
+            if ca == cb:
+                return False
+            if ca != ka and cb != kb:
+                return False   # ambele au deja alt id canonic: decide omul, nu merge-ul
+            pair = "|".join(sorted((ka, kb)))
+            self._seen[pair] = self._seen.get(pair, 0) + 1
+            self._dirty = True
+            if self._pending.get(pair, 0) + self._seen[pair] < LEARN_MIN_SEEN:
+                return False
+            self._promote(ka, kb)
+        canonical.cache_clear()
+        return True
+
+    def _promote(self, ka: str, kb: str) -> bool:
+        """Perechea devine alias: cel fără id devine alias al celuilalt; altfel numele mai scurt e id-ul."""
+        ca, cb = self._alias.get(ka, ka), self._alias.get(kb, kb)
+        if ca == cb or (ca != ka and cb != kb):
+            return False
+        if ca != ka:
+            alias, canon = kb, ca
+        elif cb != kb:
+            alias, canon = ka, cb
+        else:
+            canon, alias = sorted((ka, kb), key=lambda k: (len(k), k))
+        if self._add(alias, canon):
+            self._learned[alias] = canon
+            return True
+        return False
+
+    def save(self) -> bool:
+        """
+        Scrie partea învățată (atomic) doar dacă s-a schimbat. Sub lock-ul fișierului recitim ce au
+        salvat ceilalți workeri și unim: alias-urile lor + ale noastre, numărătorile adunate.
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+        with _file_lock(self.learned_path + ".lock"):
+            manual, disk = _read_json(self.path), _read_json(self.learned_path)
+            with self._lock:
+                learned, seen = dict(self._learned), dict(self._seen)
+                self._apply(manual, disk)
+                for alias, canon in learned.items():
+                    if self._add(alias, self._alias.get(canon, canon)):
+                        self._learned[alias] = self._alias[alias]
+                for pair, n in seen.items():
+                    n += self._pending.get(pair, 0)
+                    ka, kb = pair.split("|", 1)
+                    if self._alias.get(ka, ka) == self._alias.get(kb, kb):
+                        self._pending.pop(pair, None)      # promovată (de noi sau de alt worker)
+                    elif n >= LEARN_MIN_SEEN and self._promote(ka, kb):
+                        self._pending.pop(pair, None)
+                    else:
+                        self._pending[pair] = n
+                groups = {}
+                for alias, canon in self._learned.items():
+                    groups.setdefault(canon, []).append(alias)
+                data = {"aliases": {c: sorted(a) for c, a in sorted(groups.items())},
+                        "pending": dict(sorted(self._pending.items()))}
+                self._seen, self._dirty = {}, False
+            tmp = f"{self.learned_path}.tmp{os.getpid()}"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.learned_path)
+        canonical.cache_clear()
+        return True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._alias)
+
+
+_TABLE = None
+_TABLE_LOCK = threading.Lock()
+
+
+def get_table() -> AliasTable:
+    """Tabela procesului (încărcată la primul apel)."""
+    global _TABLE
+    with _TABLE_LOCK:
+        if _TABLE is None:
+            _TABLE = AliasTable()
+        return _TABLE
+
+
+def set_table(table: AliasTable):
+    """Înlocuiește tabela procesului (bench, rulări izolate)."""
+    global _TABLE
+    with _TABLE_LOCK:
+        _TABLE = table
+    canonical.cache_clear()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical(name: str) -> str:
+    """Id-ul canonic al unui nume brut; nume necunoscute -> cheia lor (curățată, fără diacritice)."""
+    return get_table().resolve(key(name))
+
+
+def same_team(a: str, b: str) -> bool:
+    """Potrivire exactă prin id-ul canonic (fără fuzzy)."""
+    return canonical(a) == canonical(b)
+
+
+def cache_stats() -> dict:
+    c, k = canonical.cache_info(), clean.cache_info()
+    return {"canonical": {"hits": c.hits, "misses": c.misses, "size": c.currsize},
+            "clean": {"hits": k.hits, "misses": k.misses, "size": k.currsize}}
@@ -0,0 +1,61 @@
+from scraper.changes import ChangeFeed
+
+
+def game(i, text="x"):
+    return {"id": f"g{i}", "hash": f"{i}-{text}", "teams_display": text}
+
+
+def test_unknown_date_is_an_empty_reset():
+    out = ChangeFeed().since("2025-08-29", 123)
+    assert out == {"date": "2025-08-29", "version": 0, "reset": True, "games": []}
+
+
+def test_missing_or_unknown_version_gets_snapshot():
+    feed = ChangeFeed()
+    feed.record("d", [game(1), game(2)])
+    for since in (None, 0, 1):
+        out = feed.since("d", since)
+        assert out["reset"] is True
+        assert sorted(g["id"] for g in out["games"]) == ["g1", "g2"]
+
+
+def test_current_version_is_empty_delta():
+    feed = ChangeFeed()
+    v = feed.record("d", [game(1)])
+    assert feed.since("d", v) == {"date": "d", "version": v, "reset": False,
+                                  "added": [], "removed": [], "changed": []}
+
+
+def test_unchanged_snapshot_keeps_version():
+    feed = ChangeFeed()
+    v = feed.record("d", [game(1)])
+    assert feed.record("d", [game(1)]) == v
+
+
+def test_delta_collapses_several_versions():
+    feed = ChangeFeed()
+    v1 = feed.record("d", [game(1), game(2), game(3)])
+    feed.record("d", [game(1, "y"), game(2), game(4)])   # 1 changed, 3 removed, 4 added
+    v3 = feed.record("d", [game(1, "y"), game(4), game(5)])  # 2 removed, 5 added
+    out = feed.since("d", v1)
+    assert out["version"] == v3 and out["reset"] is False
+    assert sorted(g["id"] for g in out["added"]) == ["g4", "g5"]
+    assert sorted(out["removed"]) == ["g2", "g3"]
+    assert [g["id"] for g in out["changed"]] == ["g1"]
+
+
+def test_added_then_removed_is_not_reported():
+    feed = ChangeFeed()
+    v1 = feed.record("d", [game(1)])
+    feed.record("d", [game(1), game(2)])
+    feed.record("d", [game(1)])
+    out = feed.since("d", v1)
+    assert out["added"] == [] and out["removed"] == [] and out["changed"] == []
+
+
+def test_version_older_than_history_resets():
+    feed = ChangeFeed(history=2)
+    v1 = feed.record("d", [game(1)])
+    for i in range(2, 5):
+        feed.record("d", [game(i)])
+    assert feed.since("d", v1)["reset"] is True
@@ -0,0 +1,56 @@
+# Merge-ul peste capturile reale din web/data/ (aceleași ca în bench/bench.py):
+# numărul de jocuri și id-urile rezultatului final trebuie să rămână cele din tests/data.
+import json, os
+
+import pytest
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "merge_2025-08-29.json")
+
+
+@pytest.fixture(scope="module")
+def expected():
+    with open(DATA, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def parsed(expected, tmp_path_factory):
+    from bs4 import BeautifulSoup
+
+    import scraper.scraper as scraper
+    import synthetic
+    from scraper import teams_normalize
+
+    tmp = tmp_path_factory.mktemp("merge")
+    old_web, old_table = scraper.WEB_DATA, teams_normalize.get_table()
+    scraper.WEB_DATA = str(tmp)   # reload.log al testului, nu cel din web/data
+    # alias-urile de mână din repo; ce învață merge-ul nu ajunge în data/
+    teams_normalize.set_table(teams_normalize.AliasTable(teams_normalize.ALIASES_PATH,
+                                                         str(tmp / "aliases.learned.json")))
+    try:
+        los = scraper.parse_liveonsat_stream(synthetic.load_fixture(synthetic.LOS_FIXTURE), expected["date"])
+        se = scraper.parse_sporteventz_soup(
+            BeautifulSoup(synthetic.load_fixture(synthetic.SE_FIXTURE), "lxml"), expected["date"])
+        yield scraper, los, se
+    finally:
+        scraper.WEB_DATA = old_web
+        teams_normalize.set_table(old_table)
+
+
+def test_fixture_parse_counts(parsed, expected):
+    _, los, se = parsed
+    assert len(los) == expected["liveonsat"]
+    assert len(se) == expected["sporteventz"]
+
+
+def test_merge_all_output(parsed, expected):
+    scraper, los, se = parsed
+    merged = scraper.merge_all(los, se)
+    assert len(merged) == expected["merged"]
+    assert sorted(g["id"] for g in merged) == expected["ids"]
+
+
+def test_merge_sources_matches_merge_all(parsed):
+    scraper, los, se = parsed
+    by_registry = scraper.merge_sources({"LiveOnSat": los, "SportEventz": se})
+    assert [g["id"] for g in by_registry] == [g["id"] for g in scraper.merge_all(los, se)]
@@ -0,0 +1,79 @@
+from scraper.sources import CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def breaker(clock, failures=2, open_s=10, max_open_s=25):
+    return CircuitBreaker(failures=failures, open_s=open_s, max_open_s=max_open_s, clock=clock)
+
+
+def test_opens_after_consecutive_failures():
+    clock = Clock()
+    b = breaker(clock)
+    b.failure()
+    assert b.state == CircuitBreaker.CLOSED and b.allow()
+    b.failure()
+    assert b.state == CircuitBreaker.OPEN
+    assert not b.allow()
+    assert b.retry_in() == 10
+
+
+def test_success_resets_failure_count():
+    clock = Clock()
+    b = breaker(clock)
+    b.failure()
+    b.success()
+    b.failure()
+    assert b.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_a_single_probe_through():
+    clock = Clock()
+    b = breaker(clock)
+    b.failure(); b.failure()
+    clock.now += 10
+    assert b.allow()
+    assert b.state == CircuitBreaker.HALF_OPEN
+    assert not b.allow()   # a doua cerere așteaptă rezultatul încercării
+
+
+def test_probe_success_closes():
+    clock = Clock()
+    b = breaker(clock)
+    b.failure(); b.failure()
+    clock.now += 10
+    b.allow()
+    b.success()
+    assert b.state == CircuitBreaker.CLOSED and b.allow() and b.retry_in() == 0
+
+
+def test_probe_failure_reopens_with_doubled_capped_pause():
+    clock = Clock()
+    b = breaker(clock)
+    b.failure(); b.failure()
+    pauses = []
+    for _ in range(3):
+        clock.now += b.retry_in()
+        assert b.allow()
+        b.failure()
+        assert b.state == CircuitBreaker.OPEN
+        pauses.append(b.retry_in())
+    assert pauses == [20, 25, 25]
+
+
+def test_restore_takes_only_newer_state_and_never_half_open():
+    clock = Clock()
+    a, b = breaker(clock), breaker(clock)
+    a.failure(); a.failure()
+    clock.now += 10
+    a.allow()                      # half_open în procesul a
+    snap = a.snapshot()
+    assert b.restore(snap)
+    assert b.state == CircuitBreaker.OPEN   # încercarea lui a nu s-a terminat: o reia b
+    assert not b.restore(dict(snap, updated=snap["updated"] - 1))
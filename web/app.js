@@ -24,6 +24,15 @@ let FILTER_CHIP = "*";
 let QUERY = "";
 let TOPBAR = null;
 let CURRENT_DATE = new Date(); // Store the current date
+let LAST_VERSION = 0;            // change-feed version of LAST_DATA
+let STREAM = null;               // EventSource on /api/stream for the shown date
+let STREAM_DATE = "";
+let LOG_CURSOR = null;            // byte offset in reload.log already shown
+let SERVER_VIEW = null;          // filtered page from /api/games (channel/q) or null = local list
+let VIEW_SEQ = 0;                // drops answers of older filter requests
+const PAGE_LIMIT = 500;
+let STATIC = null;               // data/manifest.json when served as a static site (no /api/*)
+const MANIFEST_EVERY_MS = 5 * 60 * 1000;
 
 // =============== utils
 function isoFromPicker(){
@@ -83,9 +92,54 @@ function applyFilters(games){
   return out;
 }
 
+// =============== server-side filter (channel chip / search) over the day's index
+function filtersActive(){ return FILTER_CHIP !== "*" || !!(QUERY||"").trim(); }
+
+function setFacets(f){
+  CHIP_BTNS.forEach(btn => {
+    const key = btn.getAttribute("data-filter") || "*";
+    if (!btn.dataset.label) btn.dataset.label = btn.textContent;
+    const n = f?.[key];
+    btn.textContent = (key !== "*" && n !== undefined) ? `${btn.dataset.label} (${n})` : btn.dataset.label;
+  });
+}
+
+async function refreshView(){
+  const seq = ++VIEW_SEQ;
+  if (STATIC || !filtersActive() || !LAST_DATA?.date){ SERVER_VIEW = null; draw(); return; }
+  const p = new URLSearchParams({date: LAST_DATA.date, limit: PAGE_LIMIT});
+  if (FILTER_CHIP !== "*") p.set("channel", FILTER_CHIP);
+  if ((QUERY||"").trim()) p.set("q", QUERY.trim());
+  try{
+    // pages of PAGE_LIMIT; follow next_cursor so no match beyond the first page is dropped
+    let j = null;
+    for (let cursor = null, restarts = 0;;){
+      if (cursor) p.set("cursor", cursor); else p.delete("cursor");
+      const r = await fetch(`/api/games?${p}`);
+      if (r.status === 409 && restarts++ < 3){   // a reload changed the list between pages
+        j = null; cursor = null;
+        continue;
+      }
+      if (!r.ok) throw new Error(`HTTP ${r.status}`);
+      const page = await r.json();
+      if (seq !== VIEW_SEQ) return;
+      j = j ? {...page, games: [...safe(j.games), ...safe(page.games)]} : page;
+      cursor = page.next_cursor;
+      if (!cursor) break;
+    }
+    SERVER_VIEW = j;
+    setFacets(j?.facets?.highlight);
+  }catch(e){
+    if (seq !== VIEW_SEQ) return;
+    SERVER_VIEW = null;   // fall back to filtering the local list
+  }
+  draw();
+}
+
 // =============== render
 function draw(){
-  const games = applyFilters(Array.isArray(LAST_DATA?.games) ? LAST_DATA.games : []);
+  const games = SERVER_VIEW ? safe(SERVER_VIEW.games)
+                            : applyFilters(Array.isArray(LAST_DATA?.games) ? LAST_DATA.games : []);
   LIST.innerHTML = "";
   for (const g of games){
     const time = fmtTime(g);
@@ -97,7 +151,7 @@ function draw(){
       <div class="time">${time}</div>
       <div>
         <div class="teams">${g.teams_display || ""}</div>
-        <div class="comp">${(g.competition || "")} &nbsp; ${srcs ? badge(srcs) : ""}</div>
+        <div class="comp">${(g.competition || "")} &nbsp; ${srcs ? badge(srcs) : ""}${g.freshness === "stale" ? " " + badge("stale") : ""}</div>
       </div>
       <div class="tv">${chansHTML}</div>`;
     LIST.appendChild(row);
@@ -107,13 +161,57 @@ function draw(){
   }
 }
 
+// =============== static mode (GitHub Pages): per-date shards named in data/manifest.json
+// the manifest is the only file revalidated; shards are fetched as ?v=<hash> and never change.
+// Only the exported index.html carries <meta name="twlive-static" content="<manifest url>">.
+const MANIFEST_URL = document.querySelector('meta[name="twlive-static"]')?.content || "";
+
+async function loadManifest(){
+  if (!MANIFEST_URL) return null;   // served by app.py: /api/* is there
+  try{
+    const r = await fetch(MANIFEST_URL, {cache: "no-cache"});
+    if (!r.ok) return null;
+    const j = await r.json();
+    return j?.static ? j : null;
+  }catch{ return null; }
+}
+
+async function loadShard(d){
+  const e = STATIC?.dates?.[d];
+  if (!e){
+    return {date: d, games: [], counters: {}, error: `Nu există date pentru ${d} (doar ${STATIC.from} – ${STATIC.to})`};
+  }
+  const r = await fetch(`data/games/${d}.json?v=${e.v}`);
+  if (!r.ok) throw new Error(`HTTP ${r.status}`);
+  const j = await r.json();
+  j._meta = {version: e.v};
+  return j;
+}
+
+// a new export replaced the shard of the shown date -> load it
+async function pollManifest(){
+  const m = await loadManifest();
+  if (!m) return;
+  STATIC = m;
+  const d = isoFromPicker();
+  if (LAST_DATA?.date === d && m.dates?.[d]?.v !== LAST_VERSION) await loadGames();
+}
+
 // =============== fetch
+// first call: tail of the file; afterwards only the lines appended since LOG_CURSOR
 async function loadLog(){
+  if (STATIC){
+    if (LOG) LOG.textContent = `Date statice, generate la ${STATIC.generated_at} (${STATIC.timezone})\n`;
+    return;
+  }
   try{
-    const r = await fetch("/api/log");
+    const r = await fetch(LOG_CURSOR === null ? "/api/log" : `/api/log?after=${LOG_CURSOR}`);
     if (!r.ok) return;
     const j = await r.json();
-    if (j?.log){ LOG.textContent = j.log; LOG.scrollTop = LOG.scrollHeight; }
+    if (LOG_CURSOR === null || j.rotated){ if (LOG) LOG.textContent = j.log || ""; }
+    else if (j.log && LOG){ LOG.textContent += j.log; }
+    LOG_CURSOR = j.end ?? null;
+    if (LOG) LOG.scrollTop = LOG.scrollHeight;
   }catch{}
 }
 
@@ -121,15 +219,90 @@ async function loadGames(date) {
     try {
         const d = date ? formatDate(date) : isoFromPicker(); // Use provided date or datepicker value
         console.log("loadGames() - Date being sent to API:", d); // ADDED: Log the date
-        const r = await fetch(`/api/games?date=${d}`); // Pass the date to the API
-        LAST_DATA = await r.json();
+        if (STATIC){
+            LAST_DATA = await loadShard(d);
+        } else {
+            const r = await fetch(`/api/games?date=${d}`); // Pass the date to the API
+            LAST_DATA = await r.json();
+        }
+        LAST_VERSION = LAST_DATA?._meta?.version || 0;
+        if (!STATIC) openStream(d);
+        if (LAST_DATA?.error) appendLog("[UI] " + LAST_DATA.error);
         setCounters(LAST_DATA);
         draw();
+        refreshView();
     } catch (e) {
         appendLog("[UI] loadGames error: " + (e?.message || e));
     }
 }
 
+// poll /api/jobs/<id> until the job is done (ok | error)
+async function waitJob(url, everyMs=1500){
+  let last = "";
+  for (;;){
+    const r = await fetch(url);
+    const j = await r.json();
+    if (!r.ok) return j;
+    const srcs = Object.entries(j.sources || {}).map(([k,v]) => `${k}:${v.status || "?"}`).join(" ");
+    const key  = `${j.state}/${j.stage} ${srcs}`;
+    if (key !== last){ appendLog(`[UI] job ${j.id}: ${key} (${j.elapsed}s)`); last = key; }
+    if (j.state === "ok" || j.state === "error") return j;
+    await new Promise(res => setTimeout(res, everyMs));
+  }
+}
+
+// =============== change feed (only the delta since LAST_VERSION)
+function applyChanges(j){
+  if (j.reset){
+    LAST_DATA.games = safe(j.games);
+  } else {
+    const byId = new Map(safe(LAST_DATA.games).map(g => [g.id, g]));
+    for (const id of safe(j.removed)) byId.delete(id);
+    for (const g of [...safe(j.added), ...safe(j.changed)]) byId.set(g.id, g);
+    LAST_DATA.games = Array.from(byId.values());
+  }
+  LAST_VERSION = j.version;
+  LAST_DATA.counters = {...(LAST_DATA.counters || {}), Total: LAST_DATA.games.length};
+}
+
+async function pollChanges(){
+  const d = isoFromPicker();
+  if (!LAST_DATA || LAST_DATA.date !== d || !LAST_VERSION) return;
+  try{
+    const r = await fetch(`/api/games/changes?date=${d}&since=${LAST_VERSION}`);
+    if (!r.ok) return;
+    const j = await r.json();
+    if (!j.version || j.version === LAST_VERSION) return;
+    applyChanges(j);
+    setCounters(LAST_DATA);
+    refreshView();
+  }catch{}
+}
+
+// =============== push (SSE): the server scrapes on its own schedule and sends deltas
+function openStream(d){
+  if (!window.EventSource) return;
+  if (STREAM && STREAM_DATE === d) return;
+  STREAM?.close();
+  STREAM_DATE = d;
+  STREAM = new EventSource(`/api/stream?date=${d}`);
+  STREAM.addEventListener("changes", (ev) => {
+    let j; try { j = JSON.parse(ev.data); } catch { return; }
+    if (!LAST_DATA || LAST_DATA.date !== j.date) return;
+    if (j.version === LAST_VERSION) return;
+    if (j.reset || j.base === LAST_VERSION){
+      applyChanges(j);
+      setCounters(LAST_DATA);
+      refreshView();
+    } else {
+      pollChanges();   // we were not on the base version -> ask for our own delta
+    }
+  });
+  STREAM.addEventListener("resync", () => LAST_VERSION ? pollChanges() : loadGames());
+  // EventSource reconnects by itself; catch up on anything missed meanwhile
+  STREAM.addEventListener("hello", () => pollChanges());
+}
+
 async function doReload(){
   try{
     TOPBAR?.classList.add('loading');            // pornește mingea
@@ -139,13 +312,25 @@ async function doReload(){
     console.log("doReload() - Date being sent to API:", d); // ADDED: Log the date
 
     const t0 = performance.now();
+    if (STATIC){
+      // no server to scrape: just pick up the newest export
+      STATIC = await loadManifest() || STATIC;
+      await loadLog();
+      await loadGames();
+      appendLog(`[UI] Reload (static) in ${((performance.now()-t0)/1000).toFixed(2)}s`);
+      return;
+    }
     const r  = await fetch("/api/reload", {
          method:"POST",
          headers:{ "Content-Type":"application/json" },
          body:JSON.stringify({date:d})
     });
-    const j  = await r.json();
-    appendLog(`[UI] Reload ${j?.status || r.status} in ${((performance.now()-t0)/1000).toFixed(2)}s`);
+    let j  = await r.json();
+    if (j?.job_id){
+      appendLog(`[UI] Reload job ${j.job_id}${j.joined ? " (joined)" : ""}`);
+      j = await waitJob(j.poll || `/api/jobs/${j.job_id}`);
+    }
+    appendLog(`[UI] Reload ${j?.state || j?.status || r.status} in ${((performance.now()-t0)/1000).toFixed(2)}s`);
     await loadLog();
     await loadGames(); // Reload games after reloading data
 
@@ -167,7 +352,7 @@ function formatDate(date) {
 }
 
 // =============== init (UN SINGUR wire)
-function wire(){
+async function wire(){
   // 1) elimină .topbar în plus, dacă există din greșeală
   const bars = document.querySelectorAll('.topbar');
   bars.forEach((el, i) => { if (i > 0) el.remove(); });
@@ -186,7 +371,7 @@ function wire(){
     btn.addEventListener("click", () => {
       FILTER_CHIP = btn.getAttribute("data-filter") || "*";
       CHIP_BTNS.forEach(b => b.classList.toggle("chip-active", b === btn));
-      draw();
+      refreshView();
     });
   });
   // 4) search (debounce)
@@ -194,7 +379,7 @@ function wire(){
     let t;
     SEARCH.addEventListener("input", (e) => {
       clearTimeout(t);
-      t = setTimeout(() => { QUERY = (e.target.value || "").trim(); draw(); }, 200);
+      t = setTimeout(() => { QUERY = (e.target.value || "").trim(); refreshView(); }, 200);
     });
   }
 
@@ -203,12 +388,13 @@ function wire(){
         await doReload();
     });
 
-  // 6) primele încărcări
+  // 6) primele încărcări (static site -> shards from the manifest, no /api/*)
+  STATIC = await loadManifest();
+  if (STATIC) setInterval(pollManifest, MANIFEST_EVERY_MS);
   loadLog();
   loadGames(); // Load games for the current date
 
-  // 7) auto-refresh orar
-  setInterval(doReload, 60*60*1000);
+  // 7) auto-refresh: serverul face scrape-ul orar și trimite delta prin /api/stream
 
     // 8) Datepicker event listener
     if (DATE_INPUT) {